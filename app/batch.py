@@ -0,0 +1,188 @@
+"""
+Renders decision boundary frames for many simple neural network parameter sets, without running the Dash app.
+
+Every parameter set is evaluated against one data source in a single vectorized pass over its shared mesh, and the
+frames are written to disk in parallel, as NumPy prediction grids or Plotly figure JSON.
+
+Run from the project root with: `python -m app.batch <params file> [--output frames] [--format grid|figure]`
+
+The parameters file holds one network per row, in the order [w1_1, w1_2, w2_1, w2_2, b_1, b_2]. It is either:
+    - a JSON list of `{"weights": [...], "biases": [...]}` objects or of flat lists
+    - a CSV file with those column names
+    - a NumPy `.npy` array with shape (n_networks, 6)
+The data is loaded or generated from the same settings as the app, such as `DATA_PATH` and `MESH_CELL_BUDGET`.
+"""
+import argparse
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+import json
+import os
+from pathlib import Path
+import time
+
+import numpy as np
+import pandas as pd
+
+from app import settings
+from app.components import scatter_plot
+from app.data.generate import set_data
+from app.data.loaders import load_data
+from app.data.source import DataSource
+from app.models.batch import batch_predict
+from app.models.classifier import SimpleNeuralNetwork
+from app.models.landscape import PARAMETER_NAMES
+
+FORMATS = ['grid', 'figure']
+# Frames queued for writing per writer thread before prediction waits for the oldest write
+MAX_PENDING_WRITES_PER_WORKER = 4
+
+
+@dataclass
+class BatchReport:
+    """
+    A data class containing the timings of a batch render.
+
+    :param frames: (int) number of rendered frames
+    :param predict_seconds: (float) time spent predicting the meshes
+    :param total_seconds: (float) time from the first prediction until every frame was written
+    """
+    frames: int
+    predict_seconds: float
+    total_seconds: float
+
+    @property
+    def fps(self) -> float:
+        """Number of frames rendered and written per second."""
+        return self.frames / self.total_seconds if self.total_seconds else 0.
+
+
+def load_params(path: str | Path) -> np.ndarray:
+    """
+    Reads a file of simple neural network parameter sets. See the module docstring for the supported formats.
+
+    :param path: (str | Path) a `.json`, `.csv` or `.npy` file
+
+    :return: an array of flat parameters with shape (n_networks, 6)
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == '.json':
+        rows = json.loads(path.read_text())
+        params = [row['weights'] + row['biases'] if isinstance(row, dict) else row for row in rows]
+    elif suffix == '.csv':
+        params = pd.read_csv(path)[PARAMETER_NAMES].to_numpy()
+    elif suffix == '.npy':
+        params = np.load(path)
+    else:
+        raise ValueError(f"Unsupported parameters file type '{path.suffix}'. Use one of: ['.json', '.csv', '.npy'].")
+
+    params = np.asarray(params, dtype=float)
+    if params.ndim != 2 or params.shape[1] != len(PARAMETER_NAMES):
+        raise ValueError(f"Expected {len(PARAMETER_NAMES)} parameters per network, got shape {params.shape}.")
+    return params
+
+
+def render_frames(source: DataSource, params: np.ndarray, output_dir: str | Path, fmt: str = 'grid',
+                  workers: int | None = None) -> BatchReport:
+    """
+    Renders a frame per parameter set and writes them to a directory, named `frame-<index>.npy` or `.json`, alongside
+    a `manifest.json` listing the parameters of each frame and the mesh coordinates.
+
+    Predictions are computed in chunks, and each chunk is written by a pool of threads while the next is predicted.
+    At most `MAX_PENDING_WRITES_PER_WORKER` frames per thread wait to be written, so memory stays bounded when writing
+    is slower than predicting.
+
+    :param source: (DataSource) a data source object containing data
+    :param params: (np.ndarray) the flat parameters of each network, with shape (n_networks, 6)
+    :param output_dir: (str | Path) the directory the frames are written to
+    :param fmt: (str) 'grid' for int8 prediction grids with shape (n_y, n_x), or 'figure' for the Plotly figure JSON
+                of the scatter plot. Default is 'grid'
+    :param workers: (int, optional) number of writer threads. Default is the number of CPU cores
+
+    :return: the timings of the render
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown frame format '{fmt}'. Use one of: {FORMATS}.")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    x_, y_ = source.mesh_axes
+    suffix = '.npy' if fmt == 'grid' else '.json'
+    files = [f'frame-{idx:05d}{suffix}' for idx in range(params.shape[0])]
+
+    write = _save_grid
+    if fmt == 'figure':
+        from plotly.io.json import to_json_plotly
+
+        base = scatter_plot.figure_dict(source, SimpleNeuralNetwork(params[0, :4], params[0, 4:]))
+        point_preds = np.concatenate([preds for _, preds in batch_predict(source.x_and_y, params)])
+
+        def write(path: Path, grid: np.ndarray, idx: int) -> None:
+            model = SimpleNeuralNetwork(params[idx, :4], params[idx, 4:])
+            path.write_text(to_json_plotly(scatter_plot.figure_frame(base, source, model, grid, point_preds[idx])))
+
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    predict_seconds = 0.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        writes: deque[Future] = deque()
+        chunks = batch_predict(source.grid, params)
+        while True:
+            predict_start = time.perf_counter()
+            chunk = next(chunks, None)
+            predict_seconds += time.perf_counter() - predict_start
+            if chunk is None:
+                break
+
+            first, grids = chunk
+            for offset, grid in enumerate(grids.reshape(-1, y_.shape[0], x_.shape[0])):
+                idx = first + offset
+                if len(writes) >= MAX_PENDING_WRITES_PER_WORKER * workers:
+                    writes.popleft().result()
+                writes.append(executor.submit(write, output_dir / files[idx], grid, idx))
+        for future in writes:
+            future.result()
+    total_seconds = time.perf_counter() - start
+
+    (output_dir / 'manifest.json').write_text(json.dumps({
+        'format': fmt,
+        'parameters': PARAMETER_NAMES,
+        'mesh': {'x': x_.tolist(), 'y': y_.tolist()},
+        'frames': [{'file': file, 'params': row.tolist()} for file, row in zip(files, params)]
+    }))
+    return BatchReport(params.shape[0], predict_seconds, total_seconds)
+
+
+def _save_grid(path: Path, grid: np.ndarray, _idx: int) -> None:
+    np.save(path, grid)
+
+
+def _load_source() -> DataSource:
+    """Creates the data source the app would use, from the data settings."""
+    if settings.DATA_PATH:
+        df = load_data(settings.DATA_PATH, cache_dir=settings.DATA_CACHE_DIR)
+    else:
+        df = set_data(n_points=settings.DATA_POINTS, n_positive=settings.DATA_POSITIVE, threshold=13)
+    return DataSource(df, mesh_budget=settings.MESH_CELL_BUDGET)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('params', help='a .json, .csv or .npy file of parameter sets')
+    parser.add_argument('--output', default='frames', help='the directory frames are written to. Default is frames')
+    parser.add_argument('--format', choices=FORMATS, default='grid', help='the frame format. Default is grid')
+    parser.add_argument('--workers', type=int, help='number of writer threads. Default is the number of CPU cores')
+    args = parser.parse_args()
+
+    params = load_params(args.params)
+    source = _load_source()
+    report = render_frames(source, params, args.output, fmt=args.format, workers=args.workers)
+
+    x_, y_ = source.mesh_axes
+    print(f"Rendered {report.frames} frames of {y_.shape[0]}x{x_.shape[0]} cells to {args.output} in "
+          f"{report.total_seconds:.2f}s: {report.fps:.1f} frames/s (predict {report.predict_seconds:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+from concurrent.futures import TimeoutError
+
+import numpy as np
+
+from dash import Dash, dcc, html
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
+import plotly.graph_objects as go
+
+from app import settings
+from app.components.nn_slider import COALESCER, coalesced, parameter_inputs, parameter_values
+from app.components.scatter_plot import RENDER_POOL
+from app.data import ids
+from app.data.cache import LRUCache, quantize
+from app.data.offload import RenderQueueFull
+from app.data.source import DataSource
+from app.instrumentation import instrumented
+from app.models.landscape import METRICS, PARAMETER_NAMES, sweep_metrics
+from app.models.training import labels_to_targets
+
+LANDSCAPE_CACHE = LRUCache(maxsize=settings.RENDER_CACHE_SIZE)
+
+
+def render_landscape(app: Dash, data: DataSource) -> html.Div:
+    """
+    Creates a contour plot of the accuracy or loss of the simple neural network over two chosen parameters, with the
+    remaining parameters fixed to their slider values. The current parameters are marked on the contour.
+
+    :param app: (Dash) an existing Dash application
+    :param data: (DataSource) a data source object containing data
+
+    :return: a dash html.Div containing the parameter selectors and contour plot
+    """
+    options = [{'label': name, 'value': idx} for idx, name in enumerate(PARAMETER_NAMES)]
+
+    @app.callback(
+        Output(ids.LANDSCAPE_GRAPH, "figure"),
+        Input(ids.LANDSCAPE_X_PARAM, "value"),
+        Input(ids.LANDSCAPE_Y_PARAM, "value"),
+        Input(ids.LANDSCAPE_METRIC, "value"),
+        parameter_inputs(),
+        State(ids.SESSION_ID, "data")
+    )
+    @instrumented('update_landscape')
+    def update_landscape(x_param: int, y_param: int, metric: str, *values) -> dict:
+        *params, session_id = values
+        with coalesced(session_id, 'update_landscape') as superseded:
+            if superseded():
+                COALESCER.drop()
+                raise PreventUpdate
+            try:
+                return create_figure(data, parameter_values(params), (x_param, y_param), metric).to_dict()
+            except (RenderQueueFull, TimeoutError):
+                raise PreventUpdate
+
+    return html.Div(
+        id=ids.LANDSCAPE_CONTAINER,
+        className=['mt-4'],
+        children=[
+            html.H5('Parameter landscape'),
+            html.Div(className=['d-flex', 'gap-2'], children=[
+                dcc.Dropdown(id=ids.LANDSCAPE_X_PARAM, options=options, value=0, clearable=False, className='flex-fill text-dark'),
+                dcc.Dropdown(id=ids.LANDSCAPE_Y_PARAM, options=options, value=1, clearable=False, className='flex-fill text-dark'),
+                dcc.Dropdown(id=ids.LANDSCAPE_METRIC, options=METRICS, value=METRICS[0], clearable=False, className='flex-fill text-dark')
+            ]),
+            dcc.Graph(id=ids.LANDSCAPE_GRAPH, config={'displayModeBar': False})
+        ]
+    )
+
+
+def sweep(source: DataSource, params: list[float], pair: tuple[int, int]) -> dict[str, np.ndarray]:
+    """
+    Evaluates every metric over a sweep of two parameters across the slider range. Results are cached per swept pair
+    and tuple of fixed parameter values, so revisiting a pair or switching the metric needs no computation. Sweeps over
+    large data run in the render pool.
+
+    :param source: (DataSource) a data source object containing data
+    :param params: (list[float]) the current flat parameters [w1_1, w1_2, w2_1, w2_2, b_1, b_2]
+    :param pair: (tuple[int, int]) the indices of the swept parameters, along the x and y axes
+
+    :return: a dictionary of metric name to an array with shape (resolution, resolution), indexed [y, x]
+    """
+    fixed = quantize([value for idx, value in enumerate(params) if idx not in pair])
+    key = (source.token, pair, fixed, settings.LANDSCAPE_RESOLUTION)
+    targets = source.memoize('targets', lambda: labels_to_targets(source.all_labels))
+    cost = source.row_count * settings.LANDSCAPE_RESOLUTION ** 2 * len(PARAMETER_NAMES)
+    return LANDSCAPE_CACHE.get_or_compute(key, lambda: RENDER_POOL.run(
+        sweep_metrics, source.x_and_y, targets, list(params), pair, _sweep_values(), cost=cost, name='sweep'
+    ))
+
+
+def create_figure(source: DataSource, params: list[float], pair: tuple[int, int], metric: str) -> go.Figure:
+    """Creates the contour figure of a metric over two parameters, marking the current parameters."""
+    values = _sweep_values()
+    fig = go.Figure()
+    if pair[0] != pair[1]:
+        fig.add_trace(go.Contour(
+            x=values, y=values, z=sweep(source, params, pair)[metric].round(4), colorscale='Viridis',
+            reversescale=metric == 'loss', colorbar=dict(title=metric)
+        ))
+    fig.add_trace(go.Scatter(
+        x=[params[pair[0]]], y=[params[pair[1]]], mode='markers', showlegend=False, hoverinfo='skip',
+        marker=dict(color='white', size=10, line=dict(color=ids.BG_COLOUR, width=2))
+    ))
+    fig.update_layout(
+        plot_bgcolor=ids.BG_COLOUR,
+        paper_bgcolor=ids.BG_COLOUR,
+        font_color='white',
+        margin=dict(l=40, r=20, t=20, b=40),
+        xaxis_title=PARAMETER_NAMES[pair[0]],
+        yaxis_title=PARAMETER_NAMES[pair[1]]
+    )
+    return fig
+
+
+def _sweep_values() -> np.ndarray:
+    """The values each swept parameter takes, spanning the slider range."""
+    return np.linspace(-1, 1, settings.LANDSCAPE_RESOLUTION)
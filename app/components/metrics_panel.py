@@ -0,0 +1,89 @@
+from dash import Dash, Patch, html
+from dash.dependencies import Output, State
+from dash.exceptions import PreventUpdate
+
+from app.components import scatter_plot
+from app.components.nn_slider import COALESCER, SESSION_STORE, coalesced, parameter_inputs, parameter_values
+from app.data import ids
+from app.data.source import DataSource
+from app.instrumentation import instrumented
+from app.models.classifier import SimpleNeuralNetwork
+from app.models.evaluation import (
+    ClassificationMetrics, classification_metrics, linear_outputs, margins_to_predictions, output_margins,
+    update_linear_outputs
+)
+from app.models.training import labels_to_targets
+
+
+def render_metrics_panel(app: Dash, data: DataSource, weights: list[float], biases: list[float]) -> html.Div:
+    """
+    Creates a panel reporting how the current parameters classify the data points: the accuracy, a confusion matrix
+    and outlines around misclassified points in the scatter plot. Only the data points are evaluated, never the mesh.
+
+    :param app: (Dash) an existing Dash application
+    :param data: (DataSource) a data source object containing data
+    :param weights: (list[float]) the initial network weights
+    :param biases: (list[float]) the initial network biases
+
+    :return: a dash html.Div containing the metrics panel
+    """
+    targets = data.memoize('targets', lambda: labels_to_targets(data.all_labels))
+    X = data.x_and_y
+
+    @app.callback(
+        Output(ids.SCATTER_PLOT_GRAPH, "figure", allow_duplicate=True),
+        Output(ids.METRICS_ACCURACY, "children"),
+        Output(ids.METRICS_CONFUSION, "children"),
+        parameter_inputs(),
+        State(ids.SESSION_ID, "data"),
+        prevent_initial_call=True
+    )
+    @instrumented('update_metrics')
+    def update_metrics(*values) -> tuple[Patch, str, list]:
+        *params, session_id = values
+        params = parameter_values(params)
+        with coalesced(session_id, 'update_metrics') as superseded:
+            if superseded():
+                COALESCER.drop()
+                raise PreventUpdate
+
+            with SESSION_STORE.session(session_id) as state:
+                # A single slider change recomputes only the output it feeds. Outputs are recomputed rather than
+                # shifted by the delta, so they stay identical to a full pass and never flip boundary predictions
+                outputs = state.update('outputs', params, lambda p: linear_outputs(X, p), apply_delta=(
+                    lambda o, _old, new, changed: update_linear_outputs(o, X, new, changed)
+                ))
+                metrics = state.update('metrics', params, lambda _: classification_metrics(
+                    targets, margins_to_predictions(output_margins(outputs))
+                ))
+        patched_figure = scatter_plot.highlight_misclassified(
+            data, SimpleNeuralNetwork(params[:4], params[4:]), metrics.misclassified
+        )
+        return patched_figure, _accuracy_text(metrics), _confusion_rows(metrics)
+
+    initial = classification_metrics(targets, SimpleNeuralNetwork(weights, biases).predict(data.x_and_y))
+    return html.Div(
+        id=ids.METRICS_CONTAINER,
+        className=['mt-4'],
+        children=[
+            html.H5('Metrics'),
+            html.P(_accuracy_text(initial), id=ids.METRICS_ACCURACY),
+            html.Table(id=ids.METRICS_CONFUSION, className='table table-sm table-dark text-center',
+                       children=_confusion_rows(initial))
+        ]
+    )
+
+
+def _accuracy_text(metrics: ClassificationMetrics) -> str:
+    return f'Accuracy {metrics.accuracy:.0%} | {metrics.misclassified.size} misclassified'
+
+
+def _confusion_rows(metrics: ClassificationMetrics) -> list:
+    """Creates the confusion matrix table rows, with true labels as rows and predicted labels as columns."""
+    labels = [ids.LABEL_ONE, ids.LABEL_TWO]
+    header = html.Tr([html.Th('True \\ Predicted')] + [html.Th(label) for label in labels])
+    rows = [
+        html.Tr([html.Th(label)] + [html.Td(int(count)) for count in counts])
+        for label, counts in zip(labels, metrics.confusion)
+    ]
+    return [header, *rows]
@@ -1,199 +1,274 @@
-from dash import Dash, html
+import numpy as np
+
+from dash import Dash, Patch, html
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
 import dash_cytoscape as cyto
 
-from dash.dependencies import Input, Output
+from app.components.nn_slider import COALESCER, coalesced, parameter_inputs, parameter_values
 from app.data import ids
+from app.data.cache import LRUCache
+from app.instrumentation import instrumented
+from app.models.classifier import NeuralNetwork, SimpleNeuralNetwork
+
+# Node and edge elements, and per-node highlight stylesheets, for each layer structure
+GRAPH_CACHE = LRUCache(maxsize=32)
+
+# Distance between neighbouring nodes of a layer, and the horizontal span of the whole network
+NODE_SPACING = 150
+GRAPH_WIDTH = 550
+GRAPH_ORIGIN = (50, 50)
+
+# Edges are labelled with their weight names only up to this many edges, as more labels would overlap
+MAX_EDGE_LABELS = 16
+
+# Edge widths for weights of magnitude 0 and `MAX_WEIGHT`, and larger
+MIN_EDGE_WIDTH, MAX_EDGE_WIDTH = 1., 6.
+MAX_WEIGHT = 1.
+
+SUBSCRIPTS = str.maketrans('0123456789', '₀₁₂₃₄₅₆₇₈₉')
 
 DEFAULT_STYLESHEET = [
     {
         'selector': 'node',
-        'style': {
-            'label': 'data(label)'
-        }
-     },
-    {
-        'selector': 'edge',
         'style': {
             'label': 'data(label)',
-            'curve-style': 'bezier'
-        }
-    },
-    {
-        'selector': 'data(label)',
-        'style': {
             'color': 'white',
             'font-size': 12
         }
-    }
-]
-
-NO_HIDDEN_NODES = [
-    {
-        'data': {
-             'id': 'input_1',
-             'label': f'Input ₁'
-         },
-        'position': {
-            'x': 50,
-            'y': 50
-        },
-        'style': {
-            'textValign': 'center',
-            'textHalign': 'left',
-            'textMarginX': '-5px'
-        }
-    },
-    {
-        'data': {
-            'id': 'input_2',
-            'label': 'Input ₂'
-        },
-        'position': {
-            'x': 50,
-            'y': 200
-        },
-        'style': {
-            'textValign': 'center',
-            'textHalign': 'left',
-            'textMarginX': '-5px'
-        }
     },
     {
-        'data': {
-            'id': 'output_1',
-            'label': 'Output ₁'
-        },
-        'position': {
-            'x': 600,
-            'y': 50
-        },
+        'selector': '.input',
         'style': {
-            'textValign': 'center',
-            'textHalign': 'right',
-            'textMarginX': '5px'
+            'text-valign': 'center',
+            'text-halign': 'left',
+            'text-margin-x': -5
         }
     },
     {
-        'data': {
-            'id': 'output_2',
-            'label': 'Output ₂'
-        },
-        'position': {
-            'x': 600,
-            'y': 200
-        },
-        'style': {
-            'textValign': 'center',
-            'textHalign': 'right',
-            'textMarginX': '5px'
-        }
-    }
-]
-
-NO_HIDDEN_EDGES = [
-    {
-        'data': {
-            'source': 'input_1',
-            'target': 'output_1',
-            'label': 'Weight₁,₁',
-        },
+        'selector': '.hidden',
         'style': {
-            'textMarginY': '-10px',
-            'textMarginX': '-180px'
+            'text-valign': 'top',
+            'text-margin-y': -5
         }
     },
     {
-        'data': {
-            'source': 'input_2',
-            'target': 'output_1',
-            'label': 'Weight₂,₁',
-        },
+        'selector': '.output',
         'style': {
-            'textMarginY': '40px',
-            'textMarginX': '-175px',
-            'textRotation': '-15deg'
+            'text-valign': 'center',
+            'text-halign': 'right',
+            'text-margin-x': 5
         }
     },
     {
-        'data': {
-            'source': 'input_1',
-            'target': 'output_2',
-            'label': 'Weight₁,₂',
-        },
+        'selector': 'edge',
         'style': {
-            'textMarginY': '-35px',
-            'textMarginX': '-95px',
-            'textRotation': '15deg'
+            'curve-style': 'bezier',
+            'width': 'data(width)',
+            'line-color': 'data(colour)'
         }
     },
     {
-        'data': {
-            'source': 'input_2',
-            'target': 'output_2',
-            'label': 'Weight₂,₂',
-        },
+        # Labels sit near the source node, so the labels of crossing edges do not overlap at their midpoints
+        'selector': 'edge[label]',
         'style': {
-            'textMarginY': '-10px',
-            'textMarginX': '-100px'
+            'source-label': 'data(label)',
+            'source-text-offset': 110,
+            'source-text-rotation': 'autorotate',
+            'source-text-margin-y': -10,
+            'color': 'white',
+            'font-size': 12
         }
     }
 ]
 
 
-def _set_node_edge_highlight_styles(edge: dict, node: dict, selector_to: str, selector_from: str) -> list[dict, ...]:
-    """Helper function to dynamically add styles to nodes."""
-    stylesheet = []
-    if selector_to == node['data']['id']:
-        stylesheet.append({
-            'selector': f'node[id="{selector_from}"]',
-            'style': {
-                'background-color': ids.HIGHLIGHT_COLOUR
-            }
-        })
-        stylesheet.append({
-            'selector': f'edge[id="{edge["id"]}"]',
-            'style': {
-                'line-color': ids.HIGHLIGHT_COLOUR
-            }
-        })
-    return stylesheet
-
-
-def render_simple_nn_no_hidden(app: Dash) -> html.Div:
+def render_simple_nn_no_hidden(app: Dash, weights: list[float], biases: list[float]) -> html.Div:
+    """
+    Displays the graph of a neural network containing two inputs and two outputs (no hidden layers), with edges
+    styled by the weight sliders.
+
+    :param app: (Dash) an existing Dash application
+    :param weights: (list[float]) a predefined set of weights
+    :param biases: (list[float]) a predefined set of biases
+
+    :return: a dash html.Div containing the network graph
+    """
+    model = SimpleNeuralNetwork(weights, biases)
+
     @app.callback(
-        Output(ids.SIMPLE_NN_NO_HIDDEN_GRAPH, 'stylesheet'),
-        Input(ids.SIMPLE_NN_NO_HIDDEN_GRAPH, 'tapNode')
+        Output(ids.SIMPLE_NN_NO_HIDDEN_GRAPH, 'elements'),
+        parameter_inputs(),
+        State(ids.SESSION_ID, 'data'),
+        prevent_initial_call=True
     )
-    def highlight_node_edges(node) -> list[dict, ...]:
-        if not node:
-            return DEFAULT_STYLESHEET
+    @instrumented('update_edge_weights')
+    def update_edge_weights(*values) -> Patch:
+        *params, session_id = values
+        with coalesced(session_id, 'update_edge_weights') as superseded:
+            if superseded():
+                COALESCER.drop()
+                raise PreventUpdate
+            return update_weights(model.layer_sizes, parameter_values(params)[:model.weight_buffer.size])
 
-        stylesheet = [
-            {
-                'selector': f'node[id="{node["data"]["id"]}"]',
-                'style': {
-                    'background-color': ids.HIGHLIGHT_COLOUR,
-                    'border-color': ids.HIGHLIGHT_COLOUR
-                }
-            }
-        ]
+    return render(app, model, ids.SIMPLE_NN_NO_HIDDEN_GRAPH)
+
+
+def render(app: Dash, model: NeuralNetwork, graph_id: str) -> html.Div:
+    """
+    Displays the graph of a neural network, laid out from its layer sizes. Tapping a node highlights it, its
+    connected edges and their nodes.
 
-        for edge in node['edgesData']:
-            stylesheet += _set_node_edge_highlight_styles(edge, node, edge['source'], edge['target'])
-            stylesheet += _set_node_edge_highlight_styles(edge, node, edge['target'], edge['source'])
+    :param app: (Dash) an existing Dash application
+    :param model: (NeuralNetwork) the neural network to display. Its weights set the initial edge styles
+    :param graph_id: (str) the id of the Cytoscape graph component, unique for each displayed network
 
-        return DEFAULT_STYLESHEET + stylesheet
+    :return: a dash html.Div containing the network graph
+    """
+    elements, highlights = network_graph(model.layer_sizes)
+    elements = _with_weights(elements, sum(model.layer_sizes), model.weight_buffer)
+
+    @app.callback(
+        Output(graph_id, 'stylesheet'),
+        Input(graph_id, 'tapNode')
+    )
+    @instrumented('highlight_node_edges')
+    def highlight_node_edges(node) -> list[dict, ...]:
+        if not node:
+            return DEFAULT_STYLESHEET
+        return highlights.get(node['data']['id'], DEFAULT_STYLESHEET)
 
     return html.Div(
         className='mt-3 mb-3',
         children=[
             cyto.Cytoscape(
-                id=ids.SIMPLE_NN_NO_HIDDEN_GRAPH,
+                id=graph_id,
                 userPanningEnabled=False,
                 autolock=True,
-                elements=NO_HIDDEN_NODES + NO_HIDDEN_EDGES,
+                elements=elements,
                 layout={'name': 'preset'},
                 style={'width': '100%', 'height': '300px'},
                 stylesheet=DEFAULT_STYLESHEET
             )
         ])
+
+
+def network_graph(layer_sizes: list[int]) -> tuple[list[dict], dict[str, list[dict]]]:
+    """
+    Creates the Cytoscape elements of a fully-connected network and the highlight stylesheet of every node. Both are
+    cached per layer structure, so tapping a node is a single lookup, however many edges the network has.
+
+    :param layer_sizes: (list[int]) number of nodes per layer, including inputs and outputs. For example, [2, 4, 2]
+
+    :return: a tuple of (node elements followed by one edge element per weight in the flat weight order,
+             a dictionary of node id to its complete stylesheet)
+    """
+    def compute() -> tuple[list[dict], dict[str, list[dict]]]:
+        nodes, edges = _create_nodes(layer_sizes), _create_edges(layer_sizes)
+        return nodes + edges, _highlight_stylesheets(nodes, edges)
+
+    return GRAPH_CACHE.get_or_compute(tuple(layer_sizes), compute)
+
+
+def update_weights(layer_sizes: list[int], weights: list[float]) -> Patch:
+    """
+    Creates a partial update of the graph elements, restyling every edge for a new set of weights. Only the edge
+    widths and colours are sent to the client.
+
+    :param layer_sizes: (list[int]) number of nodes per layer, including inputs and outputs
+    :param weights: (list[float]) the flat weights of the network
+
+    :return: a dash Patch for the `elements` property of the network graph
+    """
+    first_edge = sum(layer_sizes)
+    patched_elements = Patch()
+    for offset, (width, colour) in enumerate(zip(*_edge_styles(weights))):
+        patched_elements[first_edge + offset]['data']['width'] = width
+        patched_elements[first_edge + offset]['data']['colour'] = colour
+    return patched_elements
+
+
+def _node_id(layer: int, node: int, n_layers: int) -> str:
+    if layer == 0:
+        return f'input_{node + 1}'
+    if layer == n_layers - 1:
+        return f'output_{node + 1}'
+    return f'hidden_{layer}_{node + 1}'
+
+
+def _create_nodes(layer_sizes: list[int]) -> list[dict]:
+    """Creates a node per neuron, with layers spread evenly across the graph and each layer centred vertically."""
+    n_layers = len(layer_sizes)
+    x_step = GRAPH_WIDTH / (n_layers - 1)
+    centre = GRAPH_ORIGIN[1] + (max(layer_sizes) - 1) * NODE_SPACING / 2
+
+    nodes = []
+    for layer, size in enumerate(layer_sizes):
+        kind = 'input' if layer == 0 else 'output' if layer == n_layers - 1 else 'hidden'
+        x = GRAPH_ORIGIN[0] + layer * x_step
+        for node in range(size):
+            label = (str(node + 1) if kind != 'hidden' else f'{layer},{node + 1}').translate(SUBSCRIPTS)
+            nodes.append({
+                'data': {'id': _node_id(layer, node, n_layers), 'label': f'{kind.title()} {label}'},
+                'position': {'x': x, 'y': centre + (node - (size - 1) / 2) * NODE_SPACING},
+                'classes': kind
+            })
+    return nodes
+
+
+def _create_edges(layer_sizes: list[int]) -> list[dict]:
+    """Creates an edge per weight, ordered like the flat weight buffer of `NeuralNetwork`: layer by layer, row-major."""
+    n_layers = len(layer_sizes)
+    label_edges = sum(n_in * n_out for n_in, n_out in zip(layer_sizes[:-1], layer_sizes[1:])) <= MAX_EDGE_LABELS
+
+    edges = []
+    for layer, (n_in, n_out) in enumerate(zip(layer_sizes[:-1], layer_sizes[1:])):
+        for i in range(n_in):
+            for j in range(n_out):
+                data = {
+                    'id': f'weight_{layer + 1}_{i + 1}_{j + 1}',
+                    'source': _node_id(layer, i, n_layers),
+                    'target': _node_id(layer + 1, j, n_layers)
+                }
+                if label_edges:
+                    prefix = f'{layer + 1},' if n_layers > 2 else ''
+                    data['label'] = f'Weight{f"{prefix}{i + 1},{j + 1}".translate(SUBSCRIPTS)}'
+                edges.append({'data': data})
+    return edges
+
+
+def _highlight_stylesheets(nodes: list[dict], edges: list[dict]) -> dict[str, list[dict]]:
+    """Creates the stylesheet of every node, highlighting the node, its edges and their other nodes."""
+    highlights = {
+        node['data']['id']: [{
+            'selector': f'node[id="{node["data"]["id"]}"]',
+            'style': {'background-color': ids.HIGHLIGHT_COLOUR, 'border-color': ids.HIGHLIGHT_COLOUR}
+        }]
+        for node in nodes
+    }
+    for edge in edges:
+        source, target = edge['data']['source'], edge['data']['target']
+        edge_style = {'selector': f'edge[id="{edge["data"]["id"]}"]', 'style': {'line-color': ids.HIGHLIGHT_COLOUR}}
+        for tapped, other in ((source, target), (target, source)):
+            highlights[tapped] += [
+                {'selector': f'node[id="{other}"]', 'style': {'background-color': ids.HIGHLIGHT_COLOUR}},
+                edge_style
+            ]
+    return {node_id: DEFAULT_STYLESHEET + stylesheet for node_id, stylesheet in highlights.items()}
+
+
+def _edge_styles(weights: list[float]) -> tuple[list[float], list[str]]:
+    """Returns the width and colour of the edge of each weight: wider for larger magnitudes, coloured by sign."""
+    weights = np.asarray(weights, dtype=float)
+    widths = MIN_EDGE_WIDTH + (MAX_EDGE_WIDTH - MIN_EDGE_WIDTH) * np.minimum(np.abs(weights) / MAX_WEIGHT, 1.)
+    colours = np.where(weights < 0, ids.NEGATIVE_WEIGHT_COLOUR, ids.POSITIVE_WEIGHT_COLOUR)
+    return widths.round(2).tolist(), colours.tolist()
+
+
+def _with_weights(elements: list[dict], first_edge: int, weights: np.ndarray) -> list[dict]:
+    """Returns a copy of cached graph elements with the edge data styled for a set of weights."""
+    styled = list(elements)
+    for offset, (width, colour) in enumerate(zip(*_edge_styles(weights))):
+        edge = styled[first_edge + offset]
+        styled[first_edge + offset] = {**edge, 'data': {**edge['data'], 'width': width, 'colour': colour}}
+    return styled
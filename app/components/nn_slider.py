@@ -1,12 +1,61 @@
+from concurrent.futures import CancelledError, TimeoutError
+from contextlib import AbstractContextManager
 from dataclasses import dataclass
 import itertools
+from typing import Callable
 
-from dash import Dash, dcc, html
-from dash.dependencies import Input, Output
+import numpy as np
 
+from dash import Dash, Patch, dcc, html
+from dash.dependencies import ClientsideFunction, Input, Output, State
+from dash.exceptions import PreventUpdate
+
+from app import settings
 from app.components import scatter_plot
+from app.components.training import SLIDER_IDS
 from app.data import ids
+from app.data.coalesce import RequestCoalescer
+from app.data.offload import RenderQueueFull
+from app.data.sessions import SessionStore
 from app.data.source import DataSource
+from app.instrumentation import instrumented
+from app.models.classifier import SimpleNeuralNetwork
+
+COALESCER = RequestCoalescer()
+SESSION_STORE = SessionStore(max_sessions=settings.SESSION_MAX, ttl=settings.SESSION_TTL)
+
+
+def parameter_inputs() -> list[Input]:
+    """
+    Returns the inputs that send slider changes to the server-side callbacks reacting to the parameters besides the
+    plot, such as the metrics panel, landscape and network graph. When sliders update while dragging ('drag' and
+    'throttle' modes), this is the throttled slider values store, so a drag triggers at most `SLIDER_THROTTLE_HZ`
+    updates per second. Otherwise, it is the sliders themselves, which only update on release.
+
+    Read the parameters of a callback from these inputs with `parameter_values`.
+    """
+    if settings.SLIDER_UPDATE_MODE == 'mouseup':
+        return [Input(slider_id, "value") for slider_id in SLIDER_IDS]
+    return [Input(ids.SLIDER_VALUES_STORE, "data")]
+
+
+def parameter_values(values: tuple) -> list[float]:
+    """Returns the flat parameters from the values of the `parameter_inputs` of a callback."""
+    return list(values[0]) if len(values) == 1 else list(values)
+
+
+def coalesced(session_id: str | None, name: str) -> AbstractContextManager[Callable[[], bool]]:
+    """
+    Registers a request of a parameter callback with the request coalescer, so a request superseded by a newer one
+    from the same session can be dropped. Requests are tracked per callback, so callbacks never supersede each other.
+
+    :param session_id: (str | None) the session identifier
+    :param name: (str) the name of the callback
+
+    :return: a context manager yielding a function that returns True when the request has been superseded
+    """
+    key = f'{session_id}/{name}' if settings.COALESCE_UPDATES and session_id is not None else None
+    return COALESCER.request(key)
 
 
 @dataclass
@@ -19,17 +68,19 @@ class ParameterSlider:
     :param max: (float) the maximum value of the slider. Default is 1
     :param step: (float) the movement size of the slider. Default is 0.1
     :param value: (float) the starting value of the slider. Default is 0
+    :param updatemode: (str) when the value is sent to callbacks, either 'mouseup' or 'drag'. Default is 'mouseup'
     """
     id: str
     min: float = -1
     max: float = 1
-    step: float = 0.1
+    step: float = ids.SLIDER_STEP
     value: float = 0
+    updatemode: str = 'mouseup'
 
     def create(self) -> dcc.Slider:
         return dcc.Slider(
             min=self.min, max=self.max, step=self.step, value=self.value,
-            id=self.id,
+            id=self.id, updatemode=self.updatemode,
             marks={
                 self.min: {'label': str(self.min)},
                 self.value: {'label': str(self.value)},
@@ -41,9 +92,10 @@ class ParameterSlider:
 
 class AssignContent:
     """Helper class for assigning weights and biases into respective `html.Divs`."""
-    def __init__(self, title_id: str, slider_id: str) -> None:
+    def __init__(self, title_id: str, slider_id: str, updatemode: str = 'mouseup') -> None:
         self.title_id = title_id
         self.slider_id = slider_id
+        self.updatemode = updatemode
 
     def set_with_groupby(self, data: list[float], indices: list[int]) -> list:
         """
@@ -55,7 +107,7 @@ class AssignContent:
         :return: a list of html.H6 and dcc.Slider objects in respective order
         """
         titles = [html.H6(f'{self.title_id}{i}_{idx}') for _, group in itertools.groupby(indices) for idx, i in enumerate(group, start=1)]
-        sliders = [ParameterSlider(id=f'{self.slider_id}-{i}', value=data[i]).create() for i in range(len(titles))]
+        sliders = [ParameterSlider(id=f'{self.slider_id}-{i}', value=data[i], updatemode=self.updatemode).create() for i in range(len(titles))]
         return list(itertools.chain.from_iterable(zip(titles, sliders)))
 
     def set_with_range(self, data: list[float]) -> list:
@@ -67,14 +119,14 @@ class AssignContent:
         :return: a list of html.H6 and dcc.Slider objects in respective order
         """
         titles = [html.H6(f'{self.title_id}_{i+1}') for i in range(len(data))]
-        sliders = [ParameterSlider(id=f'{self.slider_id}-{i}', value=data[i]).create() for i in range(len(titles))]
+        sliders = [ParameterSlider(id=f'{self.slider_id}-{i}', value=data[i], updatemode=self.updatemode).create() for i in range(len(titles))]
         return list(itertools.chain.from_iterable(zip(titles, sliders)))
 
 
 def render_simple_params_no_hidden(app: Dash, data: DataSource, weights: list[float], biases: list[float]) -> html.Div:
     """
     Creates weight slider data for a neural network containing two inputs and two outputs (no hidden layers) and
-    uses a callback to update its corresponding scatter plot when sliders are changed.
+    uses a callback to update its corresponding scatter plot heatmap when sliders are changed.
 
     :param app: (Dash) an existing Dash application
     :param data: (DataSource) a data source object containing data
@@ -87,27 +139,33 @@ def render_simple_params_no_hidden(app: Dash, data: DataSource, weights: list[fl
     indices = [i for i in range(1, input_count+1)] * input_count
     indices.sort()  # [1, 1, 2, 2]
 
-    weight_content = AssignContent(title_id='w', slider_id=ids.WEIGHT_SLIDER).set_with_groupby(weights, indices=indices)
-    bias_content = AssignContent(title_id='b', slider_id=ids.BIAS_SLIDER).set_with_range(biases)
-
-    @app.callback(
-        Output(ids.SCATTER_PLOT1_CONTAINER, "children"),
-        [
-            Input(f'{ids.WEIGHT_SLIDER}-0', "value"),
-            Input(f'{ids.WEIGHT_SLIDER}-1', "value"),
-            Input(f'{ids.WEIGHT_SLIDER}-2', "value"),
-            Input(f'{ids.WEIGHT_SLIDER}-3', "value"),
-            Input(f'{ids.BIAS_SLIDER}-0', "value"),
-            Input(f'{ids.BIAS_SLIDER}-1', "value")
-        ]
-    )
-    def update_plot(w1: float, w2: float, w3: float, w4: float, b1: float, b2: float) -> html.Div:
-        return scatter_plot.render_no_hidden(data, weights=[w1, w2, w3, w4], biases=[b1, b2])
+    updatemode = 'mouseup' if settings.SLIDER_UPDATE_MODE == 'mouseup' else 'drag'
+    weight_content = AssignContent(title_id='w', slider_id=ids.WEIGHT_SLIDER, updatemode=updatemode).set_with_groupby(weights, indices=indices)
+    bias_content = AssignContent(title_id='b', slider_id=ids.BIAS_SLIDER, updatemode=updatemode).set_with_range(biases)
+
+    slider_inputs = [Input(slider_id, "value") for slider_id in SLIDER_IDS]
+    plot_inputs = _set_update_policy(app, slider_inputs)
+
+    if settings.CLIENTSIDE_MODEL and settings.BOUNDARY_MODE == 'heatmap':
+        # The browser recomputes the heatmap from the mesh already stored in the figure
+        app.clientside_callback(
+            ClientsideFunction(namespace='clientside_model', function_name='update_heatmap'),
+            Output(ids.SCATTER_PLOT_GRAPH, "figure"),
+            slider_inputs,
+            State(ids.SCATTER_PLOT_GRAPH, "figure"),
+            prevent_initial_call=True
+        )
+    else:
+        _set_plot_callback(app, data, plot_inputs)
 
     return html.Div(
         id=ids.SLIDER_CONTAINER,
         className=['mt-5'],
         children=[
+            dcc.Store(id=ids.SESSION_ID, storage_type='session'),
+            dcc.Store(id=ids.SLIDER_VALUES_STORE, data=list(weights) + list(biases)),
+            dcc.Interval(id=ids.SLIDER_THROTTLE_INTERVAL, interval=1000 / settings.SLIDER_THROTTLE_HZ,
+                         disabled=settings.SLIDER_UPDATE_MODE == 'mouseup'),
             html.Div(
                 id=ids.WEIGHT_CONTAINER,
                 className=['mb-3'],
@@ -126,3 +184,87 @@ def render_simple_params_no_hidden(app: Dash, data: DataSource, weights: list[fl
             )
         ]
     )
+
+
+def _set_update_policy(app: Dash, slider_inputs: list[Input]) -> list[Input]:
+    """
+    Registers the clientside callbacks for the slider update policy and returns the inputs that trigger a plot update.
+    While dragging, slider values are forwarded to a store at most `settings.SLIDER_THROTTLE_HZ` times per second. The
+    store drives the plot in 'throttle' mode, and the other parameter callbacks in both 'drag' and 'throttle' modes.
+    """
+    app.clientside_callback(
+        ClientsideFunction(namespace='slider_policy', function_name='session_id'),
+        Output(ids.SESSION_ID, "data"),
+        Input(ids.SESSION_ID, "modified_timestamp"),
+        State(ids.SESSION_ID, "data")
+    )
+
+    if settings.SLIDER_UPDATE_MODE == 'mouseup':
+        return slider_inputs
+
+    app.clientside_callback(
+        ClientsideFunction(namespace='slider_policy', function_name='throttle'),
+        Output(ids.SLIDER_VALUES_STORE, "data"),
+        Input(ids.SLIDER_THROTTLE_INTERVAL, "n_intervals"),
+        [State(slider.component_id, slider.component_property) for slider in slider_inputs],
+        State(ids.SLIDER_VALUES_STORE, "data"),
+        prevent_initial_call=True
+    )
+    return parameter_inputs() if settings.SLIDER_UPDATE_MODE == 'throttle' else slider_inputs
+
+
+def _set_plot_callback(app: Dash, data: DataSource, plot_inputs: list[Input]) -> None:
+    """Registers the server-side callback that updates the scatter plot heatmap when sliders are changed."""
+    patch_figure = settings.GRID_TRANSPORT == 'json' or settings.BOUNDARY_MODE == 'analytic'
+    if patch_figure:
+        plot_output = Output(ids.SCATTER_PLOT_GRAPH, "figure")
+    else:
+        # Compact grids are sent to a store and decoded into the figure in the browser
+        plot_output = Output(ids.HEATMAP_STORE, "data")
+        app.clientside_callback(
+            ClientsideFunction(namespace='grid_transport', function_name='apply_heatmap'),
+            Output(ids.SCATTER_PLOT_GRAPH, "figure"),
+            Input(ids.HEATMAP_STORE, "data"),
+            State(ids.SCATTER_PLOT_GRAPH, "figure"),
+            prevent_initial_call=True
+        )
+
+    @app.callback(plot_output, plot_inputs, State(ids.SESSION_ID, "data"), prevent_initial_call=True)
+    @instrumented('update_plot')
+    def update_plot(*values) -> Patch | dict:
+        *params, session_id = values
+        params = parameter_values(params)
+
+        with coalesced(session_id, 'update_plot') as superseded:
+            if superseded():
+                COALESCER.drop()
+                raise PreventUpdate
+
+            try:
+                with SESSION_STORE.session(session_id) as state:
+                    model = state.update('model', params, lambda p: SimpleNeuralNetwork(p[:4], p[4:]),
+                                         apply_delta=_set_changed_params)
+                    if patch_figure:
+                        output = scatter_plot.update(data, model, cancelled=superseded)
+                    else:
+                        output = scatter_plot.encode(data, model, encoding=settings.GRID_TRANSPORT,
+                                                     cancelled=superseded)
+            except CancelledError:
+                COALESCER.drop()
+                raise PreventUpdate
+            except (RenderQueueFull, TimeoutError):
+                # The render pool is overloaded. The plot is left unchanged until the next slider move
+                raise PreventUpdate
+
+            if superseded():
+                COALESCER.drop()
+                raise PreventUpdate
+            return output
+
+
+def _set_changed_params(model: SimpleNeuralNetwork, _old: np.ndarray, new: np.ndarray,
+                        changed: np.ndarray) -> SimpleNeuralNetwork:
+    """Updates only the changed parameters of a sessions model in-place, instead of rebuilding it."""
+    for index in changed:
+        model.set_param(int(index), new[index])
+    return model
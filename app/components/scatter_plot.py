@@ -1,14 +1,34 @@
+from copy import deepcopy
+from typing import Callable
+
 import numpy as np
 
-from dash import dcc, html
-import plotly.express as px
+from dash import Patch, dcc, html
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 
+from .. import settings
+from ..instrumentation import record_job, timed
 from ..data import ids
+from ..data.cache import LRUCache, quantize
+from ..data.encoding import encode_grid
 from ..data.generate import DataSchema
+from ..data.mesh import adaptive_predict, clip_half_plane
+from ..data.offload import RenderPool
 from ..data.source import DataSource
-from ..models.classifier import SimpleNeuralNetwork
+from ..models.classifier import NeuralNetwork, SimpleNeuralNetwork
+from ..models.training import labels_to_targets
+from .utils import hex_to_rgba
+
+PREDICTION_CACHE = LRUCache(maxsize=settings.RENDER_CACHE_SIZE)
+FIGURE_CACHE = LRUCache(maxsize=settings.RENDER_CACHE_SIZE)
+RENDER_POOL = RenderPool(max_workers=settings.RENDER_POOL_WORKERS, max_pending=settings.RENDER_POOL_QUEUE,
+                         min_cost=settings.RENDER_OFFLOAD_COST, timeout=settings.RENDER_TIMEOUT, observe=record_job)
+
+# Position of the prediction heatmap in the figure data. It is always added before the scatter traces
+HEATMAP_TRACE_INDEX = 0
+
+# Positions of the class 0 and class 1 regions in the figure data, when drawn analytically instead of the heatmap
+REGION_TRACE_INDICES = (0, 1)
 
 
 def render_no_hidden(source: DataSource, weights: list[float], biases: list[float]) -> html.Div:
@@ -21,10 +41,280 @@ def render_no_hidden(source: DataSource, weights: list[float], biases: list[floa
 
     :return: a dash html.Div containing the scatter plot
     """
-    fig = make_subplots(rows=1, cols=1)
-    fig = _set_background(fig, source, weights, biases)
-    fig = _set_scatter(fig, source)
-    return html.Div(dcc.Graph(figure=fig, config={'staticPlot:': True}), id=ids.SCATTER_PLOT)
+    return render(source, SimpleNeuralNetwork(weights, biases))
+
+
+def render(source: DataSource, model: NeuralNetwork) -> html.Div:
+    """
+    Displays a scatter plot, overlaid with a heatmap of the given models predictions.
+
+    :param source: (DataSource) a data source object containing data
+    :param model: (NeuralNetwork) a neural network with two input nodes
+
+    :return: a dash html.Div containing the scatter plot
+    """
+    return html.Div(
+        id=ids.SCATTER_PLOT,
+        children=[
+            dcc.Graph(id=ids.SCATTER_PLOT_GRAPH, figure=figure_dict(source, model), config={'staticPlot:': True}),
+            dcc.Store(id=ids.HEATMAP_STORE)
+        ]
+    )
+
+
+def figure_dict(source: DataSource, model: NeuralNetwork) -> dict:
+    """
+    Creates the scatter plot figure as a dictionary, reusing cached figures for previously seen parameters.
+
+    :param source: (DataSource) a data source object containing data
+    :param model: (NeuralNetwork) a neural network with two input nodes
+
+    :return: a dictionary containing the figure data and layout
+    """
+    def compute() -> dict:
+        fig = _create_figure(source, model)
+        with timed('render.to_dict'):
+            return fig.to_dict()
+
+    return FIGURE_CACHE.get_or_compute(_cache_key(source, model), compute)
+
+
+def figure_frame(figure: dict, source: DataSource, model: NeuralNetwork, grid: np.ndarray | None = None,
+                 preds: np.ndarray | None = None) -> dict:
+    """
+    Creates the figure of another model from an existing scatter plot figure dictionary, replacing only the traces
+    that depend on the model: the heatmap or boundary regions, and the misclassified points. The scatter traces and
+    layout are shared with the existing figure rather than copied.
+
+    :param figure: (dict) a scatter plot figure dictionary of the same data source, from `figure_dict`
+    :param source: (DataSource) a data source object containing data
+    :param model: (NeuralNetwork) a neural network with two input nodes
+    :param grid: (np.ndarray, optional) the models predictions for the mesh. Default is None (predicted)
+    :param preds: (np.ndarray, optional) the models predictions for the data points. Default is None (predicted)
+
+    :return: a dictionary containing the figure data and layout
+    """
+    data = list(figure['data'])
+    if _uses_regions(model):
+        for idx, (x, y) in zip(REGION_TRACE_INDICES, _boundary_regions(source, model)):
+            data[idx] = {**data[idx], 'x': x, 'y': y}
+    else:
+        z = predict_grid(source, model) if grid is None else grid
+        data[HEATMAP_TRACE_INDEX] = {**data[HEATMAP_TRACE_INDEX], 'z': z}
+
+    targets = source.memoize('targets', lambda: labels_to_targets(source.all_labels))
+    preds = model.predict(source.x_and_y) if preds is None else preds
+    x, y = _misclassified_points(source, np.flatnonzero(preds != targets))
+    idx = _misclassified_trace_index(source, model)
+    data[idx] = {**data[idx], 'x': x, 'y': y}
+    return {**figure, 'data': data}
+
+
+def preload(source: DataSource, model: NeuralNetwork, figure: dict) -> None:
+    """Stores a previously created figure dictionary, such as one loaded from a layout snapshot, in the figure cache."""
+    FIGURE_CACHE.set(_cache_key(source, model), figure)
+
+
+def update_no_hidden(source: DataSource, weights: list[float], biases: list[float]) -> Patch:
+    """
+    Creates a partial figure update for an existing scatter plot, replacing only its heatmap values.
+
+    :param source: (DataSource) a data source object containing data
+    :param weights: (list[float]) a list of neural network weights
+    :param biases: (list[float]) a list of neural network biases
+
+    :return: a dash Patch for the `figure` property of the scatter plot graph
+    """
+    return update(source, SimpleNeuralNetwork(weights, biases))
+
+
+def update(source: DataSource, model: NeuralNetwork, cancelled: Callable[[], bool] | None = None) -> Patch:
+    """
+    Creates a partial figure update for an existing scatter plot, replacing only its heatmap values.
+    The mesh, scatter traces and layout are unchanged, so are not sent to the client.
+
+    :param source: (DataSource) a data source object containing data
+    :param model: (NeuralNetwork) a neural network with two input nodes
+    :param cancelled: (Callable, optional) a function returning True when the update is no longer needed. Passed to
+                      `predict_grid`
+
+    :return: a dash Patch for the `figure` property of the scatter plot graph
+    """
+    patched_figure = Patch()
+    if _uses_regions(model):
+        with timed('update.regions'):
+            regions = _boundary_regions(source, model)
+        for idx, (x, y) in zip(REGION_TRACE_INDICES, regions):
+            patched_figure['data'][idx]['x'] = x
+            patched_figure['data'][idx]['y'] = y
+    else:
+        patched_figure['data'][HEATMAP_TRACE_INDEX]['z'] = predict_grid(source, model, cancelled)
+    return patched_figure
+
+
+def highlight_misclassified(source: DataSource, model: NeuralNetwork, indices: np.ndarray,
+                            patched_figure: Patch | None = None) -> Patch:
+    """
+    Creates a partial figure update for an existing scatter plot, outlining the given data points as misclassified.
+
+    :param source: (DataSource) a data source object containing data
+    :param model: (NeuralNetwork) the neural network the plot was created with, locating the highlight trace
+    :param indices: (np.ndarray) the row indices of the misclassified points
+    :param patched_figure: (Patch, optional) an existing partial figure update to extend, such as one from
+                           `update_grid`. Default is None (a new Patch)
+
+    :return: a dash Patch for the `figure` property of the scatter plot graph
+    """
+    x, y = _misclassified_points(source, indices)
+    patched_figure = Patch() if patched_figure is None else patched_figure
+    idx = _misclassified_trace_index(source, model)
+    patched_figure['data'][idx]['x'] = x
+    patched_figure['data'][idx]['y'] = y
+    return patched_figure
+
+
+def update_grid(grid: np.ndarray) -> Patch:
+    """
+    Creates a partial figure update for an existing scatter plot from a precomputed prediction grid.
+
+    :param grid: (np.ndarray) an integer array of predictions with shape (n_y, n_x), matching the mesh of the plot
+
+    :return: a dash Patch for the `figure` property of the scatter plot graph
+    """
+    patched_figure = Patch()
+    patched_figure['data'][HEATMAP_TRACE_INDEX]['z'] = grid
+    return patched_figure
+
+
+def encode_no_hidden(source: DataSource, weights: list[float], biases: list[float], encoding: str) -> dict:
+    """
+    Creates a compact heatmap update for an existing scatter plot, decoded in the browser by the
+    `grid_transport.apply_heatmap` clientside callback.
+
+    :param source: (DataSource) a data source object containing data
+    :param weights: (list[float]) a list of neural network weights
+    :param biases: (list[float]) a list of neural network biases
+    :param encoding: (str) the name of the grid encoding. One of: ['bits', 'rle', 'contour']
+
+    :return: a dictionary containing the encoded prediction grid and the heatmap trace index
+    """
+    return encode(source, SimpleNeuralNetwork(weights, biases), encoding)
+
+
+def encode(source: DataSource, model: NeuralNetwork, encoding: str,
+           cancelled: Callable[[], bool] | None = None) -> dict:
+    """
+    Creates a compact heatmap update for an existing scatter plot, decoded in the browser by the
+    `grid_transport.apply_heatmap` clientside callback.
+
+    :param source: (DataSource) a data source object containing data
+    :param model: (NeuralNetwork) a neural network with two input nodes
+    :param encoding: (str) the name of the grid encoding. One of: ['bits', 'rle', 'contour']
+    :param cancelled: (Callable, optional) a function returning True when the update is no longer needed. Passed to
+                      `predict_grid`
+
+    :return: a dictionary containing the encoded prediction grid and the heatmap trace index
+    """
+    grid = predict_grid(source, model, cancelled)
+    with timed(f'update.encode.{encoding}'):
+        payload = encode_grid(grid, encoding)
+    payload['trace'] = HEATMAP_TRACE_INDEX
+    return payload
+
+
+def predict_grid(source: DataSource, model: NeuralNetwork, cancelled: Callable[[], bool] | None = None) -> np.ndarray:
+    """
+    Predicts the class of every mesh cell, reusing cached predictions for previously seen parameters. Heavy
+    predictions run in the render pool, see `render_cost`.
+
+    :param source: (DataSource) a data source object containing data
+    :param model: (NeuralNetwork) a neural network with two input nodes
+    :param cancelled: (Callable, optional) a function returning True when the prediction is no longer needed, such as
+                      when its request was superseded. Abandons a pooled prediction with a `CancelledError`
+
+    :return: an integer array of predictions with shape (n_y, n_x)
+    """
+    x_, y_ = source.mesh_axes
+
+    def compute() -> np.ndarray:
+        cost = render_cost(source, model)
+        if RENDER_POOL.should_offload(cost):
+            # The model is copied, as session models are updated in-place while the job waits to be sent
+            with timed('render.offload'):
+                return RENDER_POOL.run(predict_mesh, deepcopy(model), x_, y_, settings.MESH_REFINE_BLOCK, cost=cost,
+                                       name='predict_grid', cancelled=cancelled)
+        if settings.MESH_REFINE_BLOCK:
+            with timed('render.predict'):
+                return adaptive_predict(model.predict, x_, y_, block=settings.MESH_REFINE_BLOCK)[0]
+        with timed('render.mesh'):
+            grid = source.grid
+        with timed('render.predict'):
+            return model.predict(grid).reshape(y_.shape[0], x_.shape[0])
+
+    return PREDICTION_CACHE.get_or_compute(_cache_key(source, model), compute)
+
+
+def predict_mesh(model: NeuralNetwork, xs: np.ndarray, ys: np.ndarray, refine_block: int = 0) -> np.ndarray:
+    """
+    Predicts the class of every cell of a mesh, without the data source or caches. Run in the render pool.
+
+    :param model: (NeuralNetwork) a neural network with two input nodes
+    :param xs: (np.ndarray) the x coordinates of the mesh
+    :param ys: (np.ndarray) the y coordinates of the mesh
+    :param refine_block: (int) initial block size for `adaptive_predict`. Default is 0 (every cell is evaluated)
+
+    :return: an integer array of predictions with shape (len(ys), len(xs))
+    """
+    if refine_block:
+        return adaptive_predict(model.predict, xs, ys, block=refine_block)[0]
+    xx, yy = np.meshgrid(xs, ys)
+    return model.predict(np.c_[xx.ravel(), yy.ravel()]).astype(np.int8).reshape(ys.shape[0], xs.shape[0])
+
+
+def render_cost(source: DataSource, model: NeuralNetwork) -> float:
+    """Estimates the number of multiply-adds needed to predict every mesh cell of a data source."""
+    x_, y_ = source.mesh_axes
+    return x_.shape[0] * y_.shape[0] * (model.weight_buffer.size + model.bias_buffer.size)
+
+
+def warm_up(source: DataSource, params: list[tuple[list[float], list[float]]]) -> None:
+    """
+    Pre-computes and caches the figures for a set of simple neural network parameters.
+
+    :param source: (DataSource) a data source object containing data
+    :param params: (list[tuple[list[float], list[float]]]) a list of (weights, biases) pairs
+    """
+    for weights, biases in params:
+        render_no_hidden(source, weights, biases)
+
+
+def _cache_key(source: DataSource, model: NeuralNetwork) -> tuple:
+    """Creates a hashable key for a data source and model pair, using the models quantized parameters."""
+    return (
+        source.token,
+        source.bounds,
+        source.mesh_step,
+        tuple(model.layer_sizes),
+        model.activation,
+        model.output_activation,
+        quantize(model.weight_buffer),
+        quantize(model.bias_buffer)
+    )
+
+
+def _create_figure(source: DataSource, model: NeuralNetwork) -> go.Figure:
+    """Creates a new figure containing the prediction heatmap and scatter plot."""
+    from plotly.subplots import make_subplots  # Deferred, as it is slow to import and unused with cached figures
+
+    with timed('render.subplots'):
+        fig = make_subplots(rows=1, cols=1)
+    with timed('render.background'):
+        fig = _set_background(fig, source, model)
+    with timed('render.scatter'):
+        fig = _set_scatter(fig, source)
+    with timed('render.misclassified'):
+        fig = _set_misclassified(fig, source, model)
+    return fig
 
 
 def _set_scatter(fig: go.Figure, source: DataSource) -> go.Figure:
@@ -36,13 +326,6 @@ def _set_scatter(fig: go.Figure, source: DataSource) -> go.Figure:
 
     :return: a dash graph object figure containing the scatter plot
     """
-    colours = {ids.LABEL_ONE: ids.POSITIVE_COLOUR, ids.LABEL_TWO: ids.NEGATIVE_COLOUR}
-    filtered_data = source.filter(x=source.all_x, y=source.all_y, labels=source.all_labels)
-
-    scatter = px.scatter(filtered_data.data, x=DataSchema.X_AXIS, y=DataSchema.Y_AXIS, color=DataSchema.LABELS,
-                         color_discrete_map=colours, template='none')
-    scatter.update_traces(marker_size=10)
-
     fig.update_layout(
         plot_bgcolor=ids.BG_COLOUR,
         paper_bgcolor=ids.BG_COLOUR,
@@ -51,37 +334,120 @@ def _set_scatter(fig: go.Figure, source: DataSource) -> go.Figure:
     )
     fig.update_xaxes(showgrid=False)
     fig.update_yaxes(showgrid=False)
-    fig.add_traces(list(scatter.select_traces()), 1, 1)
+    fig.add_traces(source.memoize('scatter_traces', lambda: _create_scatter_traces(source)), 1, 1)
     return fig
 
 
-def _set_background(fig: go.Figure, source: DataSource, weights: list[float], biases: list[float]) -> go.Figure:
+def _create_scatter_traces(source: DataSource) -> list[go.Scatter | go.Scattergl]:
+    """
+    Creates the scatter traces for each label. They only depend on the data, so are memoized by the DataSource.
+    Large data is drawn with WebGL markers and reduced to `settings.SCATTER_POINT_BUDGET` markers beforehand.
+    """
+    import plotly.express as px  # Deferred, as it is slow to import and unused with cached figures
+
+    colours = {ids.LABEL_ONE: ids.POSITIVE_COLOUR, ids.LABEL_TWO: ids.NEGATIVE_COLOUR}
+    render_mode = 'webgl' if source.row_count > settings.SCATTER_WEBGL_THRESHOLD else 'svg'
+    marker_size = 10 if source.row_count <= settings.SCATTER_WEBGL_THRESHOLD else 4
+
+    if source.row_count > settings.SCATTER_POINT_BUDGET and settings.SCATTER_DECIMATION == 'density':
+        bins = int(np.sqrt(settings.SCATTER_POINT_BUDGET / len(source.unique_labels)))
+        scatter = px.scatter(source.density(bins), x=DataSchema.X_AXIS, y=DataSchema.Y_AXIS, color=DataSchema.LABELS,
+                             size='count', size_max=marker_size, color_discrete_map=colours, template='none',
+                             render_mode=render_mode)
+        return list(scatter.select_traces())
+
+    filtered_data = source.sample(settings.SCATTER_POINT_BUDGET)
+    scatter = px.scatter(filtered_data.data, x=DataSchema.X_AXIS, y=DataSchema.Y_AXIS, color=DataSchema.LABELS,
+                         color_discrete_map=colours, template='none', render_mode=render_mode)
+    scatter.update_traces(marker_size=marker_size)
+    return list(scatter.select_traces())
+
+
+def _set_background(fig: go.Figure, source: DataSource, clf: NeuralNetwork) -> go.Figure:
     """
     Applies a heatmap over the scatter plot, displaying the networks predictions as an overlaid coloured.
 
     :param fig: (go.Figure) an existing set of subplots
     :param source: (DataSource) a data source object containing data
-    :param weights: (list[float]) a list of neural network weights
-    :param biases: (list[float]) a list of neural network biases
+    :param clf: (NeuralNetwork) the neural network used to make predictions
 
     :return: a dash graph object figure containing the scatter plot
     """
-    clf = SimpleNeuralNetwork(weights, biases)
-
-    # Create a mesh to plot
-    h = .02  # step size
-    threshold = 0.2
-    X = np.asarray(source.x_and_y)
-    x_min, x_max = X[:, 0].min() - threshold, X[:, 0].max() + threshold
-    y_min, y_max = X[:, 1].min() - threshold, X[:, 1].max() + threshold
-    xx, yy = np.meshgrid(np.arange(x_min, x_max, h),
-                         np.arange(y_min, y_max, h))
+    if _uses_regions(clf):
+        return _set_regions(fig, source, clf)
 
-    Z = clf.calc(np.c_[xx.ravel(), yy.ravel()])
-    Z = np.asarray(Z).reshape(xx.shape)
-    y_ = np.arange(y_min, y_max, h)
+    x_, y_ = source.mesh_axes
+    Z = predict_grid(source, clf)
 
-    plot = go.Heatmap(x=xx[0], y=y_, z=Z, showscale=False, colorscale=[[0, ids.POSITIVE_COLOUR],
+    plot = go.Heatmap(x=x_, y=y_, z=Z, showscale=False, colorscale=[[0, ids.POSITIVE_COLOUR],
                                                                        [0.5, ids.NEGATIVE_COLOUR]], opacity=0.4)
     fig.add_trace(plot, 1, 1)
     return fig
+
+
+def _uses_regions(model: NeuralNetwork) -> bool:
+    """Checks if the models predictions are drawn as exact boundary regions instead of a heatmap."""
+    return settings.BOUNDARY_MODE == 'analytic' and model.is_linear
+
+
+def _boundary_regions(source: DataSource, model: NeuralNetwork) -> list[tuple[list[float], list[float]]]:
+    """
+    Returns the polygon coordinates of the class 0 and class 1 regions of a linear model within the mesh bounds.
+    Class 1 includes the boundary, as ties are predicted as class 1.
+    """
+    a, b, c = model.linear_boundary()
+    return [clip_half_plane(source.bounds, a, b, c), clip_half_plane(source.bounds, -a, -b, -c, strict=False)]
+
+
+def _set_regions(fig: go.Figure, source: DataSource, clf: NeuralNetwork) -> go.Figure:
+    """
+    Applies the exact prediction regions of a linear network over the scatter plot as filled polygons.
+    Replaces the heatmap, so no mesh is evaluated and the boundary is drawn at full resolution.
+
+    :param fig: (go.Figure) an existing set of subplots
+    :param source: (DataSource) a data source object containing data
+    :param clf: (NeuralNetwork) a linear neural network
+
+    :return: a dash graph object figure containing the prediction regions
+    """
+    x_min, x_max, y_min, y_max = source.bounds
+    for (x, y), colour in zip(_boundary_regions(source, clf), [ids.POSITIVE_COLOUR, ids.NEGATIVE_COLOUR]):
+        region = go.Scatter(x=x, y=y, fill='toself', mode='lines', line_width=0, hoverinfo='skip',
+                            fillcolor=f'rgba{hex_to_rgba(colour, 0.4)}', showlegend=False)
+        fig.add_trace(region, 1, 1)
+
+    fig.update_xaxes(range=[x_min, x_max])
+    fig.update_yaxes(range=[y_min, y_max])
+    return fig
+
+
+def _misclassified_trace_index(source: DataSource, model: NeuralNetwork) -> int:
+    """Returns the position of the misclassified points trace, which is added after the scatter traces."""
+    n_background = len(REGION_TRACE_INDICES) if _uses_regions(model) else 1
+    return n_background + len(source.memoize('scatter_traces', lambda: _create_scatter_traces(source)))
+
+
+def _misclassified_points(source: DataSource, indices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the coordinates of the misclassified points, limited to `settings.SCATTER_POINT_BUDGET` markers."""
+    points = source.x_and_y[indices[:settings.SCATTER_POINT_BUDGET]]
+    return points[:, 0], points[:, 1]
+
+
+def _set_misclassified(fig: go.Figure, source: DataSource, clf: NeuralNetwork) -> go.Figure:
+    """
+    Outlines the data points the network classifies incorrectly, above the scatter traces.
+
+    :param fig: (go.Figure) an existing set of subplots
+    :param source: (DataSource) a data source object containing data
+    :param clf: (NeuralNetwork) the neural network used to make predictions
+
+    :return: a dash graph object figure containing the misclassified points
+    """
+    targets = source.memoize('targets', lambda: labels_to_targets(source.all_labels))
+    x, y = _misclassified_points(source, np.flatnonzero(clf.predict(source.x_and_y) != targets))
+
+    trace = go.Scattergl if source.row_count > settings.SCATTER_WEBGL_THRESHOLD else go.Scatter
+    marker_size = 10 if source.row_count <= settings.SCATTER_WEBGL_THRESHOLD else 4
+    fig.add_trace(trace(x=x, y=y, mode='markers', name='Misclassified', hoverinfo='skip',
+                        marker=dict(symbol='circle-open', size=marker_size + 6, color='white', line_width=2)), 1, 1)
+    return fig
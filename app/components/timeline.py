@@ -0,0 +1,79 @@
+import numpy as np
+from dash import Dash, Patch, dcc, html
+from dash.dependencies import Input, Output
+
+from app import settings
+from app.components import scatter_plot
+from app.data import ids
+from app.data.source import DataSource
+from app.instrumentation import instrumented
+from app.models.batch import batch_predict
+from app.models.classifier import SimpleNeuralNetwork
+from app.models.training import labels_to_targets
+from app.models.trajectory import Trajectory
+
+
+def render_timeline(app: Dash, data: DataSource, trajectory: Trajectory) -> html.Div:
+    """
+    Creates a timeline slider for scrubbing through a precomputed training trajectory. Every frame is looked up from
+    the trajectory, and the misclassified points of every frame are found once up front, so scrubbing never retrains
+    or re-evaluates the network.
+
+    :param app: (Dash) an existing Dash application
+    :param data: (DataSource) the data source the trajectory was computed on
+    :param trajectory: (Trajectory) a precomputed training trajectory
+
+    :return: a dash html.Div containing the timeline slider
+    """
+    last_epoch = trajectory.n_frames - 1
+    misclassified = _misclassified_per_frame(data, trajectory)
+
+    @app.callback(
+        Output(ids.SCATTER_PLOT_GRAPH, "figure", allow_duplicate=True),
+        Output(ids.TIMELINE_STATUS, "children"),
+        Input(ids.TIMELINE_SLIDER, "value"),
+        prevent_initial_call=True
+    )
+    @instrumented('scrub')
+    def scrub(epoch: int) -> tuple[Patch, str]:
+        snapshot = trajectory.frame(epoch)
+        model = SimpleNeuralNetwork(snapshot.weights, snapshot.biases)
+        if settings.BOUNDARY_MODE == 'analytic':
+            patched_figure = scatter_plot.update(data, model)
+        else:
+            patched_figure = scatter_plot.update_grid(trajectory.grids[snapshot.epoch])
+        patched_figure = scatter_plot.highlight_misclassified(
+            data, model, np.flatnonzero(misclassified[snapshot.epoch]), patched_figure
+        )
+        return patched_figure, _describe(snapshot.epoch, trajectory)
+
+    return html.Div(
+        id=ids.TIMELINE_CONTAINER,
+        className=['mt-4'],
+        children=[
+            html.H5('Training timeline'),
+            dcc.Slider(
+                id=ids.TIMELINE_SLIDER,
+                min=0, max=last_epoch, step=1, value=0,
+                marks={epoch: str(epoch) for epoch in range(0, last_epoch + 1, max(last_epoch // 4, 1))},
+                updatemode='drag'
+            ),
+            html.P(_describe(0, trajectory), id=ids.TIMELINE_STATUS, className=['mt-2'])
+        ]
+    )
+
+
+def _misclassified_per_frame(data: DataSource, trajectory: Trajectory) -> np.ndarray:
+    """Returns a boolean array with shape (n_frames, n_points), marking the misclassified points of every frame."""
+    params = np.hstack((trajectory.weights, trajectory.biases))
+    preds = np.concatenate([chunk for _, chunk in batch_predict(data.x_and_y, params)])
+    return preds != labels_to_targets(data.all_labels)
+
+
+def _describe(epoch: int, trajectory: Trajectory) -> str:
+    """Creates the status text for a trajectory frame."""
+    snapshot = trajectory.frame(epoch)
+    weights = ', '.join(f'{value:.2f}' for value in snapshot.weights)
+    biases = ', '.join(f'{value:.2f}' for value in snapshot.biases)
+    return (f'Epoch {snapshot.epoch} | loss {snapshot.loss:.3f} | accuracy {snapshot.accuracy:.0%} | '
+            f'weights [{weights}] | biases [{biases}]')
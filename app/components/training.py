@@ -0,0 +1,148 @@
+from collections import OrderedDict
+from threading import Lock
+
+from dash import Dash, ctx, dcc, html
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
+import dash_bootstrap_components as dbc
+
+from app import settings
+from app.data import ids
+from app.data.source import DataSource
+from app.instrumentation import instrumented
+from app.models.classifier import SimpleNeuralNetwork
+from app.models.training import Trainer, labels_to_targets
+
+SLIDER_IDS = [f'{ids.WEIGHT_SLIDER}-{i}' for i in range(4)] + [f'{ids.BIAS_SLIDER}-{i}' for i in range(2)]
+
+
+class TrainingSessions:
+    """
+    A bounded registry of running trainers, one per session. The least recently started trainer is stopped when full.
+
+    :param max_sessions: (int) maximum number of concurrent trainers
+    """
+    def __init__(self, max_sessions: int) -> None:
+        self.max_sessions = max_sessions
+        self._trainers: OrderedDict[str, Trainer] = OrderedDict()
+        self._last_steps: dict[str, int] = {}
+        self._lock = Lock()
+
+    def start(self, session_id: str, trainer: Trainer) -> None:
+        """Stops any existing trainer for the session, then registers and starts the new one."""
+        self.stop(session_id)
+        evicted = []
+        with self._lock:
+            self._trainers[session_id] = trainer
+            while len(self._trainers) > self.max_sessions:
+                evicted_id, evicted_trainer = self._trainers.popitem(last=False)
+                self._last_steps.pop(evicted_id, None)
+                evicted.append(evicted_trainer)
+
+        # Evicted trainers are joined outside the lock, so other sessions are not blocked while they finish
+        for evicted_trainer in evicted:
+            evicted_trainer.stop(timeout=None)
+        trainer.start()
+
+    def stop(self, session_id: str) -> None:
+        """Stops the sessions trainer, keeping it registered so its final snapshot can still be read."""
+        trainer = self._trainers.get(session_id)
+        if trainer is not None:
+            trainer.stop()
+
+    def get(self, session_id: str) -> Trainer | None:
+        return self._trainers.get(session_id)
+
+    def is_new_step(self, session_id: str, step: int) -> bool:
+        """Checks if a snapshot step has not been streamed to the session yet, and records it."""
+        with self._lock:
+            is_new = self._last_steps.get(session_id) != step
+            self._last_steps[session_id] = step
+            return is_new
+
+
+SESSIONS = TrainingSessions(max_sessions=settings.TRAINING_MAX_SESSIONS)
+
+
+def render_training_controls(app: Dash, data: DataSource) -> html.Div:
+    """
+    Creates controls for training the simple neural network with gradient descent in a background thread.
+    Training starts from the current slider values and streams snapshots back to the sliders, which update the
+    scatter plot through their existing callback.
+
+    :param app: (Dash) an existing Dash application
+    :param data: (DataSource) a data source object containing data
+
+    :return: a dash html.Div containing the training controls
+    """
+    @app.callback(
+        Output(ids.TRAINING_INTERVAL, "disabled"),
+        Input(ids.TRAINING_START_BUTTON, "n_clicks"),
+        Input(ids.TRAINING_STOP_BUTTON, "n_clicks"),
+        State(ids.TRAINING_LEARNING_RATE, "value"),
+        State(ids.TRAINING_BATCH_SIZE, "value"),
+        State(ids.SESSION_ID, "data"),
+        [State(slider_id, "value") for slider_id in SLIDER_IDS],
+        prevent_initial_call=True
+    )
+    @instrumented('toggle_training')
+    def toggle_training(_start: int, _stop: int, learning_rate: float, batch_size: int, session_id: str,
+                        *params: float) -> bool:
+        if session_id is None:
+            raise PreventUpdate
+
+        if ctx.triggered_id == ids.TRAINING_STOP_BUTTON:
+            SESSIONS.stop(session_id)
+            return False  # One more poll streams the final snapshot
+
+        trainer = Trainer(
+            SimpleNeuralNetwork(params[:4], params[4:]), data.x_and_y, labels_to_targets(data.all_labels),
+            learning_rate=learning_rate or 0.1, batch_size=batch_size or 16,
+            snapshot_interval=1 / settings.TRAINING_SNAPSHOT_HZ, steps_per_snapshot=settings.TRAINING_STEPS_PER_SNAPSHOT
+        )
+        SESSIONS.start(session_id, trainer)
+        return False
+
+    @app.callback(
+        [Output(slider_id, "value") for slider_id in SLIDER_IDS],
+        Output(ids.TRAINING_STATUS, "children"),
+        Output(ids.TRAINING_INTERVAL, "disabled", allow_duplicate=True),
+        Input(ids.TRAINING_INTERVAL, "n_intervals"),
+        State(ids.SESSION_ID, "data"),
+        prevent_initial_call=True
+    )
+    @instrumented('stream_snapshot')
+    def stream_snapshot(_: int, session_id: str) -> tuple:
+        trainer = SESSIONS.get(session_id)
+        if trainer is None:
+            raise PreventUpdate
+
+        snapshot = trainer.latest()
+        if not SESSIONS.is_new_step(session_id, snapshot.step):
+            raise PreventUpdate
+
+        values = [round(value, 2) for value in snapshot.weights + snapshot.biases]
+        status = f'Epoch {snapshot.epoch} | loss {snapshot.loss:.3f} | accuracy {snapshot.accuracy:.0%}'
+        return *values, status, not trainer.running
+
+    return html.Div(
+        id=ids.TRAINING_CONTAINER,
+        className=['mt-4'],
+        children=[
+            html.H5('Training'),
+            dbc.Row(className=['mb-2'], children=[
+                dbc.Col(children=[
+                    html.H6('Learning rate'),
+                    dcc.Input(id=ids.TRAINING_LEARNING_RATE, type='number', value=0.1, min=0.001, max=10, step=0.001)
+                ]),
+                dbc.Col(children=[
+                    html.H6('Batch size'),
+                    dcc.Input(id=ids.TRAINING_BATCH_SIZE, type='number', value=16, min=1, step=1)
+                ])
+            ]),
+            dbc.Button('Train', id=ids.TRAINING_START_BUTTON, className='me-2', n_clicks=0),
+            dbc.Button('Stop', id=ids.TRAINING_STOP_BUTTON, color='secondary', n_clicks=0),
+            html.P(id=ids.TRAINING_STATUS, className=['mt-2']),
+            dcc.Interval(id=ids.TRAINING_INTERVAL, interval=1000 / settings.TRAINING_SNAPSHOT_HZ, disabled=True)
+        ]
+    )
@@ -0,0 +1,103 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable
+
+import numpy as np
+
+from app.data import ids
+
+
+def quantize(values: list[float], step: float = ids.SLIDER_STEP, tolerance: float = 1e-9) -> tuple[float, ...]:
+    """
+    Creates a hashable key from a set of values, removing floating point noise from slider values. Values within
+    `tolerance` of a multiple of the slider step are snapped to it. Every other value, such as a trained parameter, is
+    kept exactly, so different parameters never share a key.
+
+    :param values: (list[float]) a list of float values, such as network weights
+    :param step: (float) the slider step. Default is `ids.SLIDER_STEP`
+    :param tolerance: (float) the largest distance from a multiple of the step treated as noise. Default is 1e-9
+
+    :return: a tuple of floats. For example, quantize([0.30000000000000004, 0.37]) -> (0.3, 0.37)
+    """
+    values = np.asarray(values, dtype=float)
+    multiples = np.round(values / step)
+    on_step = np.abs(values - multiples * step) <= tolerance
+    # Adding 0. turns -0. into 0., so both signed zeros share a key
+    return tuple((np.where(on_step, np.round(multiples * step, 12), values) + 0.).tolist())
+
+
+class LRUCache:
+    """
+    A thread-safe, bounded Least Recently Used (LRU) cache with hit and miss counters.
+
+    :param maxsize: (int) maximum number of stored items. The least recently used item is evicted when full
+    """
+    def __init__(self, maxsize: int = 128) -> None:
+        if maxsize < 1:
+            raise ValueError(f"'maxsize' must be a positive integer, got {maxsize}.")
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retrieves an item, marking it as recently used. Returns the default when missing."""
+        with self._lock:
+            if key in self._items:
+                self.hits += 1
+                self._items.move_to_end(key)
+                return self._items[key]
+
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Stores an item, evicting the least recently used item when the cache is full."""
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Retrieves an item, computing and storing it first when missing.
+
+        :param key: (Hashable) the cache key
+        :param compute: (Callable) a function without arguments that creates the value
+
+        :return: the cached or newly computed value
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Removes every item and resets the counters."""
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def stats(self) -> dict[str, int | float]:
+        """Returns the current size, hit and miss counts, and hit rate of the cache."""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._items),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.
+        }
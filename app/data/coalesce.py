@@ -0,0 +1,67 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import count
+from threading import Lock
+from typing import Callable, Iterator
+
+
+class RequestCoalescer:
+    """
+    Tracks the latest request for each session so superseded computations can be dropped. Requests for the same
+    session run one at a time. A request that is superseded while it waits, or while it computes, is reported as stale.
+
+    Sessions are tracked per process, so under multiple gunicorn workers coalescing only applies to requests that
+    reach the same worker.
+
+    :param max_sessions: (int) maximum number of tracked sessions. The least recently active is forgotten when full
+    """
+    def __init__(self, max_sessions: int = 10000) -> None:
+        self.max_sessions = max_sessions
+        self.started = 0
+        self.dropped = 0
+        self._tokens = count()
+        self._sessions: OrderedDict[str, tuple[int, Lock]] = OrderedDict()
+        self._lock = Lock()
+
+    def _register(self, session_id: str) -> tuple[int, Lock]:
+        with self._lock:
+            token = next(self._tokens)
+            session_lock = self._sessions[session_id][1] if session_id in self._sessions else Lock()
+            self._sessions[session_id] = (token, session_lock)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            self.started += 1
+            return token, session_lock
+
+    def is_current(self, session_id: str, token: int) -> bool:
+        """Checks if a request token is still the latest one for its session."""
+        latest = self._sessions.get(session_id)
+        return latest is None or latest[0] == token
+
+    @contextmanager
+    def request(self, session_id: str | None) -> Iterator[Callable[[], bool]]:
+        """
+        Registers a new request for a session and waits for the sessions previous request to finish.
+
+        :param session_id: (str | None) a unique session identifier. Requests without one are never coalesced
+
+        :return: a context manager yielding a function that returns True when the request has been superseded
+        """
+        if session_id is None:
+            yield lambda: False
+            return
+
+        token, session_lock = self._register(session_id)
+        with session_lock:
+            yield lambda: not self.is_current(session_id, token)
+
+    def drop(self) -> None:
+        """Records a request that was dropped because it was superseded."""
+        with self._lock:
+            self.dropped += 1
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Returns the number of tracked sessions, started requests and dropped requests."""
+        return {'sessions': len(self._sessions), 'started': self.started, 'dropped': self.dropped}
@@ -0,0 +1,127 @@
+import base64
+from typing import Callable
+
+import numpy as np
+
+GridEncoder = Callable[[np.ndarray], dict]
+
+
+def _to_base64(array: np.ndarray) -> str:
+    return base64.b64encode(array.tobytes()).decode('ascii')
+
+
+def _from_base64(data: str, dtype: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(data), dtype=dtype)
+
+
+def encode_bits(grid: np.ndarray) -> dict:
+    """
+    Encodes a binary prediction grid as packed bits (8 cells per byte, most significant bit first).
+
+    :param grid: (np.ndarray) a 2D array of 0/1 predictions
+
+    :return: a JSON serializable dictionary containing the grid shape and base64 encoded bits
+    """
+    return {
+        'encoding': 'bits',
+        'shape': list(grid.shape),
+        'data': _to_base64(np.packbits(np.asarray(grid, dtype=np.uint8).ravel()))
+    }
+
+
+def encode_rle(grid: np.ndarray) -> dict:
+    """
+    Encodes a binary prediction grid as run lengths of the flattened grid. Runs alternate between 0 and 1,
+    starting with the value of the first cell.
+
+    :param grid: (np.ndarray) a 2D array of 0/1 predictions
+
+    :return: a JSON serializable dictionary containing the grid shape, first value and base64 encoded uint32 runs
+    """
+    flat = np.asarray(grid, dtype=np.uint8).ravel()
+    changes = np.flatnonzero(np.diff(flat)) + 1
+    bounds = np.concatenate(([0], changes, [flat.size]))
+    return {
+        'encoding': 'rle',
+        'shape': list(grid.shape),
+        'first': int(flat[0]) if flat.size else 0,
+        'data': _to_base64(np.diff(bounds).astype('<u4'))
+    }
+
+
+def encode_contour(grid: np.ndarray) -> dict:
+    """
+    Encodes only the decision boundary of a binary prediction grid: the starting value of each row and the
+    columns where the prediction changes. For smooth boundaries this is a few columns per row.
+
+    :param grid: (np.ndarray) a 2D array of 0/1 predictions
+
+    :return: a JSON serializable dictionary containing the grid shape, packed row starts, base64 encoded uint32
+             row offsets and base64 encoded uint16 (or uint32 for very wide grids) boundary columns
+    """
+    grid = np.asarray(grid, dtype=np.uint8)
+    rows, columns = np.nonzero(np.diff(grid, axis=1))
+    offsets = np.searchsorted(rows, np.arange(grid.shape[0] + 1))
+    column_dtype = '<u2' if grid.shape[1] <= np.iinfo(np.uint16).max else '<u4'
+    return {
+        'encoding': 'contour',
+        'shape': list(grid.shape),
+        'starts': _to_base64(np.packbits(grid[:, 0])),
+        'offsets': _to_base64(offsets.astype('<u4')),
+        'columns': _to_base64((columns + 1).astype(column_dtype)),
+        'column_dtype': column_dtype[1:]
+    }
+
+
+ENCODERS: dict[str, GridEncoder] = {
+    'bits': encode_bits,
+    'rle': encode_rle,
+    'contour': encode_contour
+}
+
+
+def encode_grid(grid: np.ndarray, encoding: str) -> dict:
+    """
+    Encodes a binary prediction grid into a compact, JSON serializable format.
+
+    :param grid: (np.ndarray) a 2D array of 0/1 predictions
+    :param encoding: (str) the name of the encoding. One of: ['bits', 'rle', 'contour']
+
+    :return: a dictionary that can be decoded with `decode_grid` or the clientside `grid_transport.decode`
+    """
+    try:
+        encoder = ENCODERS[encoding]
+    except KeyError:
+        raise ValueError(f"Unknown grid encoding '{encoding}'. Available: {list(ENCODERS.keys())}.") from None
+    return encoder(grid)
+
+
+def decode_grid(payload: dict) -> np.ndarray:
+    """
+    Decodes a payload created by `encode_grid` back into a 2D uint8 prediction grid.
+
+    :param payload: (dict) an encoded grid
+
+    :return: a 2D array of 0/1 predictions
+    """
+    n_rows, n_cols = payload['shape']
+    size = n_rows * n_cols
+
+    if payload['encoding'] == 'bits':
+        flat = np.unpackbits(_from_base64(payload['data'], 'u1'))[:size]
+    elif payload['encoding'] == 'rle':
+        runs = _from_base64(payload['data'], '<u4')
+        values = (np.arange(runs.size) + payload['first']) % 2
+        flat = np.repeat(values.astype(np.uint8), runs)
+    elif payload['encoding'] == 'contour':
+        starts = np.unpackbits(_from_base64(payload['starts'], 'u1'))[:n_rows]
+        offsets = _from_base64(payload['offsets'], '<u4')
+        columns = _from_base64(payload['columns'], f"<{payload['column_dtype']}")
+        flips = np.zeros((n_rows, n_cols), dtype=np.uint8)
+        flips[np.repeat(np.arange(n_rows), np.diff(offsets)), columns] = 1
+        flips[:, 0] = starts
+        return np.bitwise_xor.accumulate(flips, axis=1)
+    else:
+        raise ValueError(f"Unknown grid encoding '{payload['encoding']}'.")
+
+    return flat.reshape(n_rows, n_cols)
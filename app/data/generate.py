@@ -31,6 +31,22 @@ def create_sample_data(n_points: int, seed: int = 362, threshold: int = 11) -> p
     return pd.DataFrame(sample, columns=[DataSchema.X_AXIS, DataSchema.Y_AXIS])
 
 
+def create_uniform_data(n_points: int, seed: int = 362, threshold: int = 11) -> pd.DataFrame:
+    """
+    Generate a set of random sample data with continuous coordinates, using vectorized NumPy sampling.
+    Unlike `create_sample_data`, the number of points is not limited by the grid size.
+
+    :param n_points: (int) total number of sample data
+    :param seed: (int) number for random seed
+    :param threshold: (int) maximum value of sample data (exclusive, divided by 10)
+    """
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, (threshold - 1) / 10, size=(n_points, 2))
+    points = points[np.lexsort((points[:, 1], points[:, 0]))]
+
+    return pd.DataFrame(points, columns=[DataSchema.X_AXIS, DataSchema.Y_AXIS])
+
+
 def create_labels(df: pd.DataFrame, n_positive: int) -> pd.DataFrame:
     """
     Create an array of labels and set them to a unique column in the given DataFrame.
@@ -39,9 +55,8 @@ def create_labels(df: pd.DataFrame, n_positive: int) -> pd.DataFrame:
     :param df: (pd.DataFrame) a DataFrame of sample data
     :param n_positive: (int) number of positive labels
     """
-    positive_labels = np.array([ids.LABEL_ONE for _ in range(n_positive)], dtype=str)
-    negative_labels = np.array([ids.LABEL_TWO for _ in range(df.shape[0] - n_positive)], dtype=str)
-    labels = np.concatenate((positive_labels, negative_labels))
+    labels = np.full(df.shape[0], ids.LABEL_TWO, dtype=object)
+    labels[:n_positive] = ids.LABEL_ONE
 
     df[DataSchema.LABELS] = labels
     return df
@@ -52,7 +67,8 @@ def compose(*functions: Preprocessor) -> Preprocessor:
     return reduce(lambda f, g: lambda x: g(f(x)), functions)
 
 
-def set_data(n_points: int, n_positive: int, seed: int = 362, threshold: int = 11) -> pd.DataFrame:
+def set_data(n_points: int, n_positive: int, seed: int = 362, threshold: int = 11,
+             continuous: bool | None = None) -> pd.DataFrame:
     """
     Create data and supply it through the preprocessor pipeline. Returns a pandas DataFrame.
 
@@ -60,8 +76,13 @@ def set_data(n_points: int, n_positive: int, seed: int = 362, threshold: int = 1
     :param n_positive: (int) number of positive labels
     :param seed: (int) number for random seed
     :param threshold: (int) maximum value of sample data (exclusive, divided by 10)
+    :param continuous: (bool, optional) use continuous coordinates instead of grid points. Default is None
+                       (only when there are more points than grid points)
     """
-    data = create_sample_data(n_points, seed, threshold)
+    if continuous is None:
+        continuous = n_points > threshold ** 2
+
+    data = create_uniform_data(n_points, seed, threshold) if continuous else create_sample_data(n_points, seed, threshold)
 
     preprocessor = compose(
         partial(create_labels, n_positive=n_positive)
@@ -1,8 +1,11 @@
 APP_TITLE = 'Interactive Neural Network'
 SCATTER_PLOT = 'scatter-plot'
+SCATTER_PLOT_GRAPH = 'scatter-plot-graph'
+HEATMAP_STORE = 'heatmap-store'
 SCATTER_PLOT1_CONTAINER = 'scatter-plot1'
 
 SLIDER_CONTAINER = 'slider-container'
+SLIDER_STEP = .1
 WEIGHT_CONTAINER = 'weight-container'
 BIAS_CONTAINER = 'bias-container'
 
@@ -12,6 +15,32 @@ WEIGHT_SLIDER_CONTAINER = 'weights-slider-container'
 BIAS_SLIDER = 'bias-slider'
 BIAS_SLIDER_CONTAINER = 'bias-slider-container'
 
+SESSION_ID = 'session-id'
+SLIDER_VALUES_STORE = 'slider-values'
+SLIDER_THROTTLE_INTERVAL = 'slider-throttle-interval'
+
+TRAINING_CONTAINER = 'training-container'
+TRAINING_START_BUTTON = 'training-start-button'
+TRAINING_STOP_BUTTON = 'training-stop-button'
+TRAINING_LEARNING_RATE = 'training-learning-rate'
+TRAINING_BATCH_SIZE = 'training-batch-size'
+TRAINING_INTERVAL = 'training-interval'
+TRAINING_STATUS = 'training-status'
+
+TIMELINE_CONTAINER = 'timeline-container'
+TIMELINE_SLIDER = 'timeline-slider'
+TIMELINE_STATUS = 'timeline-status'
+
+LANDSCAPE_CONTAINER = 'landscape-container'
+LANDSCAPE_GRAPH = 'landscape-graph'
+LANDSCAPE_X_PARAM = 'landscape-x-param'
+LANDSCAPE_Y_PARAM = 'landscape-y-param'
+LANDSCAPE_METRIC = 'landscape-metric'
+
+METRICS_CONTAINER = 'metrics-container'
+METRICS_ACCURACY = 'metrics-accuracy'
+METRICS_CONFUSION = 'metrics-confusion'
+
 BG_COLOUR = '#222'
 POSITIVE_COLOUR = '#5BAFF7'
 NEGATIVE_COLOUR = '#FF4E5A'
@@ -27,3 +56,9 @@ SIMPLE_NN_START_BIASES = [0.3, -0.3]
 
 SIMPLE_NN_NO_HIDDEN_GRAPH = 'simple-nn-no-hidden'
 HIGHLIGHT_COLOUR = '#1e88e5'
+POSITIVE_WEIGHT_COLOUR = '#cfd8dc'
+NEGATIVE_WEIGHT_COLOUR = '#FF4E5A'
+
+MESH_STEP = .02
+MESH_PADDING = 0.2
+MESH_PADDING_RATIO = 0.15
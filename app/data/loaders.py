@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from app.data import ids
+from app.data.generate import DataSchema, Preprocessor, compose
+
+Loader = Callable[[Path], pd.DataFrame]
+
+REQUIRED_COLUMNS = [DataSchema.X_AXIS, DataSchema.Y_AXIS, DataSchema.LABELS]
+
+
+def load_csv(path: Path) -> pd.DataFrame:
+    """Reads a CSV file containing the data schema columns."""
+    return pd.read_csv(path, usecols=REQUIRED_COLUMNS)
+
+
+def load_parquet(path: Path) -> pd.DataFrame:
+    """Reads a Parquet file containing the data schema columns. Requires the optional `pyarrow` package."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("Loading Parquet files requires 'pyarrow'. Install it with `pip install pyarrow`.") from None
+    return pd.read_parquet(path, columns=REQUIRED_COLUMNS)
+
+
+def load_npy(path: Path) -> pd.DataFrame:
+    """
+    Memory-maps a NumPy `.npy` file. Accepts either a structured array with fields named after the data schema
+    columns, or a numeric array with shape (n_points, 3) of x, y and label index (0 for `ids.LABEL_ONE`, 1 for
+    `ids.LABEL_TWO`).
+    """
+    array = np.load(path, mmap_mode='r')
+    if array.dtype.names:
+        points = np.stack((array[DataSchema.X_AXIS], array[DataSchema.Y_AXIS]), axis=1)
+        labels = np.asarray(array[DataSchema.LABELS]).astype(str)
+    else:
+        points = array[:, :2]
+        labels = np.where(array[:, 2] == 0, ids.LABEL_ONE, ids.LABEL_TWO)
+
+    df = pd.DataFrame(points, columns=[DataSchema.X_AXIS, DataSchema.Y_AXIS], copy=False)
+    df[DataSchema.LABELS] = labels
+    return df
+
+
+LOADERS: dict[str, Loader] = {
+    '.csv': load_csv,
+    '.parquet': load_parquet,
+    '.npy': load_npy
+}
+
+
+def file_hash(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Returns the SHA-256 hex digest of a files contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _describe(preprocessor: Preprocessor) -> str:
+    """Creates a stable description of a preprocessor, including the arguments of partial functions."""
+    if isinstance(preprocessor, partial):
+        return f'{_describe(preprocessor.func)}{preprocessor.args}{sorted(preprocessor.keywords.items())}'
+    return f'{preprocessor.__module__}.{preprocessor.__qualname__}'
+
+
+def cache_key(path: Path, preprocessors: list[Preprocessor]) -> str:
+    """Creates a cache key from a source files contents and the description of each preprocessor, in order."""
+    descriptions = '|'.join(_describe(preprocessor) for preprocessor in preprocessors)
+    return hashlib.sha256(f'{file_hash(path)}|{descriptions}'.encode()).hexdigest()[:32]
+
+
+def _write_cache(df: pd.DataFrame, cache_path: Path) -> None:
+    """
+    Stores a DataFrame as columnar `.npy` files: the points as one float array and the labels as categorical codes.
+    Files are written to a temporary directory first, so concurrent workers never read a partial cache.
+    """
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = Path(tempfile.mkdtemp(dir=cache_path.parent))
+
+    labels = pd.Categorical(df[DataSchema.LABELS])
+    np.save(tmp_path / 'points.npy', df[[DataSchema.X_AXIS, DataSchema.Y_AXIS]].to_numpy(dtype=float))
+    np.save(tmp_path / 'labels.npy', np.asarray(labels.codes))
+    (tmp_path / 'categories.json').write_text(json.dumps(labels.categories.tolist()))
+
+    try:
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Another worker stored the same cache first
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def _read_cache(cache_path: Path) -> pd.DataFrame:
+    """Reads a cached DataFrame, memory-mapping its columns so every process shares one copy of the data."""
+    points = np.load(cache_path / 'points.npy', mmap_mode='r')
+    codes = np.load(cache_path / 'labels.npy', mmap_mode='r')
+    categories = json.loads((cache_path / 'categories.json').read_text())
+
+    df = pd.DataFrame(points, columns=[DataSchema.X_AXIS, DataSchema.Y_AXIS], copy=False)
+    df[DataSchema.LABELS] = pd.Categorical.from_codes(codes, categories=categories)
+    return df
+
+
+def load_data(path: str | Path, preprocessors: list[Preprocessor] | None = None,
+              cache_dir: str | Path | None = None) -> pd.DataFrame:
+    """
+    Loads a CSV, Parquet or NumPy `.npy` file and supplies it through a preprocessor pipeline. Returns a pandas DataFrame.
+
+    When a cache directory is given, the preprocessed result is stored on disk, keyed by the source files hash and the
+    preprocessor chain. Later loads, including those from other gunicorn workers, memory-map the cached columns
+    instead of rebuilding a private copy.
+
+    :param path: (str | Path) the path to the data file
+    :param preprocessors: (list[Preprocessor], optional) functions applied to the loaded DataFrame, in order
+    :param cache_dir: (str | Path, optional) a directory for storing preprocessed data. Default is None (no caching)
+    """
+    path = Path(path)
+    preprocessors = preprocessors or []
+    try:
+        loader = LOADERS[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported data file type '{path.suffix}'. Available: {list(LOADERS.keys())}.") from None
+
+    if cache_dir is None:
+        df = loader(path)
+        return compose(*preprocessors)(df) if preprocessors else df
+
+    cache_path = Path(cache_dir) / cache_key(path, preprocessors)
+    if not cache_path.exists():
+        df = loader(path)
+        _write_cache(compose(*preprocessors)(df) if preprocessors else df, cache_path)
+    return _read_cache(cache_path)
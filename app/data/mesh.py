@@ -0,0 +1,149 @@
+import math
+from typing import Callable
+
+import numpy as np
+
+Bounds = tuple[float, float, float, float]
+Predictor = Callable[[np.ndarray], np.ndarray]
+
+
+def step_for_budget(bounds: Bounds, max_cells: int) -> float:
+    """
+    Calculates the smallest mesh step size that keeps the number of mesh cells within a budget. Each axis has
+    `ceil(extent / step)` points, as created by `np.arange`, so the step starts from the ideal `sqrt(area / max_cells)`
+    and grows until the rounded up counts fit.
+
+    :param bounds: (Bounds) the mesh bounds in the form (x_min, x_max, y_min, y_max)
+    :param max_cells: (int) the maximum number of mesh cells
+
+    :return: the distance between neighbouring mesh points
+    """
+    x_min, x_max, y_min, y_max = bounds
+    width, height = x_max - x_min, y_max - y_min
+    step = math.sqrt(width * height / max_cells)
+
+    while True:
+        n_x, n_y = math.ceil(width / step), math.ceil(height / step)
+        if n_x * n_y <= max_cells:
+            return step
+
+        # Move to the next step size at which one of the axes has a point less
+        next_step = min(width / (n_x - 1) if n_x > 1 else math.inf, height / (n_y - 1) if n_y > 1 else math.inf)
+        step = max(next_step, math.nextafter(step, math.inf))
+
+
+def step_for_pixels(bounds: Bounds, width_px: int, height_px: int, cell_px: int = 4) -> float:
+    """
+    Calculates the mesh step size that gives each mesh cell roughly `cell_px` screen pixels in a plot of a given size.
+
+    :param bounds: (Bounds) the mesh bounds in the form (x_min, x_max, y_min, y_max)
+    :param width_px: (int) the plot width in pixels
+    :param height_px: (int) the plot height in pixels
+    :param cell_px: (int) the number of pixels per cell, in each axis. Default is 4
+
+    :return: the distance between neighbouring mesh points
+    """
+    x_min, x_max, y_min, y_max = bounds
+    return max((x_max - x_min) * cell_px / width_px, (y_max - y_min) * cell_px / height_px)
+
+
+def clip_half_plane(bounds: Bounds, a: float, b: float, c: float,
+                    strict: bool = True) -> tuple[list[float], list[float]]:
+    """
+    Clips the bounds rectangle to the half-plane `a * x + b * y + c > 0`, or `>= 0` when not strict
+    (Sutherland-Hodgman with a single edge). The two only cover a different area when the whole rectangle lies on the
+    line, as when a, b and c are all 0: the strict half-plane is then empty and the non-strict one is the rectangle.
+
+    :param bounds: (Bounds) the rectangle bounds in the form (x_min, x_max, y_min, y_max)
+    :param a: (float) the x coefficient of the dividing line
+    :param b: (float) the y coefficient of the dividing line
+    :param c: (float) the constant of the dividing line
+    :param strict: (bool) if True, points on the line are outside the half-plane. Default is True
+
+    :return: the x and y coordinates of the clipped polygon, closed by repeating its first vertex. Both lists are
+             empty when the half-plane does not overlap the rectangle
+    """
+    x_min, x_max, y_min, y_max = bounds
+    vertices = [(x_min, y_min), (x_max, y_min), (x_max, y_max), (x_min, y_max)]
+    side = [a * x + b * y + c for x, y in vertices]
+    inside = [d > 0 if strict else d >= 0 for d in side]
+
+    polygon = []
+    for i, (start, end) in enumerate(zip(vertices, vertices[1:] + vertices[:1])):
+        j = (i + 1) % len(vertices)
+        points = [start] if inside[i] else []
+        if inside[i] != inside[j]:
+            t = side[i] / (side[i] - side[j])
+            points.append((start[0] + t * (end[0] - start[0]), start[1] + t * (end[1] - start[1])))
+        for point in points:
+            # A vertex on the line is also where the edge crosses it, so it is only added once
+            if not polygon or point != polygon[-1]:
+                polygon.append(point)
+
+    if polygon and polygon[-1] == polygon[0]:
+        polygon.pop()
+    if not polygon:
+        return [], []
+    polygon.append(polygon[0])
+    xs, ys = zip(*polygon)
+    return list(xs), list(ys)
+
+
+def adaptive_predict(predict: Predictor, xs: np.ndarray, ys: np.ndarray, block: int = 16) -> tuple[np.ndarray, int]:
+    """
+    Predicts a dense mesh using quadtree-style refinement. The mesh is first split into `block` sized cells and only
+    their corners are evaluated. Blocks whose four corners share a prediction are filled without evaluation and the
+    rest are split into four, until single cells remain. Evaluations therefore concentrate around the decision boundary.
+
+    The result is exact when each class region is convex, such as for networks without hidden layers. Features
+    smaller than a block that touch none of its corners can be missed otherwise.
+
+    :param predict: (Predictor) a function mapping an array of points with shape (n, 2) to n integer predictions
+    :param xs: (np.ndarray) the x coordinates of the mesh
+    :param ys: (np.ndarray) the y coordinates of the mesh
+    :param block: (int) the initial block size in cells, a power of 2. Default is 16
+
+    :return: a tuple of (predictions with shape (len(ys), len(xs)), number of evaluated points)
+    """
+    if block < 1 or block & (block - 1):
+        raise ValueError(f"'block' must be a power of 2, got {block}.")
+
+    n_rows, n_cols = ys.shape[0], xs.shape[0]
+    Z = np.full((n_rows, n_cols), -1, dtype=np.int8)
+    n_evals = 0
+
+    # Cell (i, j) belongs to block (i // size, j // size), with corners clipped to the last row and column
+    size = block
+    active = np.ones(((n_rows - 1) // size + 1, (n_cols - 1) // size + 1), dtype=bool)
+    while size >= 1:
+        block_rows, block_cols = np.nonzero(active)
+        r0, c0 = block_rows * size, block_cols * size
+        r1, c1 = np.minimum(r0 + size, n_rows - 1), np.minimum(c0 + size, n_cols - 1)
+
+        corners = np.unique(np.concatenate((r0 * n_cols + c0, r0 * n_cols + c1, r1 * n_cols + c0, r1 * n_cols + c1)))
+        corners = corners[Z.flat[corners] < 0]
+        if corners.size:
+            rows, cols = np.divmod(corners, n_cols)
+            Z.flat[corners] = predict(np.c_[xs[cols], ys[rows]])
+            n_evals += corners.size
+
+        corner_values = np.stack((Z[r0, c0], Z[r0, c1], Z[r1, c0], Z[r1, c1]))
+        uniform = (corner_values == corner_values[0]).all(axis=0)
+
+        # Fill the undecided cells of uniform blocks
+        values = np.full(active.shape, -1, dtype=np.int8)
+        values[block_rows[uniform], block_cols[uniform]] = corner_values[0, uniform]
+        upsampled = np.repeat(np.repeat(values, size, axis=0), size, axis=1)[:n_rows, :n_cols]
+        np.copyto(Z, upsampled, where=(Z < 0) & (upsampled >= 0))
+
+        if size == 1:
+            break
+
+        # Split the remaining blocks into four
+        split = np.zeros(active.shape, dtype=bool)
+        split[block_rows[~uniform], block_cols[~uniform]] = True
+        size //= 2
+        child_shape = ((n_rows - 1) // size + 1, (n_cols - 1) // size + 1)
+        active = np.repeat(np.repeat(split, 2, axis=0), 2, axis=1)[:child_shape[0], :child_shape[1]]
+
+    return Z.astype(int), n_evals
@@ -0,0 +1,142 @@
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import os
+from threading import Lock
+import time
+from typing import Any, Callable
+
+CHECK_INTERVAL = .01
+
+
+class RenderQueueFull(RuntimeError):
+    """Raised when a job is submitted to a render pool that already has its maximum number of pending jobs."""
+
+
+class RenderPool:
+    """
+    A bounded process pool for heavy render jobs, such as predicting large meshes or deep models and parameter sweeps.
+    Running them in separate processes keeps a slow render from holding the GIL of the worker serving other requests.
+    Jobs cheaper than `min_cost` are run inline instead, as sending them to a process costs more than computing them.
+
+    The processes are started on the first offloaded job and recreated after a fork, so gunicorn workers each get their
+    own pool. Jobs and their arguments must be picklable, and arguments must not be changed while the job is pending, as
+    they are pickled in the background.
+
+    A job that times out, or whose request is superseded, is cancelled when it has not started yet. A started job
+    cannot be interrupted, so its result is discarded when it finishes.
+
+    :param max_workers: (int) number of processes. 0 runs every job inline
+    :param max_pending: (int) maximum number of queued and running jobs. Further jobs raise `RenderQueueFull`
+    :param min_cost: (float) the estimated cost from which jobs are offloaded
+    :param timeout: (float) default number of seconds to wait for a job
+    :param observe: (Callable, optional) a function `(name, phase, seconds)` recording the queue and run time of each
+                    offloaded job, where phase is 'queue' or 'run'
+    """
+    def __init__(self, max_workers: int, max_pending: int, min_cost: float, timeout: float,
+                 observe: Callable[[str, str, float], None] | None = None) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.min_cost = min_cost
+        self.timeout = timeout
+        self.observe = observe
+        self.counts = {'completed': 0, 'cancelled': 0, 'timed_out': 0, 'rejected': 0}
+        self.pending = 0
+        self._executor: ProcessPoolExecutor | None = None
+        self._pid = None
+        self._lock = Lock()
+
+    def should_offload(self, cost: float) -> bool:
+        """Checks if a job with an estimated cost is sent to the pool, rather than run inline."""
+        return self.max_workers > 0 and cost >= self.min_cost
+
+    def run(self, func: Callable, *args, cost: float, name: str = 'job', timeout: float | None = None,
+            cancelled: Callable[[], bool] | None = None) -> Any:
+        """
+        Runs a job, in the pool when its cost reaches `min_cost` and otherwise inline, and waits for its result.
+
+        :param func: (Callable) a picklable, module level function
+        :param args: the picklable arguments of the function
+        :param cost: (float) the estimated cost of the job, such as the number of multiply-adds
+        :param name: (str) the name of the job, used when recording its timings. Default is 'job'
+        :param timeout: (float, optional) number of seconds to wait for the job. Default is `self.timeout`
+        :param cancelled: (Callable, optional) a function returning True when the result is no longer needed, such
+                          as when the request was superseded. It is checked while waiting
+
+        :return: the result of the job
+        :raises RenderQueueFull: when the pool already has `max_pending` jobs
+        :raises concurrent.futures.TimeoutError: when the job does not finish in time
+        :raises concurrent.futures.CancelledError: when the job was cancelled before finishing
+        """
+        if not self.should_offload(cost):
+            return func(*args)
+
+        future = self._submit(func, args)
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        try:
+            while True:
+                try:
+                    result, started, run_seconds = future.result(timeout=CHECK_INTERVAL)
+                    break
+                except TimeoutError:
+                    if cancelled is not None and cancelled():
+                        self._count('cancelled')
+                        raise CancelledError(f"The '{name}' job was superseded.")
+                    if time.monotonic() >= deadline:
+                        self._count('timed_out')
+                        raise
+        except BrokenProcessPool:
+            # A process died, such as from running out of memory. The next job starts a new pool
+            self.shutdown()
+            raise
+        finally:
+            future.cancel()
+
+        self._count('completed')
+        if self.observe is not None:
+            self.observe(name, 'queue', max(started - future.submitted, 0.))
+            self.observe(name, 'run', run_seconds)
+        return result
+
+    def _submit(self, func: Callable, args: tuple) -> Future:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.counts['rejected'] += 1
+                raise RenderQueueFull(f'The render pool already has {self.pending} pending jobs.')
+
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                self._pid = os.getpid()
+
+            self.pending += 1
+            future = self._executor.submit(_timed_call, func, args)
+            future.submitted = time.time()
+            future.add_done_callback(self._finish)
+            return future
+
+    def _finish(self, _future: Future) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def shutdown(self) -> None:
+        """Stops the processes, cancelling queued jobs. The pool restarts on the next offloaded job."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Returns the number of pending jobs and the number of offloaded jobs per outcome."""
+        return {'pending': self.pending, **self.counts}
+
+
+def _timed_call(func: Callable, args: tuple) -> tuple[Any, float, float]:
+    """Runs a job in a pool process. Returns its result, start time and run time, in seconds."""
+    started = time.time()
+    start = time.perf_counter()
+    result = func(*args)
+    return result, started, time.perf_counter() - start
@@ -0,0 +1,153 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from threading import Lock
+import time
+from typing import Any, Callable, Iterator
+
+import numpy as np
+
+Compute = Callable[[np.ndarray], Any]
+ApplyDelta = Callable[[Any, np.ndarray, np.ndarray, np.ndarray], Any]
+
+
+@dataclass
+class TrackedValue:
+    """
+    A data class containing a value derived from a set of parameters.
+
+    :param params: (np.ndarray) the parameters the value was derived from
+    :param value: (Any) the derived value
+    :param n_deltas: (int) number of deltas applied since the value was last fully computed. Default is 0
+    """
+    params: np.ndarray
+    value: Any
+    n_deltas: int = 0
+
+
+@dataclass
+class SessionState:
+    """
+    A data class containing the derived values of a single session, such as its model or per-point margins.
+    Each value tracks the parameters it was derived from, so every consumer sees its own delta.
+
+    :param max_deltas: (int) number of consecutive deltas before a value is fully recomputed. Default is 64
+    """
+    max_deltas: int = 64
+    values: dict[str, TrackedValue] = field(default_factory=dict)
+    lock: Lock = field(default_factory=Lock, repr=False)
+    last_access: float = field(default_factory=time.monotonic)
+
+    def update(self, name: str, params: list[float], compute: Compute, apply_delta: ApplyDelta | None = None) -> Any:
+        """
+        Returns a derived value for a set of parameters. The stored value is reused when its parameters are unchanged,
+        updated with `apply_delta` when some changed, and otherwise computed from the full parameter set.
+
+        :param name: (str) the name of the derived value
+        :param params: (list[float]) the current parameters
+        :param compute: (Compute) a function creating the value from the full parameters
+        :param apply_delta: (ApplyDelta, optional) a function `(value, old_params, new_params, changed_indices)`
+                            returning the updated value, or None when the delta cannot be applied
+
+        :return: the derived value
+        """
+        # A copy, so callers changing their parameter array afterwards never change the tracked parameters
+        params = np.array(params, dtype=float)
+        tracked = self.values.get(name)
+
+        if tracked is not None:
+            changed = np.flatnonzero(params != tracked.params)
+            if changed.size == 0:
+                return tracked.value
+
+            if apply_delta is not None and tracked.n_deltas < self.max_deltas:
+                value = apply_delta(tracked.value, tracked.params, params, changed)
+                if value is not None:
+                    self.values[name] = TrackedValue(params, value, tracked.n_deltas + 1)
+                    return value
+
+        value = compute(params)
+        self.values[name] = TrackedValue(params, value)
+        return value
+
+
+class SessionStore:
+    """
+    A bounded, in-process store of per-session state with time-to-live (TTL) eviction. Sessions idle for longer than
+    the TTL, or the least recently used when full, are forgotten.
+
+    The store only caches state derived from the parameters each request carries, so the browser remains the source
+    of truth. A request reaching a gunicorn worker that has never seen its session, or after eviction, rebuilds the
+    state from its full parameters and is answered correctly, just without the delta shortcut.
+
+    :param max_sessions: (int) maximum number of stored sessions. Default is 1024
+    :param ttl: (float) seconds a session is kept after its last request. Default is 1800
+    :param max_deltas: (int) number of consecutive deltas before a value is fully recomputed. Default is 64
+    """
+    def __init__(self, max_sessions: int = 1024, ttl: float = 1800., max_deltas: int = 64) -> None:
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_deltas = max_deltas
+        self.created = 0
+        self.evicted = 0
+        self._sessions: OrderedDict[str, SessionState] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    @contextmanager
+    def session(self, session_id: str | None) -> Iterator[SessionState]:
+        """
+        Retrieves a sessions state, creating it when missing, and holds its lock so concurrent requests from the same
+        session never update it at once.
+
+        :param session_id: (str | None) a unique session identifier. Requests without one get a temporary state
+
+        :return: a context manager yielding the SessionState
+        """
+        if session_id is None:
+            yield SessionState(max_deltas=self.max_deltas)
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            state = self._sessions.get(session_id)
+            if state is None:
+                state = SessionState(max_deltas=self.max_deltas)
+                self._sessions[session_id] = state
+                self.created += 1
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+                    self.evicted += 1
+            state.last_access = now
+            self._sessions.move_to_end(session_id)
+
+        with state.lock:
+            yield state
+
+    def evict_expired(self) -> int:
+        """Removes every session idle for longer than the TTL. Returns the number removed."""
+        with self._lock:
+            return self._evict_expired(time.monotonic())
+
+    def _evict_expired(self, now: float) -> int:
+        # Sessions are ordered by last access, so expired sessions are always at the front
+        removed = 0
+        while self._sessions:
+            session_id, state = next(iter(self._sessions.items()))
+            if now - state.last_access <= self.ttl:
+                break
+            del self._sessions[session_id]
+            removed += 1
+        self.evicted += removed
+        return removed
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {'size': len(self._sessions), 'max_sessions': self.max_sessions, 'created': self.created,
+                'evicted': self.evicted}
@@ -1,26 +1,185 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Any, Callable, Hashable, Iterable
 
 import pandas as pd
 import numpy as np
 
 from app.data import ids
+from app.data.cache import LRUCache
 from app.data.generate import DataSchema
+from app.data.mesh import step_for_budget
+
+# Source of the tokens identifying each DataFrame assigned to a data source, in this process
+_DATA_TOKENS = count()
 
 
 @dataclass
 class DataSource:
-    """A data class for retrieving information from a given pandas DataFrame."""
+    """
+    A data class for retrieving information from a given pandas DataFrame.
+
+    Derived artifacts (bounds, mesh arrays, etc.) are computed lazily and memoized. They are invalidated automatically
+    when the underlying DataFrame or mesh budget is replaced.
+
+    :param _data: (pd.DataFrame) the data
+    :param mesh_budget: (int) maximum number of prediction mesh cells. The mesh step and padding scale with the data
+                        range to fit it. Default is 0 (a fixed step of `ids.MESH_STEP` and padding of `ids.MESH_PADDING`)
+    """
     _data: pd.DataFrame
+    mesh_budget: int = 0
+    _cache: dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == '_data':
+            super().__setattr__('_token', next(_DATA_TOKENS))
+        if name in ('_data', 'mesh_budget') and '_cache' in self.__dict__:
+            self._cache.clear()
+
+    def memoize(self, name: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Retrieves a derived artifact, computing and storing it first when missing.
+
+        :param name: (Hashable) a unique name for the artifact
+        :param compute: (Callable) a function without arguments that creates the artifact
+
+        :return: the memoized artifact
+        """
+        if name not in self._cache:
+            self._cache[name] = compute()
+        return self._cache[name]
+
+    def filter(self, x: Iterable[float] | None = None, y: Iterable[float] | None = None,
+               labels: Iterable[str] | None = None, x_range: tuple[float, float] | None = None,
+               y_range: tuple[float, float] | None = None) -> DataSource:
+        """
+        Filters the data using boolean masks built from precomputed indexes. Predicates set to None are ignored.
+        When every row matches, the same DataSource is returned, and contiguous matches are returned as views.
+        Repeated filters are served from a small cache.
+
+        :param x: (Iterable[float], optional) a set of x values to keep
+        :param y: (Iterable[float], optional) a set of y values to keep
+        :param labels: (Iterable[str], optional) a set of labels to keep
+        :param x_range: (tuple[float, float], optional) an inclusive (min, max) range of x values to keep
+        :param y_range: (tuple[float, float], optional) an inclusive (min, max) range of y values to keep
+
+        :return: a DataSource containing the matching rows
+        """
+        key = tuple(None if values is None else frozenset(values) for values in (x, y, labels)) + (x_range, y_range)
+        cache = self.memoize('filter_cache', lambda: LRUCache(maxsize=32))
+        return cache.get_or_compute(key, lambda: self._filter(*key))
+
+    def _filter(self, x: frozenset | None, y: frozenset | None, labels: frozenset | None,
+                x_range: tuple[float, float] | None, y_range: tuple[float, float] | None) -> DataSource:
+        mask = np.ones(self.row_count, dtype=bool)
+        for column, values in ((DataSchema.X_AXIS, x), (DataSchema.Y_AXIS, y)):
+            if values is not None:
+                mask &= np.isin(self._data[column].to_numpy(), np.fromiter(values, dtype=float, count=len(values)))
+
+        if labels is not None:
+            codes, categories = self._label_index
+            selected = np.flatnonzero(np.isin(categories, list(labels)))
+            mask &= np.isin(codes, selected)
+
+        for column, bounds in ((DataSchema.X_AXIS, x_range), (DataSchema.Y_AXIS, y_range)):
+            if bounds is not None:
+                order, sorted_values = self._sorted_index(column)
+                start, stop = np.searchsorted(sorted_values, bounds[0], 'left'), np.searchsorted(sorted_values, bounds[1], 'right')
+                in_range = np.zeros(self.row_count, dtype=bool)
+                in_range[order[start:stop]] = True
+                mask &= in_range
+
+        if mask.all():
+            return self
+
+        rows = np.flatnonzero(mask)
+        if rows.size and rows[-1] - rows[0] + 1 == rows.size:
+            return DataSource(self._data.iloc[rows[0]:rows[-1] + 1], mesh_budget=self.mesh_budget)
+        return DataSource(self._data.iloc[rows], mesh_budget=self.mesh_budget)
+
+    def sample(self, n_rows: int, seed: int = 0) -> DataSource:
+        """
+        Randomly samples rows without replacement, keeping the proportion of each label and the original row order.
+        Returns the same DataSource when it has `n_rows` rows or fewer.
+
+        :param n_rows: (int) the number of rows to keep
+        :param seed: (int) number for random seed. Default is 0
+
+        :return: a DataSource containing the sampled rows
+        """
+        if self.row_count <= n_rows:
+            return self
+
+        rng = np.random.default_rng(seed)
+        codes, categories = self._label_index
+        rows = []
+        for code in range(categories.size):
+            label_rows = np.flatnonzero(codes == code)
+            n_label = round(n_rows * label_rows.size / self.row_count)
+            rows.append(rng.choice(label_rows, size=n_label, replace=False))
+        return DataSource(self._data.iloc[np.sort(np.concatenate(rows))], mesh_budget=self.mesh_budget)
+
+    def density(self, bins: int = 100) -> pd.DataFrame:
+        """
+        Bins the points of each label into a 2D histogram over the data bounds.
+
+        :param bins: (int) number of bins per axis. Default is 100
+
+        :return: a DataFrame of non-empty bins, containing their centre coordinates, label and point count
+        """
+        codes, categories = self._label_index
+        X = self.x_and_y
+        x_edges = np.linspace(X[:, 0].min(), X[:, 0].max(), bins + 1)
+        y_edges = np.linspace(X[:, 1].min(), X[:, 1].max(), bins + 1)
+        x_centres, y_centres = (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2
 
-    def filter(self, x: list[str], y: list[str], labels: list[str]) -> DataSource:
-        filtered_data = self._data.query(f"{ids.X_COL_NAME} in {x} and {ids.Y_COL_NAME} in {y} and {ids.LABEL_COL_NAME} in {labels}")
-        return DataSource(filtered_data)
+        frames = []
+        for code, label in enumerate(categories):
+            in_label = codes == code
+            counts, _, _ = np.histogram2d(X[in_label, 0], X[in_label, 1], bins=[x_edges, y_edges])
+            x_bins, y_bins = np.nonzero(counts)
+            frames.append(pd.DataFrame({
+                DataSchema.X_AXIS: x_centres[x_bins],
+                DataSchema.Y_AXIS: y_centres[y_bins],
+                DataSchema.LABELS: label,
+                'count': counts[x_bins, y_bins].astype(int)
+            }))
+        return pd.concat(frames, ignore_index=True)
+
+    @property
+    def _label_index(self) -> tuple[np.ndarray, np.ndarray]:
+        """The labels as categorical (codes, categories) arrays."""
+        def compute() -> tuple[np.ndarray, np.ndarray]:
+            categorical = pd.Categorical(self._data[DataSchema.LABELS])
+            return _read_only(np.asarray(categorical.codes)), _read_only(np.asarray(categorical.categories))
+        return self.memoize('label_index', compute)
+
+    def _sorted_index(self, column: str) -> tuple[np.ndarray, np.ndarray]:
+        """The row order that sorts a column, and the sorted column values."""
+        def compute() -> tuple[np.ndarray, np.ndarray]:
+            values = self._data[column].to_numpy()
+            order = np.argsort(values, kind='stable')
+            return _read_only(order), _read_only(values[order])
+        return self.memoize(('sorted_index', column), compute)
 
     @property
     def data(self) -> pd.DataFrame:
         return self._data
 
+    @data.setter
+    def data(self, value: pd.DataFrame) -> None:
+        self._data = value
+
+    @property
+    def token(self) -> int:
+        """
+        A number identifying the current DataFrame, unique within the process. Unlike `id(self.data)`, it is never
+        reused by a later DataFrame, so it can key caches that outlive the data.
+        """
+        return self._token
+
     @property
     def row_count(self) -> int:
         return self._data.shape[0]
@@ -43,4 +202,76 @@ class DataSource:
 
     @property
     def x_and_y(self) -> np.array:
-        return self._data[[DataSchema.X_AXIS, DataSchema.Y_AXIS]].to_numpy()
+        """The points as an array with shape (n_points, 2). A view of the data when possible, see `_column_pair`."""
+        def compute() -> np.ndarray:
+            x, y = (self._data[column].to_numpy() for column in (DataSchema.X_AXIS, DataSchema.Y_AXIS))
+            return _read_only(_column_pair(x, y))
+        return self.memoize('x_and_y', compute)
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        """The padded data bounds in the form (x_min, x_max, y_min, y_max)."""
+        def compute() -> tuple[float, float, float, float]:
+            X = self.x_and_y
+            x_min, x_max, y_min, y_max = X[:, 0].min(), X[:, 0].max(), X[:, 1].min(), X[:, 1].max()
+            if self.mesh_budget:
+                padding = max(x_max - x_min, y_max - y_min, ids.MESH_STEP) * ids.MESH_PADDING_RATIO
+            else:
+                padding = ids.MESH_PADDING
+            return x_min - padding, x_max + padding, y_min - padding, y_max + padding
+        return self.memoize('bounds', compute)
+
+    @property
+    def mesh_step(self) -> float:
+        """The distance between neighbouring prediction mesh points."""
+        if self.mesh_budget:
+            return self.memoize('mesh_step', lambda: step_for_budget(self.bounds, self.mesh_budget))
+        return ids.MESH_STEP
+
+    @property
+    def mesh_axes(self) -> tuple[np.ndarray, np.ndarray]:
+        """The x and y coordinates of the prediction mesh, spaced by `mesh_step` over the padded bounds."""
+        def compute() -> tuple[np.ndarray, np.ndarray]:
+            x_min, x_max, y_min, y_max = self.bounds
+            return _read_only(np.arange(x_min, x_max, self.mesh_step)), _read_only(np.arange(y_min, y_max, self.mesh_step))
+        return self.memoize('mesh_axes', compute)
+
+    @property
+    def mesh(self) -> tuple[np.ndarray, np.ndarray]:
+        """The 2D mesh coordinate arrays (xx, yy), created with `np.meshgrid`."""
+        return self.memoize('mesh', lambda: tuple(_read_only(axis) for axis in np.meshgrid(*self.mesh_axes)))
+
+    @property
+    def grid(self) -> np.ndarray:
+        """The mesh flattened into an array of points with shape (n_cells, 2)."""
+        def compute() -> np.ndarray:
+            xx, yy = self.mesh
+            return _read_only(np.c_[xx.ravel(), yy.ravel()])
+        return self.memoize('grid', compute)
+
+
+def _column_pair(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Combines two columns into an array with shape (n_points, 2). When both columns lie in one buffer with the same
+    strides, such as the points block of a DataFrame or a memory-mapped points file, the result is a view of that
+    buffer, so gunicorn workers keep sharing the data instead of each copying it.
+    """
+    same_layout = x.dtype == y.dtype and x.ndim == y.ndim == 1 and x.strides == y.strides
+    if same_layout and _buffer_owner(x) is _buffer_owner(y):
+        column_offset = y.ctypes.data - x.ctypes.data
+        return np.lib.stride_tricks.as_strided(x, shape=(x.shape[0], 2), strides=(x.strides[0], column_offset),
+                                               writeable=False)
+    return np.column_stack((x, y))
+
+
+def _buffer_owner(array: np.ndarray) -> Any:
+    """Returns the object owning the memory of an array, such as the array itself or a memory map."""
+    while isinstance(array, np.ndarray) and array.base is not None:
+        array = array.base
+    return array
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """Marks an array as read-only, protecting memoized artifacts from in-place changes."""
+    array.setflags(write=False)
+    return array
@@ -0,0 +1,232 @@
+from bisect import bisect_left
+import cProfile
+from contextlib import contextmanager
+from functools import wraps
+import os
+from pathlib import Path
+from threading import Lock
+import time
+from typing import Any, Callable, Iterator, Mapping
+
+from flask import Flask, Response, g, request
+
+from app import settings
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1., 2.5, 5.)
+
+# Upper bounds of the payload size histogram buckets, in bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    """
+    A cumulative histogram with fixed bucket upper bounds, matching the Prometheus histogram type.
+
+    :param buckets: (tuple[float, ...]) the ascending bucket upper bounds. A final `+Inf` bucket is implied
+    """
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> list[int]:
+        totals, running = [], 0
+        for count in self.counts:
+            running += count
+            totals.append(running)
+        return totals
+
+
+class Registry:
+    """
+    A thread-safe collection of labelled histograms and gauges, rendered in the Prometheus text exposition format.
+    """
+    def __init__(self) -> None:
+        self._metrics: dict[str, tuple[str, tuple[float, ...]]] = {}
+        self._histograms: dict[tuple[str, Labels], Histogram] = {}
+        self._gauges: dict[str, tuple[str, Callable[[], dict[Labels, float]]]] = {}
+        self._lock = Lock()
+
+    def histogram(self, name: str, help_text: str, buckets: tuple[float, ...]) -> None:
+        """Declares a histogram metric. Observations are recorded per label set."""
+        self._metrics[name] = (help_text, buckets)
+
+    def gauge(self, name: str, help_text: str, collect: Callable[[], dict[Labels, float]]) -> None:
+        """Declares a gauge metric whose values are read from `collect` whenever the metrics are rendered."""
+        self._gauges[name] = (help_text, collect)
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Records a value in a declared histogram for a set of labels."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self._metrics[name][1])
+            histogram.observe(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, (help_text, buckets) in self._metrics.items():
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+                for (metric, labels), histogram in self._histograms.items():
+                    if metric != name:
+                        continue
+                    bounds = [_format_value(bound) for bound in buckets] + ['+Inf']
+                    for bound, count in zip(bounds, histogram.cumulative_counts()):
+                        lines.append(f'{name}_bucket{_format_labels(labels + (("le", bound),))} {count}')
+                    lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {histogram.count}')
+
+        for name, (help_text, collect) in self._gauges.items():
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} gauge']
+            lines += [f'{name}{_format_labels(labels)} {_format_value(value)}' for labels, value in collect().items()]
+        return '\n'.join(lines) + '\n'
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    escaped = (f'{key}="{_escape(value)}"' for key, value in labels)
+    return '{' + ','.join(escaped) + '}'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+REGISTRY = Registry()
+REGISTRY.histogram('app_stage_seconds', 'Time spent in each rendering stage.', LATENCY_BUCKETS)
+REGISTRY.histogram('app_callback_seconds', 'Time spent in each Dash callback function.', LATENCY_BUCKETS)
+REGISTRY.histogram('app_request_seconds', 'Time spent handling each Dash callback request, including '
+                                          'serialization.', LATENCY_BUCKETS)
+REGISTRY.histogram('app_response_bytes', 'Size of each Dash callback response body.', SIZE_BUCKETS)
+REGISTRY.histogram('app_render_job_seconds', 'Time each offloaded render job spent queued and running in the render '
+                                             'pool.', LATENCY_BUCKETS)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """
+    Records the time spent in a block under a stage name. Does nothing when `settings.INSTRUMENTATION` is disabled.
+
+    :param stage: (str) the name of the stage. For example, 'render.predict_grid'
+    """
+    if not settings.INSTRUMENTATION:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        REGISTRY.observe('app_stage_seconds', time.perf_counter() - start, stage=stage)
+
+
+def record_job(name: str, phase: str, seconds: float) -> None:
+    """
+    Records the queue or run time of a render pool job. Does nothing when `settings.INSTRUMENTATION` is disabled.
+
+    :param name: (str) the name of the job. For example, 'predict_grid'
+    :param phase: (str) either 'queue' or 'run'
+    :param seconds: (float) the time spent in the phase
+    """
+    if settings.INSTRUMENTATION:
+        REGISTRY.observe('app_render_job_seconds', seconds, job=name, phase=phase)
+
+
+def instrumented(name: str) -> Callable[[Callable], Callable]:
+    """
+    Decorates a Dash callback function, recording its duration. When `settings.PROFILE_SLOW_CALLBACKS_MS` is set,
+    every call is profiled and calls slower than the threshold have their cProfile stats written to
+    `settings.PROFILE_DIR`, named after the callback.
+
+    :param name: (str) the name of the callback
+
+    :return: a decorator for the callback function
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not settings.INSTRUMENTATION:
+                return func(*args, **kwargs)
+
+            profiler = _start_profiler()
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                REGISTRY.observe('app_callback_seconds', elapsed, callback=name)
+                if profiler is not None:
+                    profiler.disable()
+                    if elapsed * 1000 >= settings.PROFILE_SLOW_CALLBACKS_MS:
+                        _dump_profile(profiler, name, elapsed)
+        return wrapper
+    return decorator
+
+
+def _start_profiler() -> cProfile.Profile | None:
+    """Starts a profiler for the current thread, if profiling is enabled and no other profiler is active."""
+    if not settings.PROFILE_SLOW_CALLBACKS_MS:
+        return None
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        return None
+    return profiler
+
+
+def _dump_profile(profiler: cProfile.Profile, name: str, elapsed: float) -> None:
+    path = Path(settings.PROFILE_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(path / f'{name}-{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}-{elapsed * 1000:.0f}ms.prof')
+
+
+def register_metrics_route(server: Flask, callback_map: Mapping[str, Any], path: str = '/metrics') -> None:
+    """
+    Times every Dash callback request and adds a route exposing the collected metrics to Prometheus.
+    Requests are labelled by the callback output they update. The output is sent by the client, so only outputs of
+    registered callbacks are used as labels and any other value is labelled 'unknown', bounding the number of series.
+
+    :param server: (Flask) the Flask server of the Dash application
+    :param callback_map: (Mapping[str, Any]) the registered callbacks by output, such as `app.callback_map`
+    :param path: (str) the URL of the metrics route. Default is '/metrics'
+    """
+    @server.before_request
+    def start_timer() -> None:
+        g.instrumentation_start = time.perf_counter()
+
+    @server.after_request
+    def record_request(response: Response) -> Response:
+        if request.path.endswith('/_dash-update-component') and 'instrumentation_start' in g:
+            payload = request.get_json(silent=True) or {}
+            output = payload.get('output') if isinstance(payload, dict) else None
+            output = output if isinstance(output, str) and output in callback_map else 'unknown'
+            REGISTRY.observe('app_request_seconds', time.perf_counter() - g.instrumentation_start, output=output)
+            REGISTRY.observe('app_response_bytes', response.calculate_content_length() or 0, output=output)
+        return response
+
+    @server.route(path)
+    def metrics() -> Response:
+        return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
@@ -1,17 +1,19 @@
 from dash import Dash, html
 import dash_bootstrap_components as dbc
 
-from app.components import scatter_plot, nn_slider, nn_graph
+from app.components import scatter_plot, nn_slider, nn_graph, landscape, metrics_panel, timeline, training
 from app.data import ids
 from app.data.source import DataSource
+from app.models.trajectory import Trajectory
 
 
-def create_layout(app: Dash, data: DataSource) -> dbc.Container:
+def create_layout(app: Dash, data: DataSource, trajectory: Trajectory | None = None) -> dbc.Container:
     """
     Creates the Dash application layout and returns it.
 
     :param app: (Dash) an existing Dash application
     :param data: (DataSource) a data source object containing data
+    :param trajectory: (Trajectory, optional) a precomputed training trajectory, shown with a timeline slider
 
     :return: a dash dbc.Container containing the applications layout
     """
@@ -43,7 +45,14 @@ def create_layout(app: Dash, data: DataSource) -> dbc.Container:
                                 app, data,
                                 weights=ids.SIMPLE_NN_START_WEIGHTS,
                                 biases=ids.SIMPLE_NN_START_BIASES
-                            )
+                            ),
+                            metrics_panel.render_metrics_panel(
+                                app, data,
+                                weights=ids.SIMPLE_NN_START_WEIGHTS,
+                                biases=ids.SIMPLE_NN_START_BIASES
+                            ),
+                            training.render_training_controls(app, data),
+                            *([timeline.render_timeline(app, data, trajectory)] if trajectory is not None else [])
                         ]
                     )
                 ]
@@ -53,13 +62,18 @@ def create_layout(app: Dash, data: DataSource) -> dbc.Container:
                     dbc.Col(
                         xs=12, lg=8,
                         children=[
-                            nn_graph.render_simple_nn_no_hidden(app)
+                            nn_graph.render_simple_nn_no_hidden(
+                                app,
+                                weights=ids.SIMPLE_NN_START_WEIGHTS,
+                                biases=ids.SIMPLE_NN_START_BIASES
+                            )
                         ]
                     ),
                     dbc.Col(
                         xs=12, lg=4,
                         children=[
                             # nn_graph.display_formulas(app)
+                            landscape.render_landscape(app, data)
                         ]
                     )
                 ]
@@ -0,0 +1,50 @@
+from typing import Callable
+
+import numpy as np
+
+# Activations operate in-place on a preallocated buffer and return it
+Activation = Callable[[np.ndarray], np.ndarray]
+
+
+def identity(x: np.ndarray) -> np.ndarray:
+    return x
+
+
+def relu(x: np.ndarray) -> np.ndarray:
+    return np.maximum(x, 0, out=x)
+
+
+def sigmoid(x: np.ndarray) -> np.ndarray:
+    np.negative(x, out=x)
+    np.exp(x, out=x)
+    x += 1
+    return np.reciprocal(x, out=x)
+
+
+def tanh(x: np.ndarray) -> np.ndarray:
+    return np.tanh(x, out=x)
+
+
+ACTIVATIONS: dict[str, Activation] = {
+    'identity': identity,
+    'relu': relu,
+    'sigmoid': sigmoid,
+    'tanh': tanh
+}
+
+
+def get_activation(activation: str | Activation) -> Activation:
+    """
+    Retrieves an activation function by name. Callables are returned unchanged, allowing custom activations.
+
+    :param activation: (str | Activation) the name of a registered activation or an in-place activation function
+
+    :return: an activation function that modifies its input array in-place and returns it
+    """
+    if callable(activation):
+        return activation
+
+    try:
+        return ACTIVATIONS[activation]
+    except KeyError:
+        raise ValueError(f"Unknown activation '{activation}'. Available: {list(ACTIVATIONS.keys())}.") from None
@@ -0,0 +1,38 @@
+from typing import Iterator
+
+import numpy as np
+
+
+def batch_predict(points: np.ndarray, params: np.ndarray,
+                  chunk_size: int = 1 << 22) -> Iterator[tuple[int, np.ndarray]]:
+    """
+    Predicts the class of every point for many simple neural networks (two inputs, two outputs, no hidden layers).
+
+    Parameter sets are evaluated together in one matrix product over (points, parameter sets and outputs), in chunks of
+    at most `chunk_size` output values, bounding memory for large meshes. Each chunk is yielded as soon as it is
+    computed, so it can be consumed while the next one is evaluated.
+
+    :param points: (np.ndarray) the points with shape (n_points, 2), such as the flattened mesh of a data source
+    :param params: (np.ndarray) the flat parameters [w1_1, w1_2, w2_1, w2_2, b_1, b_2] of each network, with shape
+                   (n_networks, 6)
+    :param chunk_size: (int) the maximum number of output values computed at once. Default is 2^22
+
+    :return: an iterator of (index of the first network in the chunk, int8 predictions with shape (n_chunk, n_points))
+    """
+    points = np.asarray(points, dtype=float)
+    params = np.asarray(params, dtype=float)
+    if params.ndim != 2 or params.shape[1] != 6:
+        raise ValueError(f"'params' must have shape (n_networks, 6), got {params.shape}.")
+
+    n_points = points.shape[0]
+    weights, biases = params[:, :4].reshape(-1, 2, 2), params[:, 4:]
+    step = max(chunk_size // (2 * max(n_points, 1)), 1)
+    for start in range(0, params.shape[0], step):
+        stop = start + step
+        # The weight matrices are placed side by side, so every network is evaluated by a single matrix product
+        side_by_side = weights[start:stop].transpose(1, 0, 2).reshape(2, -1)
+        logits = (points @ side_by_side).reshape(n_points, -1, 2)
+        logits += biases[start:stop]
+
+        # Ties resolve to the later class, matching `NeuralNetwork.predict`
+        yield start, (logits[..., 1] >= logits[..., 0]).T.astype(np.int8)
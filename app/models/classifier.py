@@ -1,16 +1,186 @@
 import numpy as np
 
+from app.models.activations import Activation, get_activation, identity
 
-class SimpleNeuralNetwork:
+
+class NeuralNetwork:
+    """
+    A fully-connected feed-forward neural network built from a layer specification.
+
+    All weights and biases are stored in two contiguous, preallocated buffers. Each layer's weight matrix
+    (inputs, outputs) and bias vector are views into them, so parameters can be updated in-place without reallocation.
+
+    :param layer_sizes: (list[int]) number of nodes per layer, including inputs and outputs. For example, [2, 4, 4, 2]
+    :param activation: (str | Activation) activation applied to every hidden layer. Default is 'relu'
+    :param output_activation: (str | Activation) activation applied to the output layer. Default is 'identity'
+    """
+    def __init__(self, layer_sizes: list[int], activation: str | Activation = 'relu',
+                 output_activation: str | Activation = 'identity') -> None:
+        if len(layer_sizes) < 2 or any(size < 1 for size in layer_sizes):
+            raise ValueError(f"'layer_sizes' must contain at least two positive integers, got {layer_sizes}.")
+
+        self.layer_sizes = list(layer_sizes)
+        self.activation = get_activation(activation)
+        self.output_activation = get_activation(output_activation)
+
+        shapes = list(zip(self.layer_sizes[:-1], self.layer_sizes[1:]))
+        self.weight_buffer = np.zeros(sum(n_in * n_out for n_in, n_out in shapes), dtype=float)
+        self.bias_buffer = np.zeros(sum(n_out for _, n_out in shapes), dtype=float)
+
+        self.layer_weights: list[np.ndarray] = []
+        self.layer_biases: list[np.ndarray] = []
+        w_start, b_start = 0, 0
+        for n_in, n_out in shapes:
+            self.layer_weights.append(self.weight_buffer[w_start:w_start + n_in * n_out].reshape(n_in, n_out))
+            self.layer_biases.append(self.bias_buffer[b_start:b_start + n_out])
+            w_start += n_in * n_out
+            b_start += n_out
+
+        self._buffers: tuple[int, list[np.ndarray]] = (0, [])
+
+    def __getstate__(self) -> dict:
+        # Layer weights and biases are views into the buffers, so only the buffers are pickled and copied
+        return {'layer_sizes': self.layer_sizes, 'activation': self.activation,
+                'output_activation': self.output_activation, 'weights': self.weight_buffer, 'biases': self.bias_buffer}
+
+    def __setstate__(self, state: dict) -> None:
+        NeuralNetwork.__init__(self, state['layer_sizes'], state['activation'], state['output_activation'])
+        self.set_params(state['weights'], state['biases'])
+
+    @property
+    def n_layers(self) -> int:
+        """Number of weight layers (excluding the input layer)."""
+        return len(self.layer_weights)
+
+    @property
+    def is_linear(self) -> bool:
+        """True when the network has two inputs, two outputs, no hidden layers and an identity output activation."""
+        return self.layer_sizes == [2, 2] and self.output_activation is identity
+
+    def linear_boundary(self) -> tuple[float, float, float]:
+        """
+        Returns the coefficients (a, b, c) of the decision boundary `a * x + b * y + c = 0` for a linear network.
+        Points where `a * x + b * y + c > 0` are predicted as class 0, otherwise class 1.
+        """
+        if not self.is_linear:
+            raise ValueError(f"Only linear networks have a straight decision boundary, got layers {self.layer_sizes}.")
+
+        weights, biases = self.layer_weights[0], self.layer_biases[0]
+        return (
+            float(weights[0, 0] - weights[0, 1]),
+            float(weights[1, 0] - weights[1, 1]),
+            float(biases[0] - biases[1])
+        )
+
+    def set_params(self, weights: list[float], biases: list[float]) -> None:
+        """
+        Copies a flat set of weights and biases into the network buffers, layer by layer, in row-major order.
+
+        :param weights: (list[float]) a flat list of every weight. For example, [w1_1, w1_2, w2_1, w2_2]
+        :param biases: (list[float]) a flat list of every bias
+        """
+        np.copyto(self.weight_buffer, np.asarray(weights, dtype=float).reshape(self.weight_buffer.shape))
+        np.copyto(self.bias_buffer, np.asarray(biases, dtype=float).reshape(self.bias_buffer.shape))
+
+    def set_param(self, index: int, value: float) -> None:
+        """
+        Sets a single parameter in-place, indexed by its position in the flat list of weights followed by biases.
+
+        :param index: (int) the parameter position. For example, 4 is the first bias of a network with four weights
+        :param value: (float) the new parameter value
+        """
+        if index < self.weight_buffer.size:
+            self.weight_buffer[index] = value
+        else:
+            self.bias_buffer[index - self.weight_buffer.size] = value
+
+    def init_random(self, seed: int | None = None, scale: float = 1.) -> None:
+        """Fills the weights with uniform random values in [-scale, scale] and resets the biases to zero."""
+        rng = np.random.default_rng(seed)
+        self.weight_buffer[:] = rng.uniform(-scale, scale, size=self.weight_buffer.shape)
+        self.bias_buffer[:] = 0
+
+    def _layer_buffers(self, n_points: int) -> list[np.ndarray]:
+        """Returns preallocated activation buffers for a batch size, reusing them for repeated batches of that size."""
+        size, buffers = self._buffers
+        if size != n_points:
+            buffers = [np.empty((n_points, n_out), dtype=float) for n_out in self.layer_sizes[1:]]
+            self._buffers = (n_points, buffers)
+        return buffers
+
+    def _forward(self, data: np.ndarray) -> np.ndarray:
+        """Computes the output layer into a reused buffer. The result is overwritten by the next call."""
+        out = data
+        buffers = self._layer_buffers(data.shape[0])
+        for idx, (weights, biases, buffer) in enumerate(zip(self.layer_weights, self.layer_biases, buffers)):
+            np.matmul(out, weights, out=buffer)
+            buffer += biases
+            activation = self.output_activation if idx == self.n_layers - 1 else self.activation
+            out = activation(buffer)
+        return out
+
+    def forward(self, data: np.ndarray) -> np.ndarray:
+        """
+        Computes the raw output node values for a batch of points in one pass through the network.
+
+        :param data: (np.ndarray) an array of points with shape (n_points, n_inputs)
+
+        :return: an array of output values with shape (n_points, n_outputs)
+        """
+        return self._forward(np.asarray(data, dtype=float)).copy()
+
+    def predict(self, data: np.ndarray, chunk_size: int | None = None) -> np.ndarray:
+        """
+        Predicts the class of each point as the index of its largest output node. Ties resolve to the later node.
+
+        :param data: (np.ndarray) an array of points with shape (n_points, n_inputs)
+        :param chunk_size: (int, optional) maximum number of points evaluated at once. Bounds the memory used by
+                           very large grids. Default is None (all points in one pass)
+
+        :return: an integer array of predictions with shape (n_points,)
+        """
+        data = np.asarray(data, dtype=float)
+        if chunk_size is None or chunk_size >= data.shape[0]:
+            return self._predict_batch(data)
+
+        if chunk_size < 1:
+            raise ValueError(f"'chunk_size' must be a positive integer, got {chunk_size}.")
+
+        preds = np.empty(data.shape[0], dtype=int)
+        for start in range(0, data.shape[0], chunk_size):
+            stop = start + chunk_size
+            preds[start:stop] = self._predict_batch(data[start:stop])
+        return preds
+
+    def _predict_batch(self, data: np.ndarray) -> np.ndarray:
+        outputs = self._forward(data)
+        return outputs.shape[1] - 1 - np.argmax(outputs[:, ::-1], axis=1)
+
+    def calc(self, data: np.array, chunk_size: int | None = None) -> list[int]:
+        """
+        Predicts the class of each point. Returns a list of integers, one per row.
+
+        :param data: (np.array) an array of points with shape (n_points, n_inputs)
+        :param chunk_size: (int, optional) maximum number of points evaluated at once. Default is None (no chunking)
+        """
+        return self.predict(data, chunk_size=chunk_size).tolist()
+
+
+class SimpleNeuralNetwork(NeuralNetwork):
     """A simple Artificial Neural Network (ANN) containing two input and output nodes."""
     def __init__(self, weights: list[float], biases: list[float]) -> None:
-        self.weights = np.asarray(weights)
-        self.biases = np.asarray(biases)
-
-    def calc(self, data: np.array) -> list[int]:
-        preds = []
-        for row in data:
-            output_1 = row[0] * self.weights[0] + row[1] * self.weights[2] + self.biases[0]
-            output_2 = row[0] * self.weights[1] + row[1] * self.weights[3] + self.biases[1]
-            preds.append(0 if (output_1 > output_2) else 1)
-        return preds
+        super().__init__([2, 2], output_activation='identity')
+        self.set_params(weights, biases)
+
+    @property
+    def weights(self) -> np.ndarray:
+        return self.weight_buffer
+
+    @property
+    def biases(self) -> np.ndarray:
+        return self.bias_buffer
+
+    @property
+    def weight_matrix(self) -> np.ndarray:
+        """The weights as an (inputs, outputs) matrix. For example, [w1, w2, w3, w4] -> [[w1, w2], [w3, w4]]."""
+        return self.layer_weights[0]
@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class ClassificationMetrics:
+    """
+    A data class containing how a network classifies a set of points.
+
+    :param accuracy: (float) the fraction of correctly classified points
+    :param confusion: (np.ndarray) counts of points per (true class, predicted class), with shape (n_classes, n_classes)
+    :param misclassified: (np.ndarray) the row indices of incorrectly classified points
+    """
+    accuracy: float
+    confusion: np.ndarray
+    misclassified: np.ndarray
+
+
+def confusion_matrix(targets: np.ndarray, preds: np.ndarray, n_classes: int = 2) -> np.ndarray:
+    """Counts the points per (true class, predicted class) pair in one pass."""
+    return np.bincount(targets * n_classes + preds, minlength=n_classes * n_classes).reshape(n_classes, n_classes)
+
+
+def classification_metrics(targets: np.ndarray, preds: np.ndarray, n_classes: int = 2) -> ClassificationMetrics:
+    """
+    Computes the accuracy, confusion matrix and misclassified points of a set of predictions.
+
+    :param targets: (np.ndarray) the true class index of each point
+    :param preds: (np.ndarray) the predicted class index of each point
+    :param n_classes: (int) the number of classes. Default is 2
+
+    :return: a ClassificationMetrics object
+    """
+    wrong = targets != preds
+    accuracy = 1 - wrong.mean() if targets.size else 0.
+    return ClassificationMetrics(float(accuracy), confusion_matrix(targets, preds, n_classes), np.flatnonzero(wrong))
+
+
+def linear_outputs(X: np.ndarray, params: np.ndarray) -> np.ndarray:
+    """
+    Computes both outputs of a simple neural network (two inputs, two outputs, no hidden layers) for every point.
+    Each column is computed by `update_linear_outputs` with the same operations, so outputs updated for changed
+    parameters are identical to fully recomputed ones.
+
+    :param X: (np.ndarray) the points with shape (n_points, 2)
+    :param params: (np.ndarray) the flat parameters [w1_1, w1_2, w2_1, w2_2, b_1, b_2]
+
+    :return: the outputs with shape (n_points, 2)
+    """
+    outputs = np.empty((np.shape(X)[0], 2))
+    return update_linear_outputs(outputs, X, params, np.arange(2))
+
+
+def update_linear_outputs(outputs: np.ndarray, X: np.ndarray, params: np.ndarray,
+                          changed: np.ndarray) -> np.ndarray:
+    """
+    Updates the outputs of a simple neural network in-place for a set of changed parameters. Parameter `i` of
+    [w1_1, w1_2, w2_1, w2_2, b_1, b_2] only feeds output `i % 2`, so a single changed parameter recomputes one column.
+
+    :param outputs: (np.ndarray) the outputs with shape (n_points, 2), from `linear_outputs`
+    :param X: (np.ndarray) the points with shape (n_points, 2)
+    :param params: (np.ndarray) the new flat parameters
+    :param changed: (np.ndarray) the indices of the changed parameters
+
+    :return: the updated outputs
+    """
+    params = np.asarray(params, dtype=float)
+    X = np.asarray(X, dtype=float)
+    for column in np.unique(np.asarray(changed) % 2):
+        np.multiply(X[:, 0], params[column], out=outputs[:, column])
+        outputs[:, column] += X[:, 1] * params[2 + column]
+        outputs[:, column] += params[4 + column]
+    return outputs
+
+
+def output_margins(outputs: np.ndarray) -> np.ndarray:
+    """Returns the margin `z_1 - z_2` of each row of outputs. Positive margins are predicted as class 0."""
+    return outputs[:, 0] - outputs[:, 1]
+
+
+def linear_margins(X: np.ndarray, params: np.ndarray) -> np.ndarray:
+    """
+    Computes the output margin `z_1 - z_2` of a simple neural network (two inputs, two outputs, no hidden layers) for
+    every point. Points with a positive margin are predicted as class 0, otherwise class 1.
+
+    Both outputs are computed as `x_1 * w1_j + x_2 * w2_j + b_j` before they are subtracted, the same sum
+    `NeuralNetwork.forward` computes, so the margin is exactly 0 where the outputs tie, and the predictions match
+    `NeuralNetwork.predict` on the boundary.
+
+    :param X: (np.ndarray) the points with shape (n_points, 2)
+    :param params: (np.ndarray) the flat parameters [w1_1, w1_2, w2_1, w2_2, b_1, b_2]
+    """
+    return output_margins(linear_outputs(X, params))
+
+
+def margins_to_predictions(margins: np.ndarray) -> np.ndarray:
+    """Converts margins to class indices. Ties resolve to the later class, matching `NeuralNetwork.predict`."""
+    return (margins <= 0).astype(int)
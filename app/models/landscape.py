@@ -0,0 +1,54 @@
+import numpy as np
+
+# Flat parameter order of the simple neural network, matching the slider titles
+PARAMETER_NAMES = ['w1_1', 'w1_2', 'w2_1', 'w2_2', 'b_1', 'b_2']
+
+METRICS = ['accuracy', 'loss']
+
+
+def sweep_metrics(X: np.ndarray, targets: np.ndarray, params: list[float], pair: tuple[int, int],
+                  values: np.ndarray, chunk_size: int = 1 << 22) -> dict[str, np.ndarray]:
+    """
+    Evaluates the accuracy and mean cross-entropy loss of a simple neural network (two inputs, two outputs, no hidden
+    layers) over a 2-D sweep of two of its parameters, with the others held fixed.
+
+    Every parameter set is evaluated in one batched tensor operation over (parameter sets, points, outputs). Parameter
+    sets are processed in chunks of at most `chunk_size` output values, bounding memory for large data.
+
+    :param X: (np.ndarray) the data points with shape (n_points, 2)
+    :param targets: (np.ndarray) the class index of each point
+    :param params: (list[float]) the flat parameters [w1_1, w1_2, w2_1, w2_2, b_1, b_2]
+    :param pair: (tuple[int, int]) the indices of the swept parameters, along the x and y axes
+    :param values: (np.ndarray) the values each swept parameter takes
+    :param chunk_size: (int) the maximum number of output values computed at once. Default is 2^22
+
+    :return: a dictionary of metric name to an array with shape (len(values), len(values)), indexed [y, x]
+    """
+    X = np.asarray(X, dtype=float)
+    targets = np.asarray(targets)
+    n_points, n_values = X.shape[0], values.shape[0]
+
+    grid = np.tile(np.asarray(params, dtype=float), (n_values * n_values, 1))
+    ys, xs = np.meshgrid(values, values, indexing='ij')
+    grid[:, pair[0]] = xs.ravel()
+    grid[:, pair[1]] = ys.ravel()
+
+    weights, biases = grid[:, :4].reshape(-1, 2, 2), grid[:, 4:]
+    rows = np.arange(n_points)
+    accuracy, loss = np.empty(grid.shape[0]), np.empty(grid.shape[0])
+
+    step = max(chunk_size // (2 * max(n_points, 1)), 1)
+    for start in range(0, grid.shape[0], step):
+        stop = start + step
+        logits = np.einsum('nk,gkc->gnc', X, weights[start:stop]) + biases[start:stop, None, :]
+
+        # Ties resolve to the later class, matching `NeuralNetwork.predict`
+        preds = (logits[..., 1] >= logits[..., 0]).astype(int)
+        accuracy[start:stop] = (preds == targets).mean(axis=1)
+
+        logits -= logits.max(axis=2, keepdims=True)
+        log_probs = logits - np.log(np.exp(logits).sum(axis=2, keepdims=True))
+        loss[start:stop] = -np.maximum(log_probs[:, rows, targets], np.log(1e-12)).mean(axis=1)
+
+    shape = (n_values, n_values)
+    return {'accuracy': accuracy.reshape(shape), 'loss': loss.reshape(shape)}
@@ -0,0 +1,203 @@
+from dataclasses import dataclass
+from threading import Event, Lock, Thread
+import time
+
+import numpy as np
+
+from app.data import ids
+from app.models.classifier import NeuralNetwork
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    A data class containing the state of a training run at a point in time.
+
+    :param epoch: (int) number of completed passes over the data
+    :param step: (int) number of completed gradient descent updates
+    :param weights: (list[float]) a flat list of the network weights
+    :param biases: (list[float]) a flat list of the network biases
+    :param loss: (float) the mean cross-entropy loss over the data
+    :param accuracy: (float) the fraction of correctly classified points
+    """
+    epoch: int
+    step: int
+    weights: list[float]
+    biases: list[float]
+    loss: float
+    accuracy: float
+
+
+def labels_to_targets(labels: np.ndarray) -> np.ndarray:
+    """Converts labels to class indices, matching the network outputs: 0 for `ids.LABEL_ONE`, otherwise 1."""
+    return np.where(np.asarray(labels) == ids.LABEL_ONE, 0, 1)
+
+
+def softmax_cross_entropy(model: NeuralNetwork, X: np.ndarray, targets: np.ndarray) -> tuple[float, np.ndarray, np.ndarray]:
+    """
+    Computes the mean softmax cross-entropy loss of a network without hidden layers and its gradients.
+
+    :param model: (NeuralNetwork) a network without hidden layers and an identity output activation
+    :param X: (np.ndarray) a batch of points with shape (n_points, n_inputs)
+    :param targets: (np.ndarray) the class index of each point
+
+    :return: a tuple of (loss, weight gradients with shape (n_inputs, n_outputs), bias gradients with shape (n_outputs,))
+    """
+    logits = model.forward(X)
+    logits -= logits.max(axis=1, keepdims=True)
+    probs = np.exp(logits)
+    probs /= probs.sum(axis=1, keepdims=True)
+
+    rows = np.arange(targets.shape[0])
+    loss = -np.log(np.maximum(probs[rows, targets], 1e-12)).mean()
+
+    probs[rows, targets] -= 1
+    probs /= targets.shape[0]
+    return float(loss), X.T @ probs, probs.sum(axis=0)
+
+
+def gradient_descent_step(model: NeuralNetwork, X: np.ndarray, targets: np.ndarray, learning_rate: float,
+                          param_limit: float = 1.) -> None:
+    """
+    Makes one gradient descent update on a batch, updating a network without hidden layers in-place. Parameters are
+    clipped to [-param_limit, param_limit] after the update.
+
+    :param model: (NeuralNetwork) a network without hidden layers and an identity output activation
+    :param X: (np.ndarray) a batch of points with shape (n_points, n_inputs)
+    :param targets: (np.ndarray) the class index of each point
+    :param learning_rate: (float) the gradient descent step size
+    :param param_limit: (float) maximum absolute value of each parameter. Default is 1
+    """
+    weights, biases = model.layer_weights[0], model.layer_biases[0]
+    _, grad_w, grad_b = softmax_cross_entropy(model, X, targets)
+    weights -= learning_rate * grad_w
+    biases -= learning_rate * grad_b
+    np.clip(model.weight_buffer, -param_limit, param_limit, out=model.weight_buffer)
+    np.clip(model.bias_buffer, -param_limit, param_limit, out=model.bias_buffer)
+
+
+def gradient_descent_epoch(model: NeuralNetwork, X: np.ndarray, targets: np.ndarray, learning_rate: float,
+                           batch_size: int, rng: np.random.Generator, param_limit: float = 1.) -> int:
+    """
+    Runs one pass of shuffled mini-batch gradient descent over the data, updating a network without hidden layers
+    in-place. Parameters are clipped to [-param_limit, param_limit] after every update.
+
+    :param model: (NeuralNetwork) a network without hidden layers and an identity output activation
+    :param X: (np.ndarray) the training points with shape (n_points, n_inputs)
+    :param targets: (np.ndarray) the class index of each point
+    :param learning_rate: (float) the gradient descent step size
+    :param batch_size: (int) number of points per update
+    :param rng: (np.random.Generator) the random generator used for shuffling
+    :param param_limit: (float) maximum absolute value of each parameter. Default is 1
+
+    :return: the number of updates made
+    """
+    order = rng.permutation(X.shape[0])
+    for start in range(0, order.size, batch_size):
+        batch = order[start:start + batch_size]
+        gradient_descent_step(model, X[batch], targets[batch], learning_rate, param_limit)
+    return -(-order.size // batch_size)
+
+
+def evaluate(model: NeuralNetwork, X: np.ndarray, targets: np.ndarray) -> tuple[float, float]:
+    """Returns the mean cross-entropy loss and accuracy of a network over the data."""
+    loss, _, _ = softmax_cross_entropy(model, X, targets)
+    return loss, float((model.predict(X) == targets).mean())
+
+
+class Trainer:
+    """
+    Trains a network without hidden layers using mini-batch gradient descent in a background thread.
+
+    Training is paced to the snapshot rate: the loop makes `steps_per_snapshot` updates, publishes its state as a
+    `Snapshot`, then waits until `snapshot_interval` seconds have passed since the previous one. Readers polling at
+    that cadence see every snapshot, so the sliders animate the descent rather than jumping to its end. Parameters are
+    kept within [-param_limit, param_limit], matching the slider range.
+
+    :param model: (NeuralNetwork) a network without hidden layers, updated in-place
+    :param X: (np.ndarray) the training points with shape (n_points, n_inputs)
+    :param targets: (np.ndarray) the class index of each point
+    :param learning_rate: (float) the gradient descent step size. Default is 0.1
+    :param batch_size: (int) number of points per update. Default is 16
+    :param max_epochs: (int) number of passes over the data before stopping. Default is 500
+    :param snapshot_interval: (float) minimum seconds between published snapshots. Default is 0.2
+    :param steps_per_snapshot: (int) number of updates between published snapshots. Default is 10
+    :param param_limit: (float) maximum absolute value of each parameter. Default is 1
+    :param seed: (int, optional) number for the shuffling random seed
+    """
+    def __init__(self, model: NeuralNetwork, X: np.ndarray, targets: np.ndarray, learning_rate: float = 0.1,
+                 batch_size: int = 16, max_epochs: int = 500, snapshot_interval: float = 0.2,
+                 steps_per_snapshot: int = 10, param_limit: float = 1., seed: int | None = None) -> None:
+        if model.n_layers != 1:
+            raise ValueError(f"Only networks without hidden layers can be trained, got layers {model.layer_sizes}.")
+
+        self.model = model
+        self.X = np.asarray(X, dtype=float)
+        self.targets = np.asarray(targets)
+        self.learning_rate = learning_rate
+        self.batch_size = max(int(batch_size), 1)
+        self.max_epochs = max_epochs
+        self.snapshot_interval = snapshot_interval
+        self.steps_per_snapshot = max(int(steps_per_snapshot), 1)
+        self.param_limit = param_limit
+
+        self._rng = np.random.default_rng(seed)
+        self._stop = Event()
+        self._lock = Lock()
+        self._thread: Thread | None = None
+        self._snapshot = self._take_snapshot(epoch=0, step=0)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def latest(self) -> Snapshot:
+        """Returns the most recently published snapshot."""
+        with self._lock:
+            return self._snapshot
+
+    def start(self) -> None:
+        """Starts training in a daemon thread. Does nothing if already running."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 1.) -> None:
+        """Signals the training thread to stop and waits for it to publish its final snapshot."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _take_snapshot(self, epoch: int, step: int) -> Snapshot:
+        loss, accuracy = evaluate(self.model, self.X, self.targets)
+        return Snapshot(epoch, step, self.model.weight_buffer.tolist(), self.model.bias_buffer.tolist(), loss, accuracy)
+
+    def _publish(self, epoch: int, step: int) -> None:
+        snapshot = self._take_snapshot(epoch, step)
+        with self._lock:
+            self._snapshot = snapshot
+
+    def _run(self) -> None:
+        step, epoch = 0, 0
+        next_publish = time.monotonic() + self.snapshot_interval
+
+        while epoch < self.max_epochs and not self._stop.is_set():
+            order = self._rng.permutation(self.X.shape[0])
+            for start in range(0, order.size, self.batch_size):
+                batch = order[start:start + self.batch_size]
+                gradient_descent_step(self.model, self.X[batch], self.targets[batch], self.learning_rate,
+                                      self.param_limit)
+                step += 1
+
+                if step % self.steps_per_snapshot == 0:
+                    # Waiting on the stop event keeps the stop button responsive while the loop is ahead of schedule
+                    if self._stop.wait(max(next_publish - time.monotonic(), 0.)):
+                        break
+                    self._publish(epoch, step)
+                    next_publish = time.monotonic() + self.snapshot_interval
+            else:
+                epoch += 1
+
+        self._publish(epoch, step)
@@ -0,0 +1,177 @@
+from dataclasses import dataclass
+import hashlib
+import io
+import os
+from pathlib import Path
+import tempfile
+
+import numpy as np
+
+from app.data.source import DataSource
+from app.models.classifier import SimpleNeuralNetwork
+from app.models.training import Snapshot, evaluate, gradient_descent_epoch, labels_to_targets
+
+
+@dataclass
+class Trajectory:
+    """
+    A data class containing a precomputed training run, with one frame per epoch. Frame 0 is the initial state.
+
+    :param steps: (np.ndarray) number of completed gradient descent updates per frame, with shape (n_frames,)
+    :param weights: (np.ndarray) flat network weights per frame, with shape (n_frames, n_weights)
+    :param biases: (np.ndarray) flat network biases per frame, with shape (n_frames, n_biases)
+    :param loss: (np.ndarray) the mean cross-entropy loss over the data per frame, with shape (n_frames,)
+    :param accuracy: (np.ndarray) the fraction of correctly classified points per frame, with shape (n_frames,)
+    :param grids: (np.ndarray) the mesh predictions per frame, with shape (n_frames, n_y, n_x)
+    """
+    steps: np.ndarray
+    weights: np.ndarray
+    biases: np.ndarray
+    loss: np.ndarray
+    accuracy: np.ndarray
+    grids: np.ndarray
+
+    @property
+    def n_frames(self) -> int:
+        return self.steps.shape[0]
+
+    def frame(self, epoch: int) -> Snapshot:
+        """Returns the state of the training run after a number of epochs, clipped to the available frames."""
+        epoch = min(max(int(epoch), 0), self.n_frames - 1)
+        return Snapshot(
+            epoch, int(self.steps[epoch]), self.weights[epoch].tolist(), self.biases[epoch].tolist(),
+            float(self.loss[epoch]), float(self.accuracy[epoch])
+        )
+
+    def save(self, path: str | Path) -> None:
+        """
+        Stores the trajectory as a compressed NumPy archive. The prediction grids are bit-packed and every frame is
+        XOR-ed with the previous one, so unchanged cells and parameter bits become runs of zeros that compress well.
+        The encoding is lossless. Files are written to a temporary path first, so readers never see a partial archive.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        packed = np.packbits(self.grids.reshape(self.n_frames, -1).astype(np.uint8), axis=1)
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            steps=self.steps,
+            weights=_xor_delta(self.weights.view(np.uint64)),
+            biases=_xor_delta(self.biases.view(np.uint64)),
+            loss=self.loss,
+            accuracy=self.accuracy,
+            grid_shape=np.asarray(self.grids.shape[1:]),
+            grids=_xor_delta(packed)
+        )
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as file:
+            file.write(buffer.getvalue())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'Trajectory':
+        """Reads a trajectory stored with `save`, decoding every frame up front so lookups need no computation."""
+        with np.load(path) as archive:
+            n_y, n_x = archive['grid_shape']
+            packed = np.bitwise_xor.accumulate(archive['grids'], axis=0)
+            grids = np.unpackbits(packed, axis=1, count=n_y * n_x).reshape(-1, n_y, n_x)
+            return cls(
+                steps=archive['steps'],
+                weights=np.bitwise_xor.accumulate(archive['weights'], axis=0).view(float),
+                biases=np.bitwise_xor.accumulate(archive['biases'], axis=0).view(float),
+                loss=archive['loss'],
+                accuracy=archive['accuracy'],
+                grids=grids
+            )
+
+
+def _xor_delta(array: np.ndarray) -> np.ndarray:
+    """XORs each row of an unsigned integer array with the previous row. The first row is kept as-is."""
+    delta = array.copy()
+    delta[1:] ^= array[:-1]
+    return delta
+
+
+def compute_trajectory(source: DataSource, weights: list[float], biases: list[float], epochs: int,
+                       learning_rate: float = 0.5, batch_size: int = 16, param_limit: float = 1.,
+                       seed: int | None = 0) -> Trajectory:
+    """
+    Trains a simple neural network on a data source with mini-batch gradient descent, recording the parameters,
+    metrics and mesh predictions after every epoch.
+
+    :param source: (DataSource) a data source object containing data
+    :param weights: (list[float]) the initial network weights
+    :param biases: (list[float]) the initial network biases
+    :param epochs: (int) number of passes over the data
+    :param learning_rate: (float) the gradient descent step size. Default is 0.5
+    :param batch_size: (int) number of points per update. Default is 16
+    :param param_limit: (float) maximum absolute value of each parameter. Default is 1
+    :param seed: (int, optional) number for the shuffling random seed. Default is 0
+
+    :return: a Trajectory with `epochs + 1` frames
+    """
+    model = SimpleNeuralNetwork(weights, biases)
+    X, targets = source.x_and_y, labels_to_targets(source.all_labels)
+    x_, y_ = source.mesh_axes
+    rng = np.random.default_rng(seed)
+
+    n_frames = epochs + 1
+    trajectory = Trajectory(
+        steps=np.zeros(n_frames, dtype=np.int64),
+        weights=np.empty((n_frames, model.weight_buffer.size)),
+        biases=np.empty((n_frames, model.bias_buffer.size)),
+        loss=np.empty(n_frames),
+        accuracy=np.empty(n_frames),
+        grids=np.empty((n_frames, y_.shape[0], x_.shape[0]), dtype=np.uint8)
+    )
+
+    step = 0
+    for epoch in range(n_frames):
+        if epoch:
+            step += gradient_descent_epoch(model, X, targets, learning_rate, max(int(batch_size), 1), rng, param_limit)
+        trajectory.steps[epoch] = step
+        trajectory.weights[epoch] = model.weight_buffer
+        trajectory.biases[epoch] = model.bias_buffer
+        trajectory.loss[epoch], trajectory.accuracy[epoch] = evaluate(model, X, targets)
+        trajectory.grids[epoch] = model.predict(source.grid).reshape(y_.shape[0], x_.shape[0])
+    return trajectory
+
+
+def trajectory_key(source: DataSource, weights: list[float], biases: list[float], epochs: int,
+                   learning_rate: float, batch_size: int, param_limit: float, seed: int | None) -> str:
+    """Creates a cache key from the data, the mesh and the training configuration."""
+    x_, y_ = source.mesh_axes
+    digest = hashlib.sha256()
+    for array in (source.x_and_y, np.asarray(source.all_labels, dtype=str), x_, y_):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    digest.update(repr((list(weights), list(biases), epochs, learning_rate, batch_size, param_limit, seed)).encode())
+    return digest.hexdigest()[:32]
+
+
+def load_trajectory(source: DataSource, weights: list[float], biases: list[float], epochs: int,
+                    learning_rate: float = 0.5, batch_size: int = 16, param_limit: float = 1.,
+                    seed: int | None = 0, cache_dir: str | Path | None = None) -> Trajectory:
+    """
+    Loads a precomputed trajectory for a data source and training configuration, computing it first when missing.
+    Stored trajectories are shared by every process using the same cache directory.
+
+    :param source: (DataSource) a data source object containing data
+    :param weights: (list[float]) the initial network weights
+    :param biases: (list[float]) the initial network biases
+    :param epochs: (int) number of passes over the data
+    :param learning_rate: (float) the gradient descent step size. Default is 0.5
+    :param batch_size: (int) number of points per update. Default is 16
+    :param param_limit: (float) maximum absolute value of each parameter. Default is 1
+    :param seed: (int, optional) number for the shuffling random seed. Default is 0
+    :param cache_dir: (str | Path, optional) a directory for storing trajectories. Default is None (no caching)
+    """
+    config = (weights, biases, epochs, learning_rate, batch_size, param_limit, seed)
+    if cache_dir is None:
+        return compute_trajectory(source, *config)
+
+    path = Path(cache_dir) / f'{trajectory_key(source, *config)}.npz'
+    if not path.exists():
+        compute_trajectory(source, *config).save(path)
+    return Trajectory.load(path)
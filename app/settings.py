@@ -0,0 +1,95 @@
+import os
+
+# Maximum number of prediction grids and figures kept in each render cache
+RENDER_CACHE_SIZE = int(os.environ.get('RENDER_CACHE_SIZE', 512))
+
+# Pre-compute the starting weights and biases figure when the app starts
+RENDER_CACHE_WARMUP = os.environ.get('RENDER_CACHE_WARMUP', 'True') != 'False'
+
+# Format of heatmap updates sent to the browser. One of: ['json', 'bits', 'rle', 'contour']
+GRID_TRANSPORT = os.environ.get('GRID_TRANSPORT', 'json')
+
+# Recompute the simple network heatmap in the browser instead of on the server
+CLIENTSIDE_MODEL = os.environ.get('CLIENTSIDE_MODEL', 'False') != 'False'
+
+# Maximum number of heatmap cells, scaling the mesh step with the data range. 0 keeps a fixed step
+MESH_CELL_BUDGET = int(os.environ.get('MESH_CELL_BUDGET', 0))
+
+# Initial block size for refining the heatmap around the decision boundary. 0 evaluates every cell
+MESH_REFINE_BLOCK = int(os.environ.get('MESH_REFINE_BLOCK', 0))
+
+# Heavy renders, such as large meshes, deep models and landscape sweeps, run in a pool of `RENDER_POOL_WORKERS`
+# processes per server worker once their estimated number of multiply-adds reaches `RENDER_OFFLOAD_COST`. Lighter
+# renders run inline. At most `RENDER_POOL_QUEUE` jobs are pending, and each is abandoned after `RENDER_TIMEOUT`
+# seconds. 0 workers runs every render inline
+RENDER_POOL_WORKERS = int(os.environ.get('RENDER_POOL_WORKERS', 2))
+RENDER_POOL_QUEUE = int(os.environ.get('RENDER_POOL_QUEUE', 8))
+RENDER_OFFLOAD_COST = float(os.environ.get('RENDER_OFFLOAD_COST', 2e7))
+RENDER_TIMEOUT = float(os.environ.get('RENDER_TIMEOUT', 10))
+
+# Draw the decision boundary of linear networks as exact polygons ('analytic') or evaluate a 'heatmap'
+BOUNDARY_MODE = os.environ.get('BOUNDARY_MODE', 'heatmap')
+
+# When sliders update the plot: on release ('mouseup'), on every value while dragging ('drag') or while dragging at
+# most `SLIDER_THROTTLE_HZ` times per second ('throttle'). While dragging, the metrics panel, landscape and network
+# graph are always throttled
+SLIDER_UPDATE_MODE = os.environ.get('SLIDER_UPDATE_MODE', 'mouseup')
+SLIDER_THROTTLE_HZ = float(os.environ.get('SLIDER_THROTTLE_HZ', 10))
+
+# Drop slider updates that are superseded by a newer update from the same session before they are sent
+COALESCE_UPDATES = os.environ.get('COALESCE_UPDATES', 'True') != 'False'
+
+# Maximum number of sessions whose model and metrics state is kept per process, and the seconds an idle session is
+# kept. The browser always sends every parameter, so evicted or unseen sessions are rebuilt correctly
+SESSION_MAX = int(os.environ.get('SESSION_MAX', 1024))
+SESSION_TTL = float(os.environ.get('SESSION_TTL', 1800))
+
+# Store the initial figure and serialized layout in `SNAPSHOT_DIR` on first start, so later workers and restarts
+# load them instead of rebuilding them
+LAYOUT_SNAPSHOT = os.environ.get('LAYOUT_SNAPSHOT', 'True') != 'False'
+
+# Number of layout snapshots kept in `SNAPSHOT_DIR`. Older ones, built for previous code, settings or data, are
+# removed when a new one is stored
+SNAPSHOT_KEEP = int(os.environ.get('SNAPSHOT_KEEP', 2))
+
+# Number of sample data points, and how many of them are labelled positive
+DATA_POINTS = int(os.environ.get('DATA_POINTS', 50))
+DATA_POSITIVE = int(os.environ.get('DATA_POSITIVE', 10))
+
+# Scatter plots with more points than this use WebGL markers instead of SVG
+SCATTER_WEBGL_THRESHOLD = int(os.environ.get('SCATTER_WEBGL_THRESHOLD', 1000))
+
+# Maximum number of scatter markers sent to the browser. Larger data is reduced with a stratified random 'sample' or
+# 'density' binning
+SCATTER_POINT_BUDGET = int(os.environ.get('SCATTER_POINT_BUDGET', 20000))
+SCATTER_DECIMATION = os.environ.get('SCATTER_DECIMATION', 'sample')
+
+# Load data from a CSV, Parquet or NumPy `.npy` file instead of generating it. Preprocessed data is cached in
+# `DATA_CACHE_DIR` and memory-mapped, so gunicorn workers share one copy
+DATA_PATH = os.environ.get('DATA_PATH')
+DATA_CACHE_DIR = os.environ.get('DATA_CACHE_DIR', '.data_cache')
+SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR', os.path.join(DATA_CACHE_DIR, 'snapshots'))
+
+# Number of training snapshots streamed to the sliders and scatter plot per second, the number of gradient descent
+# updates between snapshots, which paces training, and the maximum number of concurrent training sessions per process
+TRAINING_SNAPSHOT_HZ = float(os.environ.get('TRAINING_SNAPSHOT_HZ', 5))
+TRAINING_STEPS_PER_SNAPSHOT = int(os.environ.get('TRAINING_STEPS_PER_SNAPSHOT', 10))
+TRAINING_MAX_SESSIONS = int(os.environ.get('TRAINING_MAX_SESSIONS', 32))
+
+# Number of epochs in the precomputed training trajectory shown by the timeline slider, and its learning rate. The
+# timeline is opt-in, as the trajectory is trained when the app is imported: 0 disables it, and 200 is a good start.
+# Trajectories are stored in `TRAJECTORY_DIR` and shared between processes
+TRAJECTORY_EPOCHS = int(os.environ.get('TRAJECTORY_EPOCHS', 0))
+TRAJECTORY_LEARNING_RATE = float(os.environ.get('TRAJECTORY_LEARNING_RATE', 0.5))
+TRAJECTORY_DIR = os.environ.get('TRAJECTORY_DIR', os.path.join(DATA_CACHE_DIR, 'trajectories'))
+
+# Number of values each swept parameter takes in the loss and accuracy landscape, spanning the slider range
+LANDSCAPE_RESOLUTION = int(os.environ.get('LANDSCAPE_RESOLUTION', 41))
+
+# Record stage and callback timings and response sizes, exposed on the `/metrics` route for Prometheus
+INSTRUMENTATION = os.environ.get('INSTRUMENTATION', 'True') != 'False'
+
+# Profile every callback and write the cProfile stats of those slower than this many milliseconds to `PROFILE_DIR`.
+# 0 disables profiling
+PROFILE_SLOW_CALLBACKS_MS = float(os.environ.get('PROFILE_SLOW_CALLBACKS_MS', 0))
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
+import shutil
+import tempfile
+
+import dash
+from dash import Dash
+from flask import Response
+import numpy as np
+import plotly
+
+from app import settings
+from app.data.source import DataSource
+
+APP_DIR = Path(__file__).parent
+
+# Snapshot directories are named by their key, a truncated SHA-256 hex digest
+KEY_PATTERN = re.compile(r'[0-9a-f]{32}')
+
+
+def snapshot_key(source: DataSource) -> str:
+    """
+    Creates a key identifying everything the initial layout depends on: the data, every setting, the application
+    source code and the Dash and Plotly versions. Any change creates a new snapshot instead of serving a stale one.
+    """
+    digest = hashlib.sha256()
+    digest.update(f'{dash.__version__}|{plotly.__version__}'.encode())
+    digest.update(repr({name: getattr(settings, name) for name in dir(settings) if name.isupper()}).encode())
+    for array in (source.x_and_y, np.asarray(source.all_labels, dtype=str)):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    for path in sorted(APP_DIR.rglob('*.py')):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:32]
+
+
+class LayoutSnapshot:
+    """
+    A cached artifact holding the serialized initial scatter plot figure and the serialized application layout.
+
+    The first process to start builds and stores them. Later processes, such as other gunicorn workers or restarts,
+    load the figure instead of building it, which also avoids importing `plotly.express`, and serve the stored layout
+    without serializing it again. Callbacks are still registered by building the component tree, which is cheap once
+    the figure is cached.
+
+    Every change to the code, settings or data creates a new key, so storing a snapshot removes all but the `keep`
+    most recent ones from the directory.
+
+    :param directory: (str | Path) the directory holding snapshots
+    :param key: (str) the snapshot key, from `snapshot_key`
+    :param keep: (int) number of snapshots kept in the directory, including this one. Default is 2
+    """
+    def __init__(self, directory: str | Path, key: str, keep: int = 2) -> None:
+        self.path = Path(directory) / key
+        self.keep = max(keep, 1)
+        self.figure: dict | None = None
+        self.layout: bytes | None = None
+        if self.path.exists():
+            self.figure = json.loads((self.path / 'figure.json').read_bytes())
+            self.layout = (self.path / 'layout.json').read_bytes()
+
+    @property
+    def loaded(self) -> bool:
+        return self.layout is not None
+
+    def save(self, figure: dict, layout: bytes) -> None:
+        """Stores the artifact. Files are written to a temporary directory first, so readers never see a partial one."""
+        from plotly.io.json import to_json_plotly  # Deferred, as it imports IPython when available
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = Path(tempfile.mkdtemp(dir=self.path.parent))
+        (tmp_path / 'figure.json').write_text(to_json_plotly(figure))
+        (tmp_path / 'layout.json').write_bytes(layout)
+        try:
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # Another worker stored the same snapshot first
+            for file in tmp_path.iterdir():
+                file.unlink()
+            tmp_path.rmdir()
+        self.figure, self.layout = figure, layout
+        self._prune()
+
+    def _prune(self) -> None:
+        """Removes the oldest snapshots beyond `keep`. Temporary directories of snapshots being stored are skipped."""
+        others = []
+        for path in self.path.parent.iterdir():
+            if path != self.path and KEY_PATTERN.fullmatch(path.name):
+                try:
+                    others.append((path.stat().st_mtime, path))
+                except OSError:
+                    pass  # Removed by another worker
+        for _, path in sorted(others, reverse=True)[self.keep - 1:]:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def serve(self, app: Dash, figure: dict) -> None:
+        """
+        Serves the stored layout from the Dash layout route, storing it first when the snapshot was not loaded.
+
+        :param app: (Dash) a Dash application with its layout set
+        :param figure: (dict) the initial scatter plot figure, stored alongside the layout
+        """
+        if not self.loaded:
+            from plotly.io.json import to_json_plotly
+
+            self.save(figure, to_json_plotly(app.layout).encode())
+
+        layout = self.layout
+        endpoint = f'{app.config.routes_pathname_prefix}_dash-layout'
+        app.server.view_functions[endpoint] = lambda: Response(layout, mimetype='application/json')
@@ -0,0 +1,40 @@
+/*
+ * Browser implementation of the `SimpleNeuralNetwork` forward pass (`app/models/classifier.py`).
+ * Recomputes the scatter plot heatmap from the slider values without a server round-trip.
+ */
+(function () {
+    function predictGrid(xs, ys, weights, biases) {
+        const [w1, w2, w3, w4] = weights;
+        const [b1, b2] = biases;
+        const z = new Array(ys.length);
+        for (let r = 0; r < ys.length; r++) {
+            const row = new Array(xs.length);
+            for (let c = 0; c < xs.length; c++) {
+                const output1 = (xs[c] * w1 + ys[r] * w3) + b1;
+                const output2 = (xs[c] * w2 + ys[r] * w4) + b2;
+                row[c] = output1 > output2 ? 0 : 1;
+            }
+            z[r] = row;
+        }
+        return z;
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        clientside_model: {
+            predict_grid: predictGrid,
+
+            update_heatmap: function (w1, w2, w3, w4, b1, b2, figure) {
+                if (!figure) {
+                    return window.dash_clientside.no_update;
+                }
+                const index = figure.data.findIndex(trace => trace.type === 'heatmap');
+                const heatmap = figure.data[index];
+                const data = figure.data.slice();
+                data[index] = Object.assign({}, heatmap, {
+                    z: predictGrid(heatmap.x, heatmap.y, [w1, w2, w3, w4], [b1, b2])
+                });
+                return Object.assign({}, figure, {data: data});
+            }
+        }
+    });
+})();
@@ -0,0 +1,98 @@
+/*
+ * Clientside decoders for the compact prediction grid encodings created by `app/data/encoding.py`.
+ * Decoded grids replace the heatmap `z` values of the scatter plot figure without a server round-trip.
+ */
+(function () {
+    function fromBase64(data) {
+        const binary = atob(data);
+        const bytes = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) {
+            bytes[i] = binary.charCodeAt(i);
+        }
+        return bytes;
+    }
+
+    function readUint(bytes, dtype) {
+        const view = new DataView(bytes.buffer);
+        const size = dtype === 'u2' ? 2 : 4;
+        const values = new Array(bytes.length / size);
+        for (let i = 0; i < values.length; i++) {
+            values[i] = size === 2 ? view.getUint16(i * size, true) : view.getUint32(i * size, true);
+        }
+        return values;
+    }
+
+    function unpackBits(bytes, count) {
+        const bits = new Uint8Array(count);
+        for (let i = 0; i < count; i++) {
+            bits[i] = (bytes[i >> 3] >> (7 - (i & 7))) & 1;
+        }
+        return bits;
+    }
+
+    function toRows(flat, nRows, nCols) {
+        const rows = new Array(nRows);
+        for (let r = 0; r < nRows; r++) {
+            rows[r] = Array.from(flat.subarray(r * nCols, (r + 1) * nCols));
+        }
+        return rows;
+    }
+
+    function decode(payload) {
+        const [nRows, nCols] = payload.shape;
+
+        if (payload.encoding === 'bits') {
+            return toRows(unpackBits(fromBase64(payload.data), nRows * nCols), nRows, nCols);
+        }
+
+        if (payload.encoding === 'rle') {
+            const runs = readUint(fromBase64(payload.data), 'u4');
+            const flat = new Uint8Array(nRows * nCols);
+            let value = payload.first;
+            let position = 0;
+            for (const run of runs) {
+                flat.fill(value, position, position + run);
+                position += run;
+                value = 1 - value;
+            }
+            return toRows(flat, nRows, nCols);
+        }
+
+        if (payload.encoding === 'contour') {
+            const starts = unpackBits(fromBase64(payload.starts), nRows);
+            const offsets = readUint(fromBase64(payload.offsets), 'u4');
+            const columns = readUint(fromBase64(payload.columns), payload.column_dtype);
+            const rows = new Array(nRows);
+            for (let r = 0; r < nRows; r++) {
+                const row = new Array(nCols);
+                let value = starts[r];
+                let column = 0;
+                for (let i = offsets[r]; i < offsets[r + 1]; i++) {
+                    row.fill(value, column, columns[i]);
+                    column = columns[i];
+                    value = 1 - value;
+                }
+                row.fill(value, column, nCols);
+                rows[r] = row;
+            }
+            return rows;
+        }
+
+        throw new Error(`Unknown grid encoding '${payload.encoding}'.`);
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        grid_transport: {
+            decode: decode,
+
+            apply_heatmap: function (payload, figure) {
+                if (!payload || !figure) {
+                    return window.dash_clientside.no_update;
+                }
+                const data = figure.data.slice();
+                data[payload.trace] = Object.assign({}, data[payload.trace], {z: decode(payload)});
+                return Object.assign({}, figure, {data: data});
+            }
+        }
+    });
+})();
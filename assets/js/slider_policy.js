@@ -0,0 +1,23 @@
+/*
+ * Clientside helpers for the slider update policies in `app/components/nn_slider.py`.
+ */
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    slider_policy: {
+        // Creates a random identifier once per browser session
+        session_id: function (timestamp, sessionId) {
+            if (sessionId) {
+                return window.dash_clientside.no_update;
+            }
+            return Date.now().toString(36) + Math.random().toString(36).slice(2);
+        },
+
+        // Forwards the latest slider values at most once per interval tick, and only when they changed
+        throttle: function (nIntervals, ...args) {
+            const stored = args.pop();
+            if (stored && args.every((value, i) => value === stored[i])) {
+                return window.dash_clientside.no_update;
+            }
+            return args;
+        }
+    }
+});
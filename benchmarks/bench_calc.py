@@ -0,0 +1,53 @@
+"""
+Compares the vectorized `SimpleNeuralNetwork.calc` against the original per-row Python loop.
+
+Run from the project root with: `python -m benchmarks.bench_calc`
+"""
+import timeit
+
+import numpy as np
+
+from app.data import ids
+from app.models.classifier import NeuralNetwork, SimpleNeuralNetwork
+
+
+def loop_calc(clf: SimpleNeuralNetwork, data: np.array) -> list[int]:
+    """The original row-by-row implementation of `SimpleNeuralNetwork.calc`, kept as a baseline."""
+    preds = []
+    for row in data:
+        output_1 = row[0] * clf.weights[0] + row[1] * clf.weights[2] + clf.biases[0]
+        output_2 = row[0] * clf.weights[1] + row[1] * clf.weights[3] + clf.biases[1]
+        preds.append(0 if (output_1 > output_2) else 1)
+    return preds
+
+
+def make_grid(size: float, h: float = .02) -> np.ndarray:
+    """Creates a flattened mesh over [-0.2, size + 0.2] in both axes, matching `scatter_plot._set_background`."""
+    xx, yy = np.meshgrid(np.arange(-0.2, size + 0.2, h), np.arange(-0.2, size + 0.2, h))
+    return np.c_[xx.ravel(), yy.ravel()]
+
+
+def main(repeat: int = 5) -> None:
+    clf = SimpleNeuralNetwork(ids.SIMPLE_NN_START_WEIGHTS, ids.SIMPLE_NN_START_BIASES)
+
+    print(f"{'points':>10} {'loop (ms)':>12} {'vectorized (ms)':>16} {'chunked (ms)':>13} {'speedup':>9}")
+    for size in (1, 2, 5, 10):
+        grid = make_grid(size)
+        assert loop_calc(clf, grid) == clf.calc(grid) == clf.calc(grid, chunk_size=4096)
+
+        loop = min(timeit.repeat(lambda: loop_calc(clf, grid), number=1, repeat=repeat)) * 1000
+        vectorized = min(timeit.repeat(lambda: clf.calc(grid), number=1, repeat=repeat)) * 1000
+        chunked = min(timeit.repeat(lambda: clf.calc(grid, chunk_size=4096), number=1, repeat=repeat)) * 1000
+        print(f"{grid.shape[0]:>10} {loop:>12.2f} {vectorized:>16.2f} {chunked:>13.2f} {loop / vectorized:>8.1f}x")
+
+    grid = make_grid(2)
+    print(f"\n{'layer spec':>20} {'predict (ms)':>13}  ({grid.shape[0]} points)")
+    for layer_sizes in ([2, 2], [2, 4, 2], [2, 4, 4, 2], [2, 16, 16, 16, 2]):
+        model = NeuralNetwork(layer_sizes, activation='tanh')
+        model.init_random(seed=0)
+        elapsed = min(timeit.repeat(lambda: model.predict(grid), number=1, repeat=repeat)) * 1000
+        print(f"{str(layer_sizes):>20} {elapsed:>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
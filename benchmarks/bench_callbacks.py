@@ -0,0 +1,167 @@
+"""
+Drives the slider `update_plot` callback in-process through the Flask test client, including Dash dispatch and JSON
+serialization. Each request moves one slider, as when dragging. Cold requests use parameters never seen before and
+warm requests revisit cached ones.
+
+Run from the project root with: `python -m benchmarks.bench_callbacks [--requests 200] [--output results.json]`
+"""
+import argparse
+from itertools import islice
+import os
+import time
+from typing import Any, Iterator
+
+import numpy as np
+
+from app.components.training import SLIDER_IDS
+from app.data import ids
+from benchmarks.results import save_results, summarize
+
+os.environ.setdefault('DASH_DEBUG_MODE', 'False')
+
+# The slider callback updates the figure directly, or a store decoded in the browser for compact grid transports
+PLOT_OUTPUTS = ('scatter-plot-graph.figure', 'heatmap-store.data')
+
+# Callbacks read the network parameters from each slider, or from the store of throttled slider values
+SLIDER_INPUTS = [f'{slider_id}.value' for slider_id in SLIDER_IDS]
+STORE_INPUT = f'{ids.SLIDER_VALUES_STORE}.data'
+
+
+def find_plot_callback(dependencies: list[dict]) -> dict:
+    """Finds the slider callback spec in the `/_dash-dependencies` response."""
+    for spec in dependencies:
+        if spec['output'] in PLOT_OUTPUTS:
+            return spec
+    raise LookupError(f"No callback updates any of {PLOT_OUTPUTS}.")
+
+
+def find_slider_callbacks(dependencies: list[dict]) -> list[dict]:
+    """
+    Finds every server-side callback a slider change triggers in the `/_dash-dependencies` response, such as the plot,
+    metrics, landscape and network graph updates.
+    """
+    specs = [
+        spec for spec in dependencies
+        if not spec.get('clientside_function')
+        and any(_is_parameter(dependency) for dependency in spec['inputs'])
+    ]
+    if not specs:
+        raise LookupError('No server-side callback reads the slider values.')
+    return specs
+
+
+def layout_values(layout: dict | list) -> dict[str, Any]:
+    """Collects the initial property values of every component with an id in the `/_dash-layout` response."""
+    values = {}
+    stack = [layout]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, dict) and isinstance(node.get('props'), dict):
+            props = node['props']
+            if isinstance(props.get('id'), str):
+                values.update({f"{props['id']}.{name}": value for name, value in props.items()})
+            stack.extend(value for value in props.values() if isinstance(value, (dict, list)))
+    return values
+
+
+def slider_request(spec: dict, params: list[float], session_id: str, values: dict[str, Any] | None = None) -> dict:
+    """
+    Creates a Dash callback request body for a set of slider values.
+
+    :param spec: (dict) a callback spec from the `/_dash-dependencies` response
+    :param params: (list[float]) the slider values
+    :param session_id: (str) the session id sent as the `ids.SESSION_ID` state
+    :param values: (dict, optional) the values of other inputs and states, such as the landscape parameters, keyed by
+                   '<id>.<property>'. See `layout_values`
+
+    :return: a request body for `/_dash-update-component`
+    """
+    values = values or {}
+    outputs = [
+        dict(zip(('id', 'property'), output.split('@')[0].rsplit('.', 1)))
+        for output in spec['output'].strip('.').split('...')
+    ]
+
+    def value(dependency: dict) -> Any:
+        key = _key(dependency)
+        if key == STORE_INPUT:
+            return params
+        if key in SLIDER_INPUTS:
+            return params[SLIDER_INPUTS.index(key)]
+        return session_id if dependency['id'] == ids.SESSION_ID else values.get(key)
+
+    changed = next(_key(dependency) for dependency in spec['inputs'] if _is_parameter(dependency))
+    return {
+        'output': spec['output'],
+        'outputs': outputs if len(outputs) > 1 else outputs[0],
+        'inputs': [{**dependency, 'value': value(dependency)} for dependency in spec['inputs']],
+        'state': [{**dependency, 'value': value(dependency)} for dependency in spec['state']],
+        'changedPropIds': [changed]
+    }
+
+
+def _key(dependency: dict) -> str:
+    return f"{dependency['id']}.{dependency['property']}"
+
+
+def _is_parameter(dependency: dict) -> bool:
+    return _key(dependency) in SLIDER_INPUTS or _key(dependency) == STORE_INPUT
+
+
+def drag_steps(seed: int = 0) -> Iterator[list[float]]:
+    """Yields slider values endlessly, where each step moves one slider by one slider step."""
+    rng = np.random.default_rng(seed)
+    params = np.round(rng.uniform(-1, 1, size=6), 1)
+    while True:
+        idx = rng.integers(6)
+        params[idx] = np.clip(round(params[idx] + rng.choice([-.1, .1]), 1), -1, 1)
+        yield params.tolist()
+
+
+def drag_path(n_steps: int, seed: int = 0) -> list[list[float]]:
+    """Creates a sequence of slider values where each step moves one slider by one slider step."""
+    return list(islice(drag_steps(seed), n_steps))
+
+
+def run(client, spec: dict, path: list[list[float]], session_id: str) -> tuple[list[float], list[int]]:
+    latencies, sizes = [], []
+    for params in path:
+        start = time.perf_counter()
+        response = client.post('/_dash-update-component', json=slider_request(spec, params, session_id))
+        latencies.append((time.perf_counter() - start) * 1000)
+        sizes.append(len(response.data))
+        assert response.status_code in (200, 204), response.data[:200]
+    return latencies, sizes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200, help='number of slider moves')
+    parser.add_argument('--output', help='the JSON results file. Default is benchmarks/results/callbacks-<commit>.json')
+    args = parser.parse_args()
+
+    import main as app_main
+    from app import settings
+
+    client = app_main.server.test_client()
+    spec = find_plot_callback(client.get('/_dash-dependencies').get_json())
+    path = drag_path(args.requests)
+
+    results = []
+    for case in ('cold', 'warm'):
+        latencies, sizes = run(client, spec, path, session_id=f'bench-{case}')
+        results.append({'case': case, **summarize(latencies), 'mean_bytes': float(np.mean(sizes))})
+
+    for result in results:
+        print(f"{result['case']:>5}: p50 {result['p50_ms']:.2f} ms | p99 {result['p99_ms']:.2f} ms | "
+              f"{result['mean_bytes'] / 1024:.1f} KiB per response")
+
+    config = {'requests': args.requests, 'grid_transport': settings.GRID_TRANSPORT,
+              'boundary_mode': settings.BOUNDARY_MODE, 'data_points': app_main.data.row_count}
+    print(f"\nSaved to {save_results('callbacks', results, args.output, **config)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Compares the original string-built `DataFrame.query` filter against the mask-based `DataSource.filter` from 50 to
+1M rows, for the full-data filter used by `scatter_plot._set_scatter` and for range and label predicates.
+
+Run from the project root with: `python -m benchmarks.bench_filter`
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.data import ids
+from app.data.generate import DataSchema
+from app.data.source import DataSource
+
+QUERY_LIMIT = 10_000  # The query string grows with the data, so larger sizes take minutes
+
+
+def query_filter(source: DataSource, x: list, y: list, labels: list) -> pd.DataFrame:
+    """The original `DataSource.filter` implementation, kept as a baseline."""
+    return source.data.query(f"{ids.X_COL_NAME} in {x} and {ids.Y_COL_NAME} in {y} and {ids.LABEL_COL_NAME} in {labels}")
+
+
+def make_source(n_rows: int, seed: int = 362) -> DataSource:
+    rng = np.random.default_rng(seed)
+    points = np.round(rng.uniform(0, 10, size=(n_rows, 2)), 2)
+    labels = np.where(rng.random(n_rows) < 0.2, ids.LABEL_ONE, ids.LABEL_TWO)
+    return DataSource(pd.DataFrame({DataSchema.X_AXIS: points[:, 0], DataSchema.Y_AXIS: points[:, 1],
+                                    DataSchema.LABELS: labels}))
+
+
+def elapsed_ms(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    print(f"{'rows':>9} {'query (ms)':>11} {'mask (ms)':>10} {'cached (ms)':>12} {'range+label (ms)':>17}")
+    for n_rows in (50, 1_000, 10_000, 100_000, 1_000_000):
+        source = make_source(n_rows)
+        x, y, labels = source.all_x, source.all_y, source.all_labels
+
+        query = f"{elapsed_ms(lambda: query_filter(source, x, y, labels)):>11.2f}" if n_rows <= QUERY_LIMIT else f"{'skipped':>11}"
+        mask = elapsed_ms(lambda: source.filter(x=x, y=y, labels=labels))
+        cached = elapsed_ms(lambda: source.filter(x=x, y=y, labels=labels))
+        predicates = elapsed_ms(lambda: source.filter(x_range=(2, 4), y_range=(5, 9), labels=[ids.LABEL_ONE]))
+        print(f"{n_rows:>9} {query} {mask:>10.2f} {cached:>12.2f} {predicates:>17.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Compares dense mesh evaluation against budgeted resolution, quadtree refinement around the decision boundary and
+the analytic boundary of linear networks, reporting evaluated points, time and the number of cells that differ from
+the dense result.
+
+Run from the project root with: `python -m benchmarks.bench_mesh`
+"""
+import timeit
+
+import numpy as np
+
+from app.data import ids
+from app.data.mesh import adaptive_predict, clip_half_plane, step_for_budget
+from app.models.classifier import NeuralNetwork, SimpleNeuralNetwork
+
+
+def make_axes(size: float, step: float) -> tuple[np.ndarray, np.ndarray]:
+    return np.arange(-0.2, size + 0.2, step), np.arange(-0.2, size + 0.2, step)
+
+
+def compare(name: str, model: NeuralNetwork, xs: np.ndarray, ys: np.ndarray, block: int, repeat: int) -> None:
+    xx, yy = np.meshgrid(xs, ys)
+    grid = np.c_[xx.ravel(), yy.ravel()]
+
+    dense = model.predict(grid).reshape(xx.shape)
+    adaptive, n_evals = adaptive_predict(model.predict, xs, ys, block=block)
+
+    dense_ms = min(timeit.repeat(lambda: model.predict(grid), number=1, repeat=repeat)) * 1000
+    adaptive_ms = min(timeit.repeat(lambda: adaptive_predict(model.predict, xs, ys, block=block),
+                                    number=1, repeat=repeat)) * 1000
+    print(f"{name:>16} {dense.size:>9} {n_evals:>9} {dense_ms:>10.2f} {adaptive_ms:>13.2f} "
+          f"{(dense != adaptive).sum():>10}")
+
+
+def main(repeat: int = 5, block: int = 16) -> None:
+    linear = SimpleNeuralNetwork(ids.SIMPLE_NN_START_WEIGHTS, ids.SIMPLE_NN_START_BIASES)
+    deep = NeuralNetwork([2, 16, 16, 16, 2], activation='tanh')
+    deep.init_random(seed=0, scale=2)
+
+    print(f"{'model':>16} {'cells':>9} {'evals':>9} {'dense (ms)':>10} {'adaptive (ms)':>13} {'mismatches':>10}")
+    for size in (1, 5, 10):
+        xs, ys = make_axes(size, ids.MESH_STEP)
+        compare(f'linear x{size}', linear, xs, ys, block, repeat)
+        compare(f'deep x{size}', deep, xs, ys, block, repeat)
+
+    print(f"\n{'data range':>10} {'fixed cells':>12} {'budget cells':>13}  (budget = 10000)")
+    for size in (1, 5, 10, 50):
+        step = step_for_budget((-0.2, size + 0.2, -0.2, size + 0.2), 10000)
+        print(f"{size:>10} {make_axes(size, ids.MESH_STEP)[0].size ** 2:>12} {make_axes(size, step)[0].size ** 2:>13}")
+
+    print(f"\n{'data range':>10} {'analytic (ms)':>14}")
+    for size in (1, 10, 50):
+        bounds = (-0.2, size + 0.2, -0.2, size + 0.2)
+
+        def regions() -> None:
+            a, b, c = linear.linear_boundary()
+            clip_half_plane(bounds, a, b, c)
+            clip_half_plane(bounds, -a, -b, -c)
+
+        print(f"{size:>10} {min(timeit.repeat(regions, number=1, repeat=repeat)) * 1000:>14.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Microbenchmarks for the hot paths of a slider update, across data sizes and mesh resolutions:
+`SimpleNeuralNetwork.calc` on the mesh, `DataSource.filter`, and the `_set_background` and `_set_scatter` figure
+builders. Render caches are bypassed, so every case measures a cold computation.
+
+Run from the project root with: `python -m benchmarks.bench_micro [--output results.json]`
+"""
+import argparse
+import timeit
+
+import numpy as np
+import pandas as pd
+from plotly.subplots import make_subplots
+
+from app.components import scatter_plot
+from app.data import ids
+from app.data.generate import DataSchema
+from app.data.source import DataSource
+from app.models.classifier import SimpleNeuralNetwork
+from benchmarks.results import save_results
+
+DATA_SIZES = (50, 1_000, 10_000, 100_000)
+MESH_CELLS = (2_500, 10_000, 40_000, 160_000)
+
+
+def make_source(n_rows: int, mesh_budget: int = 0, seed: int = 362) -> DataSource:
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, 1, size=(n_rows, 2))
+    labels = np.where(points[:, 0] + points[:, 1] > 1.2, ids.LABEL_ONE, ids.LABEL_TWO)
+    return DataSource(pd.DataFrame({DataSchema.X_AXIS: points[:, 0], DataSchema.Y_AXIS: points[:, 1],
+                                    DataSchema.LABELS: labels}), mesh_budget=mesh_budget)
+
+
+def best_ms(func, repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+
+def bench_calc(clf: SimpleNeuralNetwork, repeat: int) -> list[dict]:
+    results = []
+    for cells in MESH_CELLS:
+        grid = make_source(50, mesh_budget=cells).grid
+        results.append({'case': 'calc', 'mesh_cells': grid.shape[0], 'time_ms': best_ms(lambda: clf.calc(grid), repeat)})
+    return results
+
+
+def bench_filter(repeat: int) -> list[dict]:
+    results = []
+    for n_rows in DATA_SIZES:
+        source = make_source(n_rows)
+        x, y, labels = source.all_x, source.all_y, source.all_labels
+
+        def full() -> None:
+            source._cache.clear()
+            source.filter(x=x, y=y, labels=labels)
+
+        def ranged() -> None:
+            source._cache.clear()
+            source.filter(x_range=(.2, .4), y_range=(.5, .9), labels=[ids.LABEL_ONE])
+
+        results.append({'case': 'filter_full', 'rows': n_rows, 'time_ms': best_ms(full, repeat)})
+        results.append({'case': 'filter_range', 'rows': n_rows, 'time_ms': best_ms(ranged, repeat)})
+    return results
+
+
+def bench_background(clf: SimpleNeuralNetwork, repeat: int) -> list[dict]:
+    results = []
+    for cells in MESH_CELLS:
+        source = make_source(50, mesh_budget=cells)
+
+        def background() -> None:
+            scatter_plot.PREDICTION_CACHE.clear()
+            scatter_plot._set_background(make_subplots(rows=1, cols=1), source, clf)
+
+        results.append({'case': 'set_background', 'mesh_cells': source.grid.shape[0],
+                        'time_ms': best_ms(background, repeat)})
+    return results
+
+
+def bench_scatter(repeat: int) -> list[dict]:
+    results = []
+    for n_rows in DATA_SIZES:
+        source = make_source(n_rows)
+
+        def scatter() -> None:
+            source._cache.clear()
+            scatter_plot._set_scatter(make_subplots(rows=1, cols=1), source)
+
+        results.append({'case': 'set_scatter', 'rows': n_rows, 'time_ms': best_ms(scatter, repeat)})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='repetitions per case, the best is reported')
+    parser.add_argument('--output', help='the JSON results file. Default is benchmarks/results/micro-<commit>.json')
+    args = parser.parse_args()
+
+    clf = SimpleNeuralNetwork(ids.SIMPLE_NN_START_WEIGHTS, ids.SIMPLE_NN_START_BIASES)
+    results = bench_calc(clf, args.repeat) + bench_filter(args.repeat) + bench_background(clf, args.repeat) + \
+        bench_scatter(args.repeat)
+
+    for result in results:
+        size = result.get('rows', result.get('mesh_cells'))
+        print(f"{result['case']:>16} {size:>9} {result['time_ms']:>10.2f} ms")
+    print(f"\nSaved to {save_results('micro', results, args.output, repeat=args.repeat)}")
+
+
+if __name__ == '__main__':
+    main()
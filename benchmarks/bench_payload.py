@@ -0,0 +1,72 @@
+"""
+Compares the bytes sent per slider update when re-rendering the whole plot container against a partial heatmap update
+and the compact grid encodings.
+
+Run from the project root with: `python -m benchmarks.bench_payload`
+"""
+import json
+import timeit
+
+import numpy as np
+import pandas as pd
+from plotly.utils import PlotlyJSONEncoder
+
+from app.components import scatter_plot
+from app.data import ids
+from app.data.generate import DataSchema
+from app.data.encoding import ENCODERS
+from app.data.source import DataSource
+from app.models.classifier import SimpleNeuralNetwork
+
+
+def make_source(size: float, n_points: int = 50, seed: int = 362) -> DataSource:
+    """Creates a labelled data source with points spread uniformly over [0, size] in both axes."""
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, size, size=(n_points, 2))
+    labels = np.where(points.sum(axis=1) < size, ids.LABEL_ONE, ids.LABEL_TWO)
+    return DataSource(pd.DataFrame({DataSchema.X_AXIS: points[:, 0], DataSchema.Y_AXIS: points[:, 1],
+                                    DataSchema.LABELS: labels}))
+
+
+def payload_size(value) -> int:
+    """Returns the number of bytes in the JSON response body Dash would send for a callback output."""
+    return len(json.dumps(value, cls=PlotlyJSONEncoder).encode('utf-8'))
+
+
+def main(repeat: int = 5) -> None:
+    weights, biases = [0.5, -0.2, 0.1, 0.9], [0.1, -0.4]
+
+    print(f"{'cells':>10} {'full (bytes)':>14} {'patch (bytes)':>14} {'ratio':>7} {'full (ms)':>10} {'patch (ms)':>11}")
+    for size in (1, 2, 5, 10):
+        source = make_source(size)
+        n_cells = source.grid.shape[0]
+
+        def full() -> int:
+            scatter_plot.FIGURE_CACHE.clear()
+            scatter_plot.PREDICTION_CACHE.clear()
+            return payload_size(scatter_plot.render_no_hidden(source, weights, biases))
+
+        def patch() -> int:
+            scatter_plot.PREDICTION_CACHE.clear()
+            return payload_size(scatter_plot.update_no_hidden(source, weights, biases))
+
+        full_bytes, patch_bytes = full(), patch()
+        full_ms = min(timeit.repeat(full, number=1, repeat=repeat)) * 1000
+        patch_ms = min(timeit.repeat(patch, number=1, repeat=repeat)) * 1000
+        print(f"{n_cells:>10} {full_bytes:>14} {patch_bytes:>14} {full_bytes / patch_bytes:>6.1f}x "
+              f"{full_ms:>10.2f} {patch_ms:>11.2f}")
+
+    print(f"\n{'cells':>10} " + ' '.join(f"{name + ' (bytes)':>16} {'(ms)':>6}" for name in ENCODERS))
+    for size in (1, 2, 5, 10):
+        source = make_source(size)
+        row = f"{source.grid.shape[0]:>10} "
+        for name in ENCODERS:
+            scatter_plot.predict_grid(source, SimpleNeuralNetwork(weights, biases))
+            encode = lambda: payload_size(scatter_plot.encode_no_hidden(source, weights, biases, encoding=name))
+            encode_ms = min(timeit.repeat(encode, number=1, repeat=repeat)) * 1000
+            row += f"{encode():>16} {encode_ms:>6.2f} "
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
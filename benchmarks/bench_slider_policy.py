@@ -0,0 +1,90 @@
+"""
+Measures how many plot callbacks a simulated slider drag triggers under each update policy, the server time they
+cost, and how many concurrent superseded requests from one session are dropped by the coalescer.
+
+Run from the project root with: `DASH_DEBUG_MODE=False python -m benchmarks.bench_slider_policy`
+"""
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from app.components import nn_slider, scatter_plot
+from app.data import ids
+
+PLOT_OUTPUT = f'{ids.SCATTER_PLOT_GRAPH}.figure'
+
+
+def drag_trace(duration: float = 1.5, pointer_hz: float = 60, step: float = 0.1) -> list[tuple[float, float]]:
+    """Creates (time, slider value) pairs for a pointer dragging a slider from -1 to 1 at a constant speed."""
+    times = np.arange(0, duration, 1 / pointer_hz)
+    values = np.round(np.round(np.linspace(-1, 1, times.size) / step) * step, 1)
+    return list(zip(times.tolist(), values.tolist()))
+
+
+def emitted_values(trace: list[tuple[float, float]], mode: str, throttle_hz: float = 10) -> list[float]:
+    """Returns the slider values that reach the server for a drag trace under an update policy."""
+    if mode == 'mouseup':
+        return [trace[-1][1]]
+
+    changes = [value for i, (_, value) in enumerate(trace) if i == 0 or value != trace[i - 1][1]]
+    if mode == 'drag':
+        return changes
+
+    # Throttle: an interval tick forwards the current value only if it changed since the last forwarded one
+    emitted, last = [], None
+    end = trace[-1][0] + 1 / throttle_hz
+    for tick in np.arange(1 / throttle_hz, end + 1e-9, 1 / throttle_hz):
+        current = [value for t, value in trace if t <= tick][-1]
+        if current != last:
+            emitted.append(current)
+            last = current
+    return emitted
+
+
+def request_body(value: float, session_id: str = 'benchmark') -> dict:
+    values = [value] + ids.SIMPLE_NN_START_WEIGHTS[1:] + ids.SIMPLE_NN_START_BIASES
+    slider_ids = [f'{ids.WEIGHT_SLIDER}-{i}' for i in range(4)] + [f'{ids.BIAS_SLIDER}-{i}' for i in range(2)]
+    return {
+        'output': PLOT_OUTPUT,
+        'outputs': {'id': ids.SCATTER_PLOT_GRAPH, 'property': 'figure'},
+        'inputs': [{'id': slider_id, 'property': 'value', 'value': v} for slider_id, v in zip(slider_ids, values)],
+        'state': [{'id': ids.SESSION_ID, 'property': 'data', 'value': session_id}],
+        'changedPropIds': [f'{ids.WEIGHT_SLIDER}-0.value']
+    }
+
+
+def main() -> None:
+    from main import server
+    client = server.test_client()
+    trace = drag_trace()
+
+    print(f"{'policy':>14} {'callbacks':>10} {'mean (ms)':>10} {'p99 (ms)':>9} {'total (ms)':>11}")
+    for mode, hz in (('drag', None), ('throttle', 20), ('throttle', 10), ('throttle', 4), ('mouseup', None)):
+        scatter_plot.PREDICTION_CACHE.clear()
+        latencies = []
+        for value in emitted_values(trace, mode, hz or 10):
+            start = time.perf_counter()
+            client.post('/_dash-update-component', json=request_body(value))
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        name = f'{mode} {hz:g}Hz' if hz else mode
+        p99 = np.percentile(latencies, 99)
+        print(f"{name:>14} {len(latencies):>10} {statistics.mean(latencies):>10.2f} {p99:>9.2f} {sum(latencies):>11.2f}")
+
+    # Concurrent requests from one session: all but the latest in-flight request can be dropped
+    scatter_plot.PREDICTION_CACHE.clear()
+    before = nn_slider.COALESCER.stats
+    values = emitted_values(trace, 'drag')
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(pool.map(lambda v: server.test_client().post('/_dash-update-component',
+                                                                     json=request_body(v, 'concurrent')).status_code,
+                                 values))
+    after = nn_slider.COALESCER.stats
+    print(f"\nconcurrent drag: {len(statuses)} requests, {after['dropped'] - before['dropped']} dropped as superseded "
+          f"({statuses.count(204)} empty responses)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Measures the cold start of the app in fresh interpreters: the time to import `main`, which builds the data and
+layout, and the time to serve the first page and layout requests. Compares a first start, which builds the layout
+snapshot, with later starts that load it, as each gunicorn worker or `--reload` restart does, and with snapshots
+disabled.
+
+Run from the project root with: `python -m benchmarks.bench_startup [--runs 5] [--output results.json]`
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from benchmarks.results import save_results
+
+PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+client = main.server.test_client()
+client.get('/')
+page = time.perf_counter()
+layout = client.get('/_dash-layout')
+done = time.perf_counter()
+assert layout.status_code == 200
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'first_page_ms': (page - imported) * 1000,
+    'first_layout_ms': (done - page) * 1000,
+    'plotly_express_loaded': 'plotly.express' in sys.modules
+}))
+'''
+
+
+def probe(env: dict) -> dict:
+    output = subprocess.run([sys.executable, '-c', PROBE], env=env, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def median_case(case: str, runs: list[dict]) -> dict:
+    result = {'case': case}
+    for key in ('import_ms', 'first_page_ms', 'first_layout_ms'):
+        result[key] = float(np.median([run[key] for run in runs]))
+    ready = [run['import_ms'] + run['first_page_ms'] + run['first_layout_ms'] for run in runs]
+    result['ready_ms'] = float(np.median(ready))
+    result['plotly_express_loaded'] = any(run['plotly_express_loaded'] for run in runs)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='interpreter starts per case, the median is reported')
+    parser.add_argument('--output', help='the JSON results file. Default is benchmarks/results/startup-<commit>.json')
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp()
+    base_env = {**os.environ, 'DASH_DEBUG_MODE': 'False', 'DATA_CACHE_DIR': cache_dir,
+                'TRAJECTORY_DIR': os.path.join(cache_dir, 'trajectories'),
+                'SNAPSHOT_DIR': os.path.join(cache_dir, 'snapshots')}
+    try:
+        # Build the trajectory once, so every case measures the same work
+        probe({**base_env, 'LAYOUT_SNAPSHOT': 'False'})
+
+        disabled = [probe({**base_env, 'LAYOUT_SNAPSHOT': 'False'}) for _ in range(args.runs)]
+        first = []
+        for _ in range(args.runs):
+            shutil.rmtree(base_env['SNAPSHOT_DIR'], ignore_errors=True)
+            first.append(probe(base_env))
+        loaded = [probe(base_env) for _ in range(args.runs)]
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    results = [median_case('no snapshot', disabled), median_case('building snapshot', first),
+               median_case('loading snapshot', loaded)]
+    print(f"{'case':>18} {'import (ms)':>12} {'first page (ms)':>16} {'first layout (ms)':>18} {'ready (ms)':>11} "
+          f"{'px loaded':>10}")
+    for result in results:
+        print(f"{result['case']:>18} {result['import_ms']:>12.1f} {result['first_page_ms']:>16.1f} "
+              f"{result['first_layout_ms']:>18.1f} {result['ready_ms']:>11.1f} {str(result['plotly_express_loaded']):>10}")
+    print(f"\nSaved to {save_results('startup', results, args.output, runs=args.runs)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+A local load generator simulating concurrent users dragging sliders. Each user has its own session and sends one
+slider move after another, pausing for a think time between moves, like a drag in 'drag' or 'throttle' mode. Every
+move sends, at once, each server-side callback a slider change triggers, such as the plot, metrics, landscape and
+network graph updates, as the browser does. Reports p50/p99 latency per request and per callback, throughput and errors.
+
+Start a server first, for example: `WEB_CONCURRENCY=4 gunicorn -c gunicorn.conf.py main:server`, then run from the
+project root with: `python -m benchmarks.load_test --users 20 --duration 30 [--url http://127.0.0.1:8050]`
+
+Alternatively, `--start-server` launches and stops a gunicorn `main:server` itself with the production profile in
+`gunicorn.conf.py`, passing `--workers` and `--threads`.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+import uuid
+
+from benchmarks.bench_callbacks import drag_steps, find_slider_callbacks, layout_values, slider_request
+from benchmarks.results import save_results, summarize
+
+
+def get_json(url: str, timeout: float = 10.) -> dict | list:
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def post_json(url: str, body: dict, timeout: float = 30.) -> int:
+    request = urllib.request.Request(url, data=json.dumps(body).encode(), headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        response.read()
+        return response.status
+
+
+def timed_post(url: str, body: dict) -> float | None:
+    """Sends a callback request. Returns its latency in milliseconds, or None when it failed."""
+    start = time.perf_counter()
+    try:
+        # Superseded updates are dropped with 204 No Content, which still counts as a response
+        post_json(f'{url}/_dash-update-component', body)
+    except OSError:
+        return None
+    return (time.perf_counter() - start) * 1000
+
+
+def simulate_user(url: str, specs: dict[str, dict], values: dict, user: int, deadline: float,
+                  think_time: float) -> dict:
+    """
+    Sends slider moves for one user until the deadline, each as one concurrent request per callback. Returns its
+    latencies in milliseconds per callback and error count.
+    """
+    session_id = str(uuid.uuid4())
+    latencies, errors = {name: [] for name in specs}, 0
+    with ThreadPoolExecutor(max_workers=len(specs)) as executor:
+        for params in drag_steps(seed=user):
+            if time.monotonic() >= deadline:
+                break
+            bodies = [slider_request(spec, params, session_id, values) for spec in specs.values()]
+            for name, latency in zip(specs, executor.map(lambda body: timed_post(url, body), bodies)):
+                if latency is None:
+                    errors += 1
+                else:
+                    latencies[name].append(latency)
+            time.sleep(think_time)
+    return {'latencies': latencies, 'errors': errors}
+
+
+def callback_name(spec: dict) -> str:
+    """Names a callback after the components it updates, such as 'landscape-graph'."""
+    return '+'.join(output.split('.')[0] for output in spec['output'].strip('.').split('...'))
+
+
+def wait_until_ready(url: str, timeout: float = 60.) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            get_json(f'{url}/_dash-dependencies', timeout=2.)
+            return
+        except OSError:
+            time.sleep(.5)
+    raise TimeoutError(f'The server at {url} did not start within {timeout:.0f}s.')
+
+
+def start_server(port: int, workers: int, threads: int) -> subprocess.Popen:
+    env = {**os.environ, 'GUNICORN_BIND': f'127.0.0.1:{port}', 'WEB_CONCURRENCY': str(workers),
+           'GUNICORN_THREADS': str(threads)}
+    return subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'main:server'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:8050', help='the server base URL')
+    parser.add_argument('--users', type=int, default=10, help='number of concurrent users')
+    parser.add_argument('--duration', type=float, default=20., help='seconds to run for')
+    parser.add_argument('--think-time', type=float, default=.05, help='seconds each user waits between moves')
+    parser.add_argument('--start-server', action='store_true', help='launch gunicorn main:server for the run')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers, with --start-server')
+    parser.add_argument('--threads', type=int, default=4, help='gunicorn threads per worker, with --start-server')
+    parser.add_argument('--output', help='the JSON results file. Default is benchmarks/results/load-<commit>.json')
+    args = parser.parse_args()
+
+    server = None
+    if args.start_server:
+        server = start_server(int(args.url.rsplit(':', 1)[-1]), args.workers, args.threads)
+    try:
+        wait_until_ready(args.url)
+        dependencies = get_json(f'{args.url}/_dash-dependencies')
+        specs = {callback_name(spec): spec for spec in find_slider_callbacks(dependencies)}
+        values = layout_values(get_json(f'{args.url}/_dash-layout'))
+
+        deadline = time.monotonic() + args.duration
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.users) as executor:
+            users = list(executor.map(
+                lambda user: simulate_user(args.url, specs, values, user, deadline, args.think_time), range(args.users)
+            ))
+        elapsed = time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    per_callback = {name: [latency for user in users for latency in user['latencies'][name]] for name in specs}
+    latencies = [latency for callback_latencies in per_callback.values() for latency in callback_latencies]
+    errors = sum(user['errors'] for user in users)
+    result = {'users': args.users, **summarize(latencies), 'errors': errors,
+              'throughput_rps': len(latencies) / elapsed,
+              'callbacks': {name: summarize(callback_latencies) for name, callback_latencies in per_callback.items()}}
+
+    print(f"{args.users} users for {elapsed:.1f}s: {result['throughput_rps']:.1f} req/s | "
+          f"p50 {result.get('p50_ms', 0):.1f} ms | p99 {result.get('p99_ms', 0):.1f} ms | {errors} errors")
+    for name, summary in result['callbacks'].items():
+        print(f"  {name}: p50 {summary.get('p50_ms', 0):.1f} ms | p99 {summary.get('p99_ms', 0):.1f} ms")
+
+    config = {'url': args.url, 'duration': args.duration, 'think_time': args.think_time}
+    if args.start_server:
+        config.update(workers=args.workers, threads=args.threads)
+    print(f"Saved to {save_results('load', [result], args.output, **config)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Helpers for storing benchmark results as JSON, so runs from different commits can be compared.
+
+Compare two result files with: `python -m benchmarks.results <baseline.json> <candidate.json>`
+"""
+from datetime import datetime, timezone
+import json
+import platform
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+# Fields identifying a case, besides its name
+CASE_KEYS = ('rows', 'mesh_cells', 'users')
+
+
+def git_commit() -> str | None:
+    """Returns the current commit hash, with a '-dirty' suffix for uncommitted changes, or None outside a repo."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True)
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True,
+                                text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit.stdout.strip() + ('-dirty' if status.stdout.strip() else '')
+
+
+def summarize(latencies_ms: list[float]) -> dict[str, float]:
+    """Summarizes a list of latencies in milliseconds as percentiles, mean and count."""
+    values = np.asarray(latencies_ms, dtype=float)
+    if values.size == 0:
+        return {'count': 0}
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {'count': int(values.size), 'mean_ms': float(values.mean()), 'p50_ms': float(p50), 'p90_ms': float(p90),
+            'p99_ms': float(p99), 'max_ms': float(values.max())}
+
+
+def save_results(name: str, results: list[dict], output: str | Path | None = None, **config) -> Path:
+    """
+    Stores benchmark results as JSON alongside the commit, environment and configuration they were measured with.
+
+    :param name: (str) the benchmark name, used in the default file name
+    :param results: (list[dict]) one dictionary per measured case
+    :param output: (str | Path, optional) the output file. Default is `benchmarks/results/<name>-<commit>.json`
+    :param config: additional configuration to store, such as the number of users
+
+    :return: the path of the written file
+    """
+    commit = git_commit()
+    path = Path(output) if output else RESULTS_DIR / f'{name}-{commit or "unknown"}.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        'benchmark': name,
+        'commit': commit,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'config': config,
+        'results': results
+    }, indent=2))
+    return path
+
+
+def compare(baseline_path: str | Path, candidate_path: str | Path) -> None:
+    """Prints the change of every shared numeric `_ms` field between two result files, case by case."""
+    baseline, candidate = (json.loads(Path(path).read_text()) for path in (baseline_path, candidate_path))
+    print(f"{baseline['benchmark']}: {baseline['commit']} -> {candidate['commit']}")
+
+    for old, new in zip(baseline['results'], candidate['results']):
+        case = ', '.join(f'{key}={value}' for key, value in old.items() if isinstance(value, str) or key in CASE_KEYS)
+        for key in (key for key in old if key.endswith('_ms') and key in new):
+            change = (new[key] - old[key]) / old[key] if old[key] else 0.
+            print(f"  {case:<40} {key:<18} {old[key]:>10.2f} -> {new[key]:>10.2f} ({change:+.0%})")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        sys.exit('Usage: python -m benchmarks.results <baseline.json> <candidate.json>')
+    compare(sys.argv[1], sys.argv[2])
@@ -0,0 +1,57 @@
+"""
+Production gunicorn profile. Run with: `gunicorn -c gunicorn.conf.py main:server`
+
+The app is imported once in the master process (`preload_app`), which generates or memory-maps the data, computes the
+training trajectory when `TRAJECTORY_EPOCHS` is set, loads the layout snapshot and warms the render caches. Workers are then forked and share that
+memory copy-on-write instead of each building a private copy.
+
+Session state is kept in the memory of the process serving the session: the slider models, running trainers and the
+`/metrics` registry. A single worker is therefore the default, serving concurrent requests with threads while heavy
+renders run in the render pool processes. More workers only suit deployments behind a load balancer that routes each
+client to the same worker, and each worker then reports its own metrics.
+
+Every option can be set with an environment variable:
+    GUNICORN_BIND      the address to listen on. Default is '0.0.0.0:8050'
+    WEB_CONCURRENCY    number of worker processes. Default is 1, see above
+    GUNICORN_THREADS   threads per worker. Values above 1 use the threaded 'gthread' worker, which serves other
+                       requests while NumPy releases the GIL in callbacks. Default is 4
+    GUNICORN_TIMEOUT   seconds before an unresponsive worker is restarted. Default is 30
+    GUNICORN_RELOAD    'True' restarts workers on code changes, for development. Disables preloading
+"""
+import gc
+import os
+
+# Each worker runs several NumPy callbacks at once, so multi-threaded BLAS would oversubscribe the cores. These must
+# be set before NumPy is imported, which happens when the app is preloaded
+for variable in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+    os.environ.setdefault(variable, '1')
+os.environ.setdefault('DASH_DEBUG_MODE', 'False')
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8050')
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread' if threads > 1 else 'sync'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+keepalive = 5
+
+reload = os.environ.get('GUNICORN_RELOAD', 'False') != 'False'
+preload_app = not reload
+
+accesslog = '-'
+errorlog = '-'
+
+
+def when_ready(server) -> None:
+    if preload_app:
+        # Load the JSON serializer Dash uses for callback responses, which imports its engine on first use. Importing
+        # it here shares it between workers and avoids threads of a new worker racing to import it
+        import numpy as np
+        from plotly.io.json import to_json_plotly
+
+        to_json_plotly({'warm_up': np.zeros(1)})
+
+
+def pre_fork(server, worker) -> None:
+    # Move every preloaded object out of the garbage collector's generations, so collections in the workers do not
+    # write to shared pages and copy them
+    gc.freeze()
@@ -3,20 +3,69 @@ import os
 from dash import Dash
 from dash_bootstrap_components.themes import DARKLY
 
+from app import settings
+from app.components import nn_slider, scatter_plot
 from app.data import ids
 from app.data.generate import set_data
+from app.data.loaders import load_data
 from app.data.source import DataSource
+from app.instrumentation import REGISTRY, register_metrics_route
 from app.layout import create_layout
+from app.models.classifier import SimpleNeuralNetwork
+from app.models.trajectory import load_trajectory
+from app.snapshot import LayoutSnapshot, snapshot_key
 
 debug = False if os.environ["DASH_DEBUG_MODE"] == "False" else True
 
 app = Dash(__name__, external_stylesheets=[DARKLY])
 server = app.server
 
-data = set_data(n_points=50, n_positive=10, threshold=13)
+if settings.DATA_PATH:
+    df = load_data(settings.DATA_PATH, cache_dir=settings.DATA_CACHE_DIR)
+else:
+    df = set_data(n_points=settings.DATA_POINTS, n_positive=settings.DATA_POSITIVE, threshold=13)
+
+data = DataSource(df, mesh_budget=settings.MESH_CELL_BUDGET)
+initial_model = SimpleNeuralNetwork(ids.SIMPLE_NN_START_WEIGHTS, ids.SIMPLE_NN_START_BIASES)
+
+snapshot = None
+if settings.LAYOUT_SNAPSHOT:
+    snapshot = LayoutSnapshot(settings.SNAPSHOT_DIR, snapshot_key(data), keep=settings.SNAPSHOT_KEEP)
+    if snapshot.loaded:
+        scatter_plot.preload(data, initial_model, snapshot.figure)
+
+if settings.RENDER_CACHE_WARMUP:
+    scatter_plot.warm_up(data, [(ids.SIMPLE_NN_START_WEIGHTS, ids.SIMPLE_NN_START_BIASES)])
+
+trajectory = None
+if settings.TRAJECTORY_EPOCHS:
+    trajectory = load_trajectory(
+        data, ids.SIMPLE_NN_START_WEIGHTS, ids.SIMPLE_NN_START_BIASES, settings.TRAJECTORY_EPOCHS,
+        learning_rate=settings.TRAJECTORY_LEARNING_RATE, cache_dir=settings.TRAJECTORY_DIR
+    )
 
 app.title = ids.APP_TITLE
-app.layout = create_layout(app, DataSource(data))
+app.layout = create_layout(app, data, trajectory)
+
+if snapshot is not None:
+    snapshot.serve(app, scatter_plot.figure_dict(data, initial_model))
+
+if settings.INSTRUMENTATION:
+    register_metrics_route(server, app.callback_map)
+    REGISTRY.gauge('app_cache_entries', 'Number of entries in each render cache.', lambda: {
+        (('cache', 'prediction'),): len(scatter_plot.PREDICTION_CACHE),
+        (('cache', 'figure'),): len(scatter_plot.FIGURE_CACHE)
+    })
+    REGISTRY.gauge('app_cache_hit_rate', 'Fraction of render cache lookups that were hits.', lambda: {
+        (('cache', 'prediction'),): scatter_plot.PREDICTION_CACHE.stats['hit_rate'],
+        (('cache', 'figure'),): scatter_plot.FIGURE_CACHE.stats['hit_rate']
+    })
+    REGISTRY.gauge('app_sessions', 'Number of sessions with stored state.', lambda: {(): len(nn_slider.SESSION_STORE)})
+    REGISTRY.gauge('app_render_pool_pending', 'Number of render jobs queued or running in the render pool.',
+                   lambda: {(): scatter_plot.RENDER_POOL.pending})
+    REGISTRY.gauge('app_render_pool_jobs', 'Number of render jobs by outcome, since the worker started.', lambda: {
+        (('outcome', outcome),): count for outcome, count in scatter_plot.RENDER_POOL.counts.items()
+    })
 
 
 if __name__ == '__main__':
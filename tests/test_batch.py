@@ -0,0 +1,72 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import json
+import time
+
+import numpy as np
+
+from app import batch
+from app.batch import render_frames
+from app.data.generate import set_data
+from app.data.source import DataSource
+from app.models.batch import batch_predict
+from app.models.classifier import SimpleNeuralNetwork
+
+
+def _params() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    # One decimal parameters put many mesh points exactly on the decision boundary
+    ties = [[.1, .1, .2, .2, .3, .3], [1., 0., 0., 1., 0., 0.], [0.] * 6]
+    return np.vstack([ties, rng.uniform(-1, 1, size=(20, 6)).round(1)])
+
+
+def _expected(points: np.ndarray, params: np.ndarray) -> np.ndarray:
+    return np.stack([SimpleNeuralNetwork(p[:4], p[4:]).predict(points) for p in params])
+
+
+def test_batch_predict_matches_predict() -> None:
+    x, y = np.meshgrid(np.arange(-2, 2.05, .1), np.arange(-2, 2.05, .1))
+    points = np.column_stack([x.ravel(), y.ravel()])
+    params = _params()
+    expected = _expected(points, params)
+
+    for chunk_size in (1, 5 * points.shape[0], 1 << 22):
+        chunks = list(batch_predict(points, params, chunk_size=chunk_size))
+        assert [first for first, _ in chunks] == sorted({first for first, _ in chunks})
+        np.testing.assert_array_equal(np.concatenate([preds for _, preds in chunks]), expected)
+
+
+def test_render_frames_writes_every_frame(tmp_path) -> None:
+    source = DataSource(set_data(n_points=100, n_positive=50, threshold=13))
+    params = _params()
+    report = render_frames(source, params, tmp_path, workers=2)
+
+    x_, y_ = source.mesh_axes
+    manifest = json.loads((tmp_path / 'manifest.json').read_text())
+    assert report.frames == len(manifest['frames']) == params.shape[0]
+    for frame, expected in zip(manifest['frames'], _expected(source.grid, params)):
+        np.testing.assert_array_equal(np.load(tmp_path / frame['file']), expected.reshape(y_.shape[0], x_.shape[0]))
+
+
+def test_render_frames_bounds_pending_writes(tmp_path, monkeypatch) -> None:
+    pending, most_pending = set(), []
+
+    class TrackedExecutor(ThreadPoolExecutor):
+        def submit(self, *args, **kwargs) -> Future:
+            future = super().submit(*args, **kwargs)
+            pending.add(future)
+            future.add_done_callback(pending.discard)
+            most_pending.append(len(pending))
+            return future
+
+    def slow_save(path, grid, idx) -> None:
+        time.sleep(.002)
+        np.save(path, grid)
+
+    monkeypatch.setattr(batch, 'ThreadPoolExecutor', TrackedExecutor)
+    monkeypatch.setattr(batch, '_save_grid', slow_save)
+    monkeypatch.setattr(batch, 'MAX_PENDING_WRITES_PER_WORKER', 2)
+    source = DataSource(set_data(n_points=100, n_positive=50, threshold=13))
+    render_frames(source, np.tile(_params(), (3, 1)), tmp_path, workers=2)
+
+    assert max(most_pending) <= 2 * 2
+    assert len(list(tmp_path.glob('frame-*.npy'))) == 3 * _params().shape[0]
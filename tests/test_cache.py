@@ -0,0 +1,45 @@
+import pytest
+
+from app.data.cache import LRUCache, quantize
+
+
+def test_quantize_removes_float_noise_from_slider_values() -> None:
+    assert quantize([0.30000000000000004, -1, -0., 3 * -.1]) == (.3, -1., 0., -.3)
+    assert quantize([.1 + .2]) == quantize([.3])
+    assert quantize([.25 + 1e-12], step=.05) == (.25,)
+
+
+def test_quantize_keeps_values_off_the_slider_step_exact() -> None:
+    # Trained parameters and timeline frames are not on the slider step, and must not share a key with a neighbour
+    trained = [.37, .3700001, -.001, .30001]
+    assert quantize(trained) == tuple(trained)
+    assert len({quantize([value]) for value in trained}) == len(trained)
+
+
+def test_lru_evicts_least_recently_used() -> None:
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+
+    assert 'b' not in cache and 'a' in cache and 'c' in cache
+    assert len(cache) == 2
+    assert cache.get('b', 'missing') == 'missing'
+
+
+def test_lru_get_or_compute_counts_hits_and_misses() -> None:
+    cache = LRUCache(maxsize=4)
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_compute('key', lambda: calls.append(1) or None) is None
+
+    assert len(calls) == 1
+    assert cache.stats == {'size': 1, 'maxsize': 4, 'hits': 2, 'misses': 1, 'hit_rate': 2 / 3}
+    cache.clear()
+    assert cache.stats['size'] == cache.stats['hits'] == cache.stats['misses'] == 0
+
+
+def test_lru_rejects_non_positive_size() -> None:
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
@@ -0,0 +1,65 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from app.models.classifier import NeuralNetwork, SimpleNeuralNetwork
+
+
+def _reference_forward(model: NeuralNetwork, data: np.ndarray, hidden) -> np.ndarray:
+    out = data
+    for idx, (weights, biases) in enumerate(zip(model.layer_weights, model.layer_biases)):
+        out = out @ weights + biases
+        if idx < model.n_layers - 1:
+            out = hidden(out)
+    return out
+
+
+@pytest.mark.parametrize('activation, hidden', [
+    ('relu', lambda x: np.maximum(x, 0)),
+    ('tanh', np.tanh),
+    ('sigmoid', lambda x: 1 / (1 + np.exp(-x))),
+])
+def test_forward_matches_layer_by_layer_reference(activation: str, hidden) -> None:
+    model = NeuralNetwork([2, 5, 3, 2], activation=activation)
+    model.init_random(seed=0)
+    model.bias_buffer[:] = np.random.default_rng(1).uniform(-1, 1, size=model.bias_buffer.size)
+    data = np.random.default_rng(2).normal(size=(50, 2))
+
+    # The returned outputs are not overwritten by the next pass, which reuses the layer buffers
+    outputs = model.forward(data)
+    model.forward(data + 1)
+    np.testing.assert_allclose(outputs, _reference_forward(model, data, hidden))
+    np.testing.assert_array_equal(model.predict(data, chunk_size=7), model.predict(data))
+
+
+def test_layers_are_views_into_flat_buffers() -> None:
+    model = NeuralNetwork([2, 3, 2])
+    assert [w.shape for w in model.layer_weights] == [(2, 3), (3, 2)]
+    assert model.weight_buffer.size == 12 and model.bias_buffer.size == 5
+
+    model.set_params(np.arange(12.), np.arange(5.))
+    np.testing.assert_array_equal(model.layer_weights[1], np.arange(6., 12.).reshape(3, 2))
+    model.set_param(13, -1.)
+    assert model.layer_biases[0][1] == -1.
+
+    copy = pickle.loads(pickle.dumps(model))
+    copy.set_param(0, 99.)
+    assert np.shares_memory(copy.layer_weights[0], copy.weight_buffer)
+    assert copy.layer_weights[0][0, 0] == 99. and model.layer_weights[0][0, 0] == 0.
+
+
+def test_simple_network_ties_resolve_to_the_later_class() -> None:
+    model = SimpleNeuralNetwork([1., 1., 0., 0.], [0., 0.])
+    assert model.predict(np.array([[1., 2.], [-3., 0.]])).tolist() == [1, 1]
+    assert model.linear_boundary() == (0., 0., 0.)
+
+
+def test_invalid_layer_sizes() -> None:
+    for layer_sizes in ([2], [2, 0, 2]):
+        with pytest.raises(ValueError):
+            NeuralNetwork(layer_sizes)
+    with pytest.raises(ValueError):
+        NeuralNetwork([2, 2], activation='swish')
+    with pytest.raises(ValueError):
+        NeuralNetwork([2, 3, 2]).linear_boundary()
@@ -0,0 +1,47 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.data.generate import set_data
+from app.data.source import DataSource
+from app.models.classifier import SimpleNeuralNetwork
+
+SCRIPT = Path(__file__).resolve().parents[1] / 'assets' / 'js' / 'clientside_model.js'
+
+NODE_RUNNER = """
+global.window = {};
+require(process.argv[1]);
+const cases = JSON.parse(require('fs').readFileSync(0, 'utf-8'));
+const predict = window.dash_clientside.clientside_model.predict_grid;
+console.log(JSON.stringify(cases.map(c => predict(c.x, c.y, c.weights, c.biases))));
+"""
+
+
+def test_clientside_model_matches_predict() -> None:
+    node = shutil.which('node')
+    if node is None:
+        pytest.skip('Node.js is not installed')
+
+    source = DataSource(set_data(n_points=50, n_positive=10, threshold=13))
+    xs, ys = source.mesh_axes
+    rng = np.random.default_rng(0)
+    # Slider values are multiples of 0.1 in [-1, 1], which puts many mesh cells exactly on the boundary
+    params = np.round(rng.integers(-10, 11, size=(200, 6)) * 0.1, 1)
+    params[0] = [.1, .1, .2, .2, .3, .3]
+
+    cases = [{'x': xs.tolist(), 'y': ys.tolist(), 'weights': p[:4].tolist(), 'biases': p[4:].tolist()} for p in params]
+    result = subprocess.run([node, '-e', NODE_RUNNER, str(SCRIPT)], input=json.dumps(cases),
+                            capture_output=True, text=True, check=True)
+
+    n_ties = 0
+    for p, js_grid in zip(params, json.loads(result.stdout)):
+        model = SimpleNeuralNetwork(p[:4], p[4:])
+        outputs = model.forward(source.grid)
+        n_ties += np.count_nonzero(outputs[:, 0] == outputs[:, 1])
+        # Ties resolve to the later class in both implementations, so every cell matches exactly
+        np.testing.assert_array_equal(np.asarray(js_grid), model.predict(source.grid).reshape(ys.shape[0], xs.shape[0]))
+    assert n_ties > 0
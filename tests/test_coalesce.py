@@ -0,0 +1,61 @@
+from threading import Event, Thread
+
+from app.data.coalesce import RequestCoalescer
+
+
+def test_later_request_supersedes_earlier() -> None:
+    coalescer = RequestCoalescer()
+    with coalescer.request('a') as superseded:
+        assert not superseded()
+        with coalescer.request('b') as other:
+            assert not other()
+        assert not superseded()
+
+    with coalescer.request('a') as first:
+        coalescer._register('a')
+        assert first()
+    assert coalescer.stats == {'sessions': 2, 'started': 4, 'dropped': 0}
+
+
+def test_requests_for_a_session_run_one_at_a_time() -> None:
+    coalescer = RequestCoalescer()
+    entered, release, results = Event(), Event(), []
+
+    def first() -> None:
+        with coalescer.request('a') as superseded:
+            entered.set()
+            release.wait(5)
+            results.append(('first', superseded()))
+
+    def second() -> None:
+        with coalescer.request('a') as superseded:
+            results.append(('second', superseded()))
+
+    threads = [Thread(target=first)]
+    threads[0].start()
+    entered.wait(5)
+    threads.append(Thread(target=second))
+    threads[1].start()
+    while coalescer.stats['started'] < 2:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [('first', True), ('second', False)]
+
+
+def test_requests_without_session_id_are_never_coalesced() -> None:
+    coalescer = RequestCoalescer()
+    with coalescer.request(None) as superseded, coalescer.request(None) as other:
+        assert not superseded() and not other()
+    assert coalescer.stats['started'] == 0
+
+
+def test_least_recently_active_session_is_forgotten() -> None:
+    coalescer = RequestCoalescer(max_sessions=2)
+    for session_id in 'abc':
+        with coalescer.request(session_id):
+            pass
+    assert coalescer.stats['sessions'] == 2
+    assert coalescer.is_current('a', -1)
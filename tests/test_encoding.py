@@ -0,0 +1,41 @@
+import base64
+
+import numpy as np
+import pytest
+
+from app.data.encoding import ENCODERS, decode_grid, encode_grid
+
+
+def _grids() -> list[np.ndarray]:
+    rng = np.random.default_rng(0)
+    x, y = np.meshgrid(np.linspace(-1, 1, 37), np.linspace(-1, 1, 23))
+    return [
+        (x + .5 * y > .1).astype(np.uint8),
+        rng.integers(0, 2, size=(17, 29), dtype=np.uint8),
+        np.zeros((5, 9), dtype=np.uint8),
+        np.ones((5, 9), dtype=np.uint8),
+        np.ones((1, 1), dtype=np.uint8),
+        np.eye(6, dtype=np.uint8),
+    ]
+
+
+@pytest.mark.parametrize('encoding', list(ENCODERS))
+def test_round_trip(encoding: str) -> None:
+    for grid in _grids():
+        decoded = decode_grid(encode_grid(grid, encoding))
+        assert decoded.shape == grid.shape
+        np.testing.assert_array_equal(decoded, grid)
+
+
+def test_contour_stores_only_boundary_columns() -> None:
+    grid = _grids()[0]
+    payload = encode_grid(grid, 'contour')
+    n_changes = np.count_nonzero(np.diff(grid, axis=1))
+    assert np.frombuffer(base64.b64decode(payload['columns']), '<u2').size == n_changes
+
+
+def test_unknown_encoding() -> None:
+    with pytest.raises(ValueError):
+        encode_grid(np.zeros((2, 2)), 'png')
+    with pytest.raises(ValueError):
+        decode_grid({'encoding': 'png', 'shape': [2, 2]})
@@ -0,0 +1,47 @@
+import numpy as np
+
+from app.data.sessions import SessionState
+from app.models.classifier import SimpleNeuralNetwork
+from app.models.evaluation import linear_margins, linear_outputs, margins_to_predictions, update_linear_outputs
+
+
+def _grid_points() -> np.ndarray:
+    # Points on a 0.1 grid land exactly on the decision boundary of many 0.1 step parameter sets
+    x, y = np.meshgrid(np.arange(-2, 2.05, .1), np.arange(-2, 2.05, .1))
+    return np.column_stack([x.ravel(), y.ravel()])
+
+
+def _assert_matches_predict(X: np.ndarray, params: np.ndarray) -> None:
+    expected = SimpleNeuralNetwork(params[:4], params[4:]).predict(X)
+    np.testing.assert_array_equal(margins_to_predictions(linear_margins(X, params)), expected)
+
+
+def test_margins_match_predict_on_ties() -> None:
+    X = _grid_points()
+    for params in ([.1, .1, .2, .2, .3, .3], [1., 0., 0., 1., 0., 0.], [.2, .1, .2, .3, .1, .1], [0.] * 6):
+        params = np.asarray(params)
+        assert np.any(linear_margins(X, params) == 0)
+        _assert_matches_predict(X, params)
+
+
+def test_margins_match_predict_along_slider_walk() -> None:
+    X = _grid_points()
+    rng = np.random.default_rng(0)
+    params = np.zeros(6)
+    for _ in range(500):
+        params[rng.integers(6)] += rng.choice([-.1, .1])
+        _assert_matches_predict(X, params)
+
+
+def test_incremental_outputs_match_full_pass() -> None:
+    X = _grid_points()
+    rng = np.random.default_rng(1)
+    params = rng.uniform(-1, 1, size=6).round(1)
+    state = SessionState()
+    for _ in range(300):
+        params[rng.integers(6)] = round(rng.uniform(-1, 1), 1)
+        outputs = state.update('outputs', params, lambda p: linear_outputs(X, p),
+                               apply_delta=lambda o, _old, new, changed: update_linear_outputs(o, X, new, changed))
+        np.testing.assert_array_equal(outputs, linear_outputs(X, params))
+        _assert_matches_predict(X, params)
+    assert state.values['outputs'].n_deltas > 0
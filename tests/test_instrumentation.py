@@ -0,0 +1,20 @@
+from flask import Flask
+
+from app.instrumentation import REGISTRY, register_metrics_route
+
+
+def test_request_labels_are_limited_to_registered_outputs() -> None:
+    server = Flask(__name__)
+    server.add_url_rule('/_dash-update-component', 'update', lambda: '{}', methods=['POST'])
+    register_metrics_route(server, {'graph.figure': {}})
+    REGISTRY.clear()
+
+    client = server.test_client()
+    for output in ('graph.figure', 'made-up-1', 'made-up-2', ['not', 'a', 'string']):
+        client.post('/_dash-update-component', json={'output': output})
+    client.post('/_dash-update-component', data='not json')
+
+    metrics = client.get('/metrics').data.decode()
+    assert 'app_request_seconds_count{output="graph.figure"} 1' in metrics
+    assert 'app_request_seconds_count{output="unknown"} 4' in metrics
+    assert 'made-up' not in metrics
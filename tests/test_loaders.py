@@ -0,0 +1,49 @@
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from app.data import loaders
+from app.data.generate import DataSchema, create_labels, set_data
+from app.data.loaders import cache_key, load_data
+
+
+def _load(path, cache_dir, preprocessors=None) -> pd.DataFrame:
+    return load_data(path, preprocessors, cache_dir=cache_dir)
+
+
+def test_cached_load_matches_uncached_load(tmp_path) -> None:
+    path = tmp_path / 'data.csv'
+    set_data(n_points=100, n_positive=50, threshold=13).to_csv(path, index=False)
+    preprocessors = [partial(create_labels, n_positive=30)]
+
+    cached = _load(path, tmp_path / 'cache', preprocessors)
+    expected = load_data(path, preprocessors)
+    np.testing.assert_array_equal(cached[[DataSchema.X_AXIS, DataSchema.Y_AXIS]].to_numpy(),
+                                  expected[[DataSchema.X_AXIS, DataSchema.Y_AXIS]].to_numpy())
+    np.testing.assert_array_equal(cached[DataSchema.LABELS].astype(str), expected[DataSchema.LABELS].astype(str))
+
+
+def test_cache_is_invalidated_by_file_contents_and_preprocessors(tmp_path, monkeypatch) -> None:
+    path = tmp_path / 'data.csv'
+    df = set_data(n_points=100, n_positive=50, threshold=13)
+    df.to_csv(path, index=False)
+    with_labels = [partial(create_labels, n_positive=30)]
+
+    key = cache_key(path, [])
+    assert cache_key(path, with_labels) != key
+    assert cache_key(path, with_labels) == cache_key(path, [partial(create_labels, n_positive=30)])
+    assert cache_key(path, with_labels) != cache_key(path, [partial(create_labels, n_positive=20)])
+
+    _load(path, tmp_path / 'cache')
+    df.iloc[:50].to_csv(path, index=False)
+    assert cache_key(path, []) != key
+    assert len(_load(path, tmp_path / 'cache')) == 50
+    assert len(list((tmp_path / 'cache').iterdir())) == 2
+
+    # An unchanged file is read from the cache, without parsing the source file again
+    def fail(_path) -> pd.DataFrame:
+        raise AssertionError('The cached data was not reused.')
+
+    monkeypatch.setitem(loaders.LOADERS, '.csv', fail)
+    assert len(_load(path, tmp_path / 'cache')) == 50
@@ -0,0 +1,75 @@
+import numpy as np
+
+from app.data.mesh import adaptive_predict, clip_half_plane, step_for_budget
+from app.models.classifier import SimpleNeuralNetwork
+
+BOUNDS = (-1., 1., -2., 2.)
+
+
+def _corners(xs: list[float], ys: list[float]) -> set[tuple[float, float]]:
+    assert (xs[0], ys[0]) == (xs[-1], ys[-1])
+    return set(zip(xs[:-1], ys[:-1]))
+
+
+def test_step_for_budget_never_exceeds_budget() -> None:
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        x_min, y_min = rng.normal(size=2)
+        width, height = rng.uniform(.01, 10, size=2)
+        budget = int(rng.integers(4, 50000))
+        step = step_for_budget((x_min, x_min + width, y_min, y_min + height), budget)
+
+        n_cells = np.arange(x_min, x_min + width, step).size * np.arange(y_min, y_min + height, step).size
+        assert n_cells <= budget
+        # A slightly smaller step would exceed the budget
+        smaller = step * (1 - 1e-9)
+        assert np.ceil(width / smaller) * np.ceil(height / smaller) > budget
+
+
+def test_clip_degenerate_line() -> None:
+    full = {(-1., -2.), (1., -2.), (1., 2.), (-1., 2.)}
+    assert clip_half_plane(BOUNDS, 0., 0., 0.) == ([], [])
+    assert _corners(*clip_half_plane(BOUNDS, 0., 0., 0., strict=False)) == full
+    assert _corners(*clip_half_plane(BOUNDS, 0., 0., 1.)) == full
+    assert clip_half_plane(BOUNDS, 0., 0., -1., strict=False) == ([], [])
+
+
+def test_clip_axis_parallel_line() -> None:
+    assert _corners(*clip_half_plane(BOUNDS, 1., 0., 0.)) == {(0., -2.), (1., -2.), (1., 2.), (0., 2.)}
+    assert _corners(*clip_half_plane(BOUNDS, -1., 0., 0., strict=False)) == {(-1., -2.), (0., -2.), (0., 2.), (-1., 2.)}
+    assert _corners(*clip_half_plane(BOUNDS, 0., 1., -1.)) == {(-1., 1.), (1., 1.), (1., 2.), (-1., 2.)}
+
+    # A line along an edge of the rectangle leaves the whole rectangle on one side, without repeated vertices
+    xs, ys = clip_half_plane(BOUNDS, 1., 0., 1., strict=False)
+    assert len(xs) == 5 and _corners(xs, ys) == {(-1., -2.), (1., -2.), (1., 2.), (-1., 2.)}
+    assert clip_half_plane(BOUNDS, -1., 0., -1.) == ([], [])
+
+
+def test_clip_regions_cover_rectangle() -> None:
+    for a, b, c in [(1., 1., 0.), (.3, -.7, .2), (2., 0., -1.5)]:
+        positive, negative = clip_half_plane(BOUNDS, a, b, c), clip_half_plane(BOUNDS, -a, -b, -c, strict=False)
+        area = sum(_shoelace(*region) for region in (positive, negative))
+        np.testing.assert_allclose(area, (BOUNDS[1] - BOUNDS[0]) * (BOUNDS[3] - BOUNDS[2]))
+
+
+def _shoelace(xs: list[float], ys: list[float]) -> float:
+    xs, ys = np.asarray(xs), np.asarray(ys)
+    return abs(np.dot(xs[:-1], ys[1:]) - np.dot(xs[1:], ys[:-1])) / 2 if xs.size else 0.
+
+
+def test_adaptive_predict_matches_dense_predict() -> None:
+    rng = np.random.default_rng(0)
+    params = [[.3, -.2, .1, .4, .05, -.05], [.1, .1, .2, .2, .3, .3], [1., 0., 0., 1., 0., 0.], [0.] * 6]
+    params += rng.uniform(-1, 1, size=(20, 6)).round(1).tolist()
+    for n_rows, n_cols in [(41, 41), (1, 37), (64, 17), (100, 129)]:
+        xs, ys = np.linspace(-2, 2, n_cols), np.linspace(-2, 2, n_rows)
+        points = np.column_stack([np.tile(xs, n_rows), np.repeat(ys, n_cols)])
+        for p in params:
+            model = SimpleNeuralNetwork(p[:4], p[4:])
+            for block in (1, 4, 16):
+                Z, n_evals = adaptive_predict(model.predict, xs, ys, block=block)
+                np.testing.assert_array_equal(Z, model.predict(points).reshape(n_rows, n_cols))
+                assert n_evals <= n_rows * n_cols
+
+    # Only the blocks along the decision boundary of a large mesh are refined
+    assert n_evals < n_rows * n_cols / 4
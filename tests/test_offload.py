@@ -0,0 +1,78 @@
+from concurrent.futures import CancelledError
+import os
+import time
+
+import pytest
+
+from app.data.offload import RenderPool, RenderQueueFull
+
+
+def _pid(seconds: float) -> int:
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def _pool(**kwargs) -> RenderPool:
+    return RenderPool(**{'max_workers': 1, 'max_pending': 4, 'min_cost': 10, 'timeout': 30, **kwargs})
+
+
+def test_cheap_jobs_run_inline() -> None:
+    pool = _pool()
+    assert pool.run(_pid, 0, cost=1) == os.getpid()
+    assert pool._executor is None
+    assert _pool(max_workers=0).run(_pid, 0, cost=1e9) == os.getpid()
+
+
+def test_offloaded_jobs_run_in_another_process() -> None:
+    observed = []
+    pool = _pool(observe=lambda name, phase, seconds: observed.append((name, phase)))
+    try:
+        assert pool.run(_pid, 0, cost=10, name='pid') != os.getpid()
+    finally:
+        pool.shutdown()
+    assert observed == [('pid', 'queue'), ('pid', 'run')]
+    assert pool.stats == {'pending': 0, 'completed': 1, 'cancelled': 0, 'timed_out': 0, 'rejected': 0}
+
+
+def test_pool_is_recreated_after_fork() -> None:
+    pool = _pool()
+    try:
+        parent_worker = pool.run(_pid, 0, cost=10)
+        parent_executor = pool._executor
+
+        read, write = os.pipe()
+        child = os.fork()
+        if child == 0:
+            # The child inherits the parents executor, whose processes and queues belong to the parent
+            try:
+                worker = pool.run(_pid, 0, cost=10, timeout=10)
+                ok = pool._executor is not parent_executor and worker not in (parent_worker, os.getpid())
+                # Stop the childs own processes, which would otherwise outlive it
+                pool._executor.shutdown()
+            except BaseException:
+                ok = False
+            os.write(write, b'1' if ok else b'0')
+            os._exit(0)
+
+        os.close(write)
+        assert os.read(read, 1) == b'1'
+        os.waitpid(child, 0)
+        os.close(read)
+        assert pool.run(_pid, 0, cost=10) == parent_worker and pool._executor is parent_executor
+    finally:
+        pool.shutdown()
+
+
+def test_full_queue_and_cancelled_jobs() -> None:
+    pool = _pool(max_pending=0)
+    with pytest.raises(RenderQueueFull):
+        pool.run(_pid, 0, cost=10)
+    assert pool.stats['rejected'] == 1
+
+    pool = _pool()
+    try:
+        with pytest.raises(CancelledError):
+            pool.run(_pid, .2, cost=10, cancelled=lambda: True)
+    finally:
+        pool.shutdown()
+    assert pool.stats['cancelled'] == 1
@@ -0,0 +1,86 @@
+from copy import deepcopy
+
+from dash import Patch
+import numpy as np
+import pytest
+
+from app.components import scatter_plot
+from app.data.generate import set_data
+from app.data.source import DataSource
+from app.models.classifier import SimpleNeuralNetwork
+from app.models.training import labels_to_targets
+
+FIRST, SECOND = ([.3, -.2, .1, .4], [.05, -.05]), ([-.5, .6, .2, -.1], [.1, .3])
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    # Cached figures do not depend on the boundary mode, which the tests change
+    for cache in (scatter_plot.FIGURE_CACHE, scatter_plot.PREDICTION_CACHE):
+        cache.clear()
+    yield
+    for cache in (scatter_plot.FIGURE_CACHE, scatter_plot.PREDICTION_CACHE):
+        cache.clear()
+
+
+def _apply(figure: dict, *patches: Patch) -> dict:
+    """Applies the assignments of dash Patches to a figure dictionary, as the browser does."""
+    figure = deepcopy(figure)
+    for patch in patches:
+        for operation in patch.to_plotly_json()['operations']:
+            assert operation['operation'] == 'Assign'
+            *path, last = operation['location']
+            target = figure
+            for key in path:
+                target = target[key]
+            target[last] = operation['params']['value']
+    return figure
+
+
+def _assert_same_data(figure: dict, expected: dict) -> None:
+    assert len(figure['data']) == len(expected['data'])
+    for trace, expected_trace in zip(figure['data'], expected['data']):
+        assert trace.keys() == expected_trace.keys()
+        for key in ('x', 'y', 'z'):
+            if key in trace:
+                np.testing.assert_array_equal(np.asarray(trace[key]), np.asarray(expected_trace[key]))
+
+
+def _patched_figure(source: DataSource) -> tuple[dict, dict]:
+    model = SimpleNeuralNetwork(*SECOND)
+    preds = model.predict(source.x_and_y)
+    misclassified = np.flatnonzero(preds != labels_to_targets(source.all_labels))
+    assert misclassified.size
+
+    figure = _apply(
+        scatter_plot.figure_dict(source, SimpleNeuralNetwork(*FIRST)),
+        scatter_plot.update(source, model),
+        scatter_plot.highlight_misclassified(source, model, misclassified)
+    )
+    return figure, scatter_plot.figure_dict(source, model)
+
+
+def test_patched_heatmap_matches_full_figure() -> None:
+    source = DataSource(set_data(n_points=100, n_positive=50, threshold=13))
+    figure, expected = _patched_figure(source)
+    _assert_same_data(figure, expected)
+
+    operations = scatter_plot.update(source, SimpleNeuralNetwork(*SECOND)).to_plotly_json()['operations']
+    assert [operation['location'] for operation in operations] == [['data', scatter_plot.HEATMAP_TRACE_INDEX, 'z']]
+
+
+def test_analytic_regions_match_predictions(monkeypatch) -> None:
+    monkeypatch.setattr(scatter_plot.settings, 'BOUNDARY_MODE', 'analytic')
+    source = DataSource(set_data(n_points=100, n_positive=50, threshold=13))
+    figure, expected = _patched_figure(source)
+    _assert_same_data(figure, expected)
+    assert 'z' not in figure['data'][0]
+
+    rng = np.random.default_rng(0)
+    for params in rng.uniform(-1, 1, size=(50, 6)):
+        model = SimpleNeuralNetwork(params[:4], params[4:])
+        for label, (xs, ys) in enumerate(scatter_plot._boundary_regions(source, model)):
+            if xs:
+                # The vertex mean of a convex polygon lies inside it
+                centre = np.array([[np.mean(xs[:-1]), np.mean(ys[:-1])]])
+                assert model.predict(centre)[0] == label
@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.data import sessions
+from app.data.sessions import SessionState, SessionStore
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _touch(store: SessionStore, session_id: str) -> SessionState:
+    with store.session(session_id) as state:
+        return state
+
+
+def test_sessions_expire_after_ttl(monkeypatch) -> None:
+    clock = _Clock()
+    monkeypatch.setattr(sessions, 'time', SimpleNamespace(monotonic=clock))
+    store = SessionStore(ttl=10.)
+
+    first = _touch(store, 'a')
+    clock.now = 5.
+    _touch(store, 'b')
+    clock.now = 12.
+    assert _touch(store, 'b') is not None and 'a' not in store and 'b' in store
+
+    clock.now = 30.
+    assert store.evict_expired() == 1
+    assert len(store) == 0
+    assert _touch(store, 'a') is not first
+    assert store.stats == {'size': 1, 'max_sessions': 1024, 'created': 3, 'evicted': 2}
+
+
+def test_least_recently_used_session_is_evicted_when_full() -> None:
+    store = SessionStore(max_sessions=2)
+    kept = _touch(store, 'a')
+    _touch(store, 'b')
+    _touch(store, 'a')
+    _touch(store, 'c')
+
+    assert 'b' not in store and 'a' in store and 'c' in store
+    assert _touch(store, 'a') is kept
+    assert store.stats['evicted'] == 1
+
+
+def test_requests_without_session_id_are_not_stored() -> None:
+    store = SessionStore()
+    assert _touch(store, None) is not _touch(store, None)
+    assert len(store) == 0
+
+
+def test_state_recomputes_after_max_deltas() -> None:
+    state = SessionState(max_deltas=2)
+    calls = []
+
+    def compute(params: np.ndarray) -> float:
+        calls.append('full')
+        return params.sum()
+
+    def apply_delta(value: float, old: np.ndarray, new: np.ndarray, changed: np.ndarray) -> float:
+        calls.append('delta')
+        return value + (new - old)[changed].sum()
+
+    for step in range(5):
+        assert state.update('total', [step, 1.], compute, apply_delta) == step + 1
+    assert state.update('total', [4., 1.], compute, apply_delta) == 5
+    assert calls == ['full', 'delta', 'delta', 'full', 'delta']
+    np.testing.assert_array_equal(state.values['total'].params, [4., 1.])
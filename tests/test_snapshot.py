@@ -0,0 +1,15 @@
+import os
+
+from app.snapshot import LayoutSnapshot
+
+
+def test_save_keeps_the_newest_snapshots(tmp_path) -> None:
+    keys = [f'{idx:032x}' for idx in range(4)]
+    for idx, key in enumerate(keys):
+        LayoutSnapshot(tmp_path, key, keep=2).save({'data': []}, b'{}')
+        os.utime(tmp_path / key, (idx, idx))
+    (tmp_path / 'tmp_pending').mkdir()
+
+    LayoutSnapshot(tmp_path, 'f' * 32, keep=2).save({'data': []}, b'{}')
+    assert sorted(path.name for path in tmp_path.iterdir()) == [keys[-1], 'f' * 32, 'tmp_pending']
+    assert LayoutSnapshot(tmp_path, keys[-1]).loaded
@@ -0,0 +1,80 @@
+import mmap
+
+import numpy as np
+import pandas as pd
+
+from app.data.generate import DataSchema, set_data
+from app.data.loaders import load_data
+from app.data.source import DataSource, _buffer_owner
+
+
+def test_x_and_y_is_a_view_of_memory_mapped_data(tmp_path) -> None:
+    path = tmp_path / 'data.csv'
+    set_data(n_points=100, n_positive=50, threshold=13).to_csv(path, index=False)
+    source = DataSource(load_data(path, cache_dir=tmp_path / 'cache'))
+
+    x = source.data[DataSchema.X_AXIS].to_numpy()
+    assert isinstance(_buffer_owner(x), mmap.mmap)
+    assert np.shares_memory(source.x_and_y, x)
+    np.testing.assert_array_equal(source.x_and_y, source.data[[DataSchema.X_AXIS, DataSchema.Y_AXIS]].to_numpy())
+
+
+def test_x_and_y_matches_filtered_rows() -> None:
+    source = DataSource(set_data(n_points=100, n_positive=50, threshold=13))
+    for filtered in (source.filter(x_range=(.2, .8)), source.filter(labels=[source.unique_labels[0]])):
+        expected = filtered.data[[DataSchema.X_AXIS, DataSchema.Y_AXIS]].to_numpy()
+        np.testing.assert_array_equal(filtered.x_and_y, expected)
+        assert not filtered.x_and_y.flags.writeable
+
+
+def test_token_changes_with_the_data() -> None:
+    source = DataSource(set_data(n_points=100, n_positive=50, threshold=13))
+    token = source.token
+    source.data = source.data.copy()
+    assert source.token != token
+    assert source.filter(x_range=(.2, .8)).token not in (token, source.token)
+
+
+def test_filter_matches_boolean_masks() -> None:
+    # Grid points, so the inclusive range ends and the value sets match many rows
+    source = DataSource(set_data(n_points=150, n_positive=60, threshold=13))
+    data = source.data
+    x, y = data[DataSchema.X_AXIS], data[DataSchema.Y_AXIS]
+    label = source.unique_labels[1]
+    some_x = sorted(set(x))[::3]
+    x_value, y_values = x.iloc[7], sorted(set(y))[2:4]
+
+    cases = [
+        ({'x_range': (.2, .8)}, x.between(.2, .8)),
+        ({'x_range': (x_value, x_value)}, x == x_value),
+        ({'y_range': (5., 9.)}, y < -np.inf),
+        ({'x': some_x}, np.isin(x, some_x)),
+        ({'y': y_values}, np.isin(y, y_values)),
+        ({'labels': [label]}, data[DataSchema.LABELS] == label),
+        ({'labels': ['missing']}, y < -np.inf),
+        ({'x': some_x, 'labels': [label], 'y_range': (.1, .9)},
+         np.isin(x, some_x) & (data[DataSchema.LABELS] == label) & y.between(.1, .9)),
+    ]
+    for predicates, mask in cases:
+        filtered = source.filter(**predicates)
+        assert filtered.row_count == np.count_nonzero(mask)
+        pd.testing.assert_frame_equal(filtered.data.reset_index(drop=True), data[np.asarray(mask)].reset_index(drop=True))
+
+    assert source.filter(x_range=(-np.inf, np.inf)) is source
+    assert source.filter(x=some_x) is source.filter(x=list(reversed(some_x)))
+
+
+def test_mesh_artifacts_are_memoized_until_the_data_changes() -> None:
+    source = DataSource(set_data(n_points=100, n_positive=50, threshold=13))
+    x_, y_ = source.mesh_axes
+    xx, yy = source.mesh
+    assert source.mesh_axes[0] is x_ and source.grid is source.grid
+    np.testing.assert_array_equal(source.grid, np.column_stack([xx.ravel(), yy.ravel()]))
+    assert source.grid.shape == (x_.size * y_.size, 2) and not source.grid.flags.writeable
+
+    source.mesh_budget = 500
+    assert source.mesh_axes[0] is not x_ and source.mesh_axes[0].size * source.mesh_axes[1].size <= 500
+
+    bounds = source.bounds
+    source.data = source.data.iloc[:10]
+    assert source.bounds != bounds and source.x_and_y.shape == (10, 2)
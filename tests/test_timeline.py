@@ -0,0 +1,50 @@
+from dash import Dash, dcc, html
+import numpy as np
+import pytest
+
+from app.components import scatter_plot
+from app.components.timeline import render_timeline
+from app.data import ids
+from app.data.generate import set_data
+from app.data.source import DataSource
+from app.models.classifier import SimpleNeuralNetwork
+from app.models.training import labels_to_targets
+from app.models.trajectory import compute_trajectory
+
+
+def _scrub(app: Dash, epoch: int) -> list[dict]:
+    response = app.server.test_client().post('/_dash-update-component', json={
+        'output': next(output for output in app.callback_map if ids.TIMELINE_STATUS in output),
+        'outputs': [{'id': ids.SCATTER_PLOT_GRAPH, 'property': 'figure'},
+                    {'id': ids.TIMELINE_STATUS, 'property': 'children'}],
+        'inputs': [{'id': ids.TIMELINE_SLIDER, 'property': 'value', 'value': epoch}],
+        'changedPropIds': [f'{ids.TIMELINE_SLIDER}.value']
+    })
+    assert response.status_code == 200, response.data[:200]
+    return response.get_json()['response'][ids.SCATTER_PLOT_GRAPH]['figure']['operations']
+
+
+@pytest.mark.parametrize('boundary_mode', ['heatmap', 'analytic'])
+def test_scrub_patches_boundary_and_misclassified_points(boundary_mode: str, monkeypatch) -> None:
+    monkeypatch.setattr(scatter_plot.settings, 'BOUNDARY_MODE', boundary_mode)
+    source = DataSource(set_data(n_points=100, n_positive=50, threshold=13))
+    trajectory = compute_trajectory(source, [-.5, .6, .2, -.1], [.1, .3], epochs=5)
+    app = Dash(__name__)
+    app.layout = html.Div([dcc.Graph(id=ids.SCATTER_PLOT_GRAPH), render_timeline(app, source, trajectory)])
+
+    for epoch in (0, 5):
+        snapshot = trajectory.frame(epoch)
+        model = SimpleNeuralNetwork(snapshot.weights, snapshot.biases)
+        misclassified = np.flatnonzero(model.predict(source.x_and_y) != labels_to_targets(source.all_labels))
+        assert misclassified.size
+        values = {tuple(operation['location']): operation['params']['value'] for operation in _scrub(app, epoch)}
+
+        if boundary_mode == 'analytic':
+            for idx, region in zip(scatter_plot.REGION_TRACE_INDICES, scatter_plot._boundary_regions(source, model)):
+                assert (values[('data', idx, 'x')], values[('data', idx, 'y')]) == region
+        else:
+            np.testing.assert_array_equal(values[('data', scatter_plot.HEATMAP_TRACE_INDEX, 'z')],
+                                          trajectory.grids[epoch])
+        idx = scatter_plot._misclassified_trace_index(source, model)
+        np.testing.assert_array_equal(values[('data', idx, 'x')], source.x_and_y[misclassified, 0])
+        np.testing.assert_array_equal(values[('data', idx, 'y')], source.x_and_y[misclassified, 1])
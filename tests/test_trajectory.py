@@ -0,0 +1,43 @@
+import numpy as np
+
+from app.data.generate import set_data
+from app.data.source import DataSource
+from app.models import trajectory
+from app.models.trajectory import Trajectory, compute_trajectory, load_trajectory
+
+WEIGHTS, BIASES = [.3, -.2, .1, .4], [.05, -.05]
+
+
+def _source() -> DataSource:
+    return DataSource(set_data(n_points=100, n_positive=50, threshold=13))
+
+
+def _assert_equal(loaded: Trajectory, expected: Trajectory) -> None:
+    for name in ('steps', 'loss', 'accuracy', 'grids'):
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(expected, name))
+    # Parameters are restored bit for bit, including signed zeros
+    for name in ('weights', 'biases'):
+        np.testing.assert_array_equal(getattr(loaded, name).view(np.uint64), getattr(expected, name).view(np.uint64))
+
+
+def test_save_and_load_round_trip(tmp_path) -> None:
+    expected = compute_trajectory(_source(), WEIGHTS, BIASES, epochs=12)
+    expected.weights[3, 0], expected.biases[5, 1] = -0., np.nextafter(.1, 1)
+    expected.save(tmp_path / 'nested' / 'run.npz')
+
+    loaded = Trajectory.load(tmp_path / 'nested' / 'run.npz')
+    _assert_equal(loaded, expected)
+    assert loaded.n_frames == 13 and loaded.frame(100).epoch == 12
+    assert [path.name for path in (tmp_path / 'nested').iterdir()] == ['run.npz']
+
+
+def test_load_trajectory_reuses_stored_runs(tmp_path, monkeypatch) -> None:
+    source = _source()
+    expected = load_trajectory(source, WEIGHTS, BIASES, epochs=4, cache_dir=tmp_path)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    def fail(*_args, **_kwargs) -> Trajectory:
+        raise AssertionError('The stored trajectory was not reused.')
+
+    monkeypatch.setattr(trajectory, 'compute_trajectory', fail)
+    _assert_equal(load_trajectory(source, WEIGHTS, BIASES, epochs=4, cache_dir=tmp_path), expected)